@@ -0,0 +1,185 @@
+"""
+Per-guild outbound pipelines for audit posts.
+
+Every guild gets its own bounded queue, token-bucket rate budget and worker
+task, so a burst in one guild only delays that guild's own audit channel and
+never starves the others. Urgent posts (keyword alerts) jump the guild's
+backlog and borrow from its rate budget instead of waiting for it. They have
+their own, smaller bound, so a flood of alerts can't grow the queue without
+limit or take the normal posts' room.
+"""
+
+import asyncio
+import itertools
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """Allow `rate` operations per `per` seconds, with bursts up to `rate`"""
+
+    def __init__(self, rate: int, per: float):
+        self.capacity = float(rate)
+        self.tokens = float(rate)
+        self.fill_rate = rate / per
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.fill_rate)
+        self.updated = now
+
+    def available(self) -> float:
+        """Tokens available right now"""
+        self._refill()
+        return self.tokens
+
+    def take(self):
+        """Take a token now, going into debt if none are left (later acquires wait it off)"""
+        self._refill()
+        self.tokens -= 1.0
+
+    async def acquire(self):
+        """Wait until a token is available, then take it"""
+        while True:
+            self._refill()
+            if self.tokens >= 1.0:
+                self.tokens -= 1.0
+                return
+            await asyncio.sleep((1.0 - self.tokens) / self.fill_rate)
+
+
+# Queue priorities: lower is delivered first
+URGENT = 0
+NORMAL = 1
+
+DEFAULT_URGENT_QUEUE_SIZE = 200
+
+
+class GuildPipeline:
+    """Bounded queue + rate budget + worker(s) for one guild"""
+
+    def __init__(self, guild_id: int, deliver, rate: int, per: float, queue_size: int, workers: int = 1,
+                 urgent_queue_size: int = DEFAULT_URGENT_QUEUE_SIZE):
+        self.guild_id = guild_id
+        self.deliver = deliver
+        # (priority, seq, payload); normal and urgent posts are bounded
+        # separately, so a full backlog never drops an alert
+        self.queue = asyncio.PriorityQueue()
+        self.queue_size = queue_size
+        self.urgent_queue_size = urgent_queue_size
+        self.urgent_queued = 0
+        self.bucket = TokenBucket(rate, per)
+        self.workers = workers
+        self.sent = 0
+        self.failed = 0
+        self.dropped = 0
+        self.urgent = 0
+        self._seq = itertools.count()
+        self._tasks = []
+        self._waiting = {}  # {seq: payload} taken off the queue, waiting for a token
+
+    def submit(self, payload: dict, urgent: bool = False) -> bool:
+        """Queue a payload for delivery; returns False if the queue is full"""
+        self._tasks = [task for task in self._tasks if not task.done()]
+        while len(self._tasks) < self.workers:
+            self._tasks.append(asyncio.get_running_loop().create_task(self._run()))
+        if urgent:
+            if self.urgent_queued >= self.urgent_queue_size:
+                self.dropped += 1
+                logger.warning("Urgent audit queue full for guild %s, dropped alert (%d dropped so far)", self.guild_id, self.dropped)
+                return False
+            self.urgent += 1
+            self.urgent_queued += 1
+            self.queue.put_nowait((URGENT, next(self._seq), payload))
+            return True
+        if self.queue.qsize() - self.urgent_queued >= self.queue_size:
+            self.dropped += 1
+            logger.warning("Audit queue full for guild %s, dropped event (%d dropped so far)", self.guild_id, self.dropped)
+            return False
+        self.queue.put_nowait((NORMAL, next(self._seq), payload))
+        return True
+
+    async def _run(self):
+        while True:
+            priority, seq, payload = await self.queue.get()
+            try:
+                if priority == URGENT:
+                    self.urgent_queued -= 1
+                    self.bucket.take()
+                else:
+                    self._waiting[seq] = payload
+                    await self.bucket.acquire()
+                    if self._waiting.pop(seq, None) is None:
+                        continue  # claimed by take_pending at shutdown
+                await self.deliver(self.guild_id, payload)
+                self.sent += 1
+            except Exception as e:
+                self.failed += 1
+                logger.error("Error delivering audit log for guild %s: %s", self.guild_id, e)
+            finally:
+                self.queue.task_done()
+
+    def take_pending(self) -> list:
+        """Remove and return everything not yet being delivered (used at shutdown)"""
+        pending = [self._waiting[seq] for seq in sorted(self._waiting)]
+        self._waiting.clear()
+        while not self.queue.empty():
+            priority, _, payload = self.queue.get_nowait()
+            self.queue.task_done()
+            if priority == URGENT:
+                self.urgent_queued -= 1
+            pending.append(payload)
+        return pending
+
+    def stats(self) -> dict:
+        return {
+            "queued": self.queue.qsize(),
+            "sent": self.sent,
+            "failed": self.failed,
+            "dropped": self.dropped,
+            "urgent": self.urgent,
+        }
+
+
+class AuditDispatcher:
+    """Routes audit payloads to the owning guild's pipeline"""
+
+    def __init__(self, deliver, configs: dict):
+        self.deliver = deliver
+        self.configs = configs
+        self.pipelines = {}
+
+    def pipeline(self, guild_id: int) -> GuildPipeline:
+        pipeline = self.pipelines.get(guild_id)
+        if pipeline is None:
+            config = self.configs[guild_id]
+            # Each webhook has its own Discord rate limit, so webhook guilds get
+            # one worker and one channel-sized budget per webhook
+            lanes = max(1, len(config.webhooks))
+            pipeline = self.pipelines[guild_id] = GuildPipeline(
+                guild_id, self.deliver, config.rate * lanes, config.per, config.queue_size, workers=lanes
+            )
+        return pipeline
+
+    def submit(self, guild_id: int, payload: dict, urgent: bool = False) -> bool:
+        return self.pipeline(guild_id).submit(payload, urgent)
+
+    async def drain(self, timeout: float) -> bool:
+        """Wait until every guild's queue is delivered; False if the timeout hit first"""
+        try:
+            await asyncio.wait_for(
+                asyncio.gather(*(pipeline.queue.join() for pipeline in self.pipelines.values())), timeout
+            )
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    def take_pending(self) -> list:
+        """Undelivered payloads from every pipeline"""
+        return [payload for pipeline in self.pipelines.values() for payload in pipeline.take_pending()]
+
+    def stats(self) -> dict:
+        return {guild_id: pipeline.stats() for guild_id, pipeline in self.pipelines.items()}
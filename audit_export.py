@@ -0,0 +1,92 @@
+"""
+Streaming export of stored audit events to gzip-compressed CSV or JSONL.
+
+iter_events reads the audit store one line at a time, opening only the day
+partitions the time range touches, and yields only the matching events;
+export_parts writes them through gzip into temporary files, starting a new
+part before one would exceed the upload limit. Nothing holds
+more than the current line and the compressor's buffer, so memory stays flat
+however large the export is. Both are plain generators meant to be advanced
+from a worker thread (asyncio.to_thread(next, parts, None)), which keeps the
+file reading and compression off the event loop.
+"""
+
+import io
+import csv
+import gzip
+import json
+import tempfile
+from datetime import datetime, timezone
+
+CSV_COLUMNS = ("time", "guild_id", "action", "member_name", "user_id", "channel_id", "text")
+
+# gzip holds some output in its compressor until the file is closed, so a
+# part is closed this far short of the limit
+_COMPRESSOR_SLACK = 512 * 1024
+
+
+def iter_events(store, guild_id: int, since: float = None, until: float = None,
+                user_id: int = None, action: str = None):
+    """Matching events from a PartitionedStore, oldest first"""
+    # AuditEvent.to_json writes compact JSON with guild_id first, so most
+    # lines for other guilds or actions are skipped without parsing
+    guild_key = f'{{"guild_id":{guild_id},'
+    action_key = f'"action":{json.dumps(action)}' if action else None
+    for line in store.iter_lines(since, until):
+        if not line.startswith(guild_key) or (action_key and action_key not in line):
+            continue
+        try:
+            event = json.loads(line)
+        except ValueError:
+            continue  # torn last line while the sink is writing
+        timestamp = event["timestamp"]
+        if since is not None and timestamp < since:
+            continue
+        if until is not None and timestamp >= until:
+            continue
+        if user_id is not None and event.get("user_id") != user_id:
+            continue
+        yield event
+
+
+def _csv_row(event: dict) -> list:
+    when = datetime.fromtimestamp(event["timestamp"], timezone.utc).isoformat(timespec="seconds")
+    return [when, event["guild_id"], event["action"], event["member_name"],
+            event.get("user_id") or "", event.get("channel_id") or "", event["text"]]
+
+
+def export_parts(events, fmt: str, limit: int, basename: str):
+    """Yield (filename, file object, rows) parts, each a gzip file under `limit` bytes.
+
+    The file objects are temporary files positioned at the start; whoever
+    sends them closes them (discord.File does after the upload). A part that
+    fails while being written is closed here.
+    """
+    threshold = max(limit - _COMPRESSOR_SLACK, limit * 4 // 5)
+    events = iter(events)
+    part = 0
+    pending = next(events, None)
+    while pending is not None or part == 0:
+        part += 1
+        raw = tempfile.TemporaryFile()
+        rows = 0
+        try:
+            with gzip.GzipFile(fileobj=raw, mode="wb") as compressed:
+                text = io.TextIOWrapper(compressed, encoding="utf-8", newline="")
+                writer = csv.writer(text) if fmt == "csv" else None
+                if writer is not None:
+                    writer.writerow(CSV_COLUMNS)
+                while pending is not None and raw.tell() < threshold:
+                    if writer is not None:
+                        writer.writerow(_csv_row(pending))
+                    else:
+                        text.write(json.dumps(pending, ensure_ascii=False, separators=(",", ":")) + "\n")
+                    rows += 1
+                    pending = next(events, None)
+                text.flush()
+                text.detach()
+            raw.seek(0)
+        except BaseException:
+            raw.close()
+            raise
+        yield f"{basename}-part{part}.{fmt}.gz", raw, rows
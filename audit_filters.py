@@ -0,0 +1,166 @@
+"""
+Per-guild filter rules, compiled once at startup.
+
+Handlers call AuditFilter.allows() before doing any formatting, so events we
+don't care about (high-churn channels, bot-driven changes, noisy actions) are
+rejected with a handful of set lookups and at most one regex search.
+
+Rules live under "filters" in a guild's entry in guilds.json:
+
+    "filters": {
+        "ignore": {
+            "channels": [1300000000000000001],
+            "categories": [1300000000000000002],
+            "roles": [1300000000000000003],
+            "users": [1300000000000000004],
+            "actions": ["channel_update", "member_update"],
+            "content": ["^!\\w+", "(?i)giveaway"],
+            "bots": true
+        },
+        "include": {
+            "channels": [1300000000000000005]
+        }
+    }
+
+Ignore rules reject an event if any of them match. Include rules restrict a
+dimension to the listed values, and only apply to events that carry that
+dimension (an include list of channels doesn't hide role updates).
+
+Threads and forum posts follow their parent channel: a channel rule matches
+the thread's own ID or its parent_id, and a category rule matches the
+parent's category (discord.py's Thread.category_id).
+"""
+
+import re
+import logging
+
+logger = logging.getLogger(__name__)
+
+_ID_KEYS = ("channels", "categories", "roles", "users")
+_RULE_KEYS = set(_ID_KEYS) | {"actions", "content", "bots"}
+
+
+def _combined_pattern(patterns: list, guild_id: int):
+    """All content patterns as one alternation, so a check is a single search"""
+    if not patterns:
+        return None
+    try:
+        return re.compile("|".join(f"(?:{pattern})" for pattern in patterns))
+    except re.error as e:
+        raise ValueError(f"Invalid content filter for guild {guild_id}: {e}") from None
+
+
+def _role_ids(user) -> tuple:
+    """Role IDs of a member without building Role objects (Member._roles holds raw IDs)"""
+    role_ids = getattr(user, "_roles", None)
+    if role_ids is not None:
+        return role_ids
+    return tuple(role.id for role in getattr(user, "roles", ()))
+
+
+class AuditFilter:
+    """Compiled ignore/include rules for one guild"""
+
+    __slots__ = (
+        "guild_id", "empty", "ignore_bots", "ignore_channels", "ignore_categories", "ignore_roles",
+        "ignore_users", "ignore_actions", "ignore_content", "include_channels", "include_categories",
+        "include_roles", "include_users", "include_actions", "include_content", "uses_roles",
+    )
+
+    def __init__(self, guild_id: int, rules: dict = None):
+        rules = rules or {}
+        unknown = set(rules) - {"ignore", "include"}
+        if unknown:
+            raise ValueError(f"Unknown filter section(s) for guild {guild_id}: {', '.join(sorted(unknown))}")
+
+        ignore = rules.get("ignore", {})
+        include = rules.get("include", {})
+        for section, values in (("ignore", ignore), ("include", include)):
+            unknown = set(values) - _RULE_KEYS
+            if unknown:
+                raise ValueError(f"Unknown {section} filter key(s) for guild {guild_id}: {', '.join(sorted(unknown))}")
+
+        self.guild_id = guild_id
+        self.ignore_bots = bool(ignore.get("bots", False))
+        self.ignore_channels = frozenset(int(i) for i in ignore.get("channels", ()))
+        self.ignore_categories = frozenset(int(i) for i in ignore.get("categories", ()))
+        self.ignore_roles = frozenset(int(i) for i in ignore.get("roles", ()))
+        self.ignore_users = frozenset(int(i) for i in ignore.get("users", ()))
+        self.ignore_actions = frozenset(ignore.get("actions", ()))
+        self.ignore_content = _combined_pattern(ignore.get("content", ()), guild_id)
+
+        # Empty include sets mean "no restriction"
+        self.include_channels = frozenset(int(i) for i in include.get("channels", ()))
+        self.include_categories = frozenset(int(i) for i in include.get("categories", ()))
+        self.include_roles = frozenset(int(i) for i in include.get("roles", ()))
+        self.include_users = frozenset(int(i) for i in include.get("users", ()))
+        self.include_actions = frozenset(include.get("actions", ()))
+        self.include_content = _combined_pattern(include.get("content", ()), guild_id)
+
+        self.uses_roles = bool(self.ignore_roles or self.include_roles)
+        self.empty = not any((
+            self.ignore_bots, self.ignore_channels, self.ignore_categories, self.ignore_roles,
+            self.ignore_users, self.ignore_actions, self.ignore_content, self.include_channels,
+            self.include_categories, self.include_roles, self.include_users, self.include_actions,
+            self.include_content,
+        ))
+
+    def allows(self, action: str, channel=None, user=None, roles=None, content: str = None) -> bool:
+        """True if the event should be audited.
+
+        `roles` defaults to the user's roles; pass it explicitly for events
+        about a role itself (role create/delete/update).
+        """
+        if self.empty:
+            return True
+
+        if action in self.ignore_actions or (self.include_actions and action not in self.include_actions):
+            return False
+
+        if channel is not None:
+            channel_id = channel.id
+            parent_id = getattr(channel, "parent_id", None)  # threads only
+            if channel_id in self.ignore_channels or parent_id in self.ignore_channels:
+                return False
+            if (self.include_channels and channel_id not in self.include_channels
+                    and parent_id not in self.include_channels):
+                return False
+            category_id = getattr(channel, "category_id", None)
+            if category_id in self.ignore_categories:
+                return False
+            if self.include_categories and category_id not in self.include_categories:
+                return False
+
+        if user is not None:
+            if self.ignore_bots and user.bot:
+                return False
+            if user.id in self.ignore_users:
+                return False
+            if self.include_users and user.id not in self.include_users:
+                return False
+            if roles is None and self.uses_roles:
+                roles = _role_ids(user)
+
+        if roles is not None and self.uses_roles:
+            if not self.ignore_roles.isdisjoint(roles):
+                return False
+            if self.include_roles and self.include_roles.isdisjoint(roles):
+                return False
+
+        if content:
+            if self.ignore_content is not None and self.ignore_content.search(content):
+                return False
+            if self.include_content is not None and not self.include_content.search(content):
+                return False
+
+        return True
+
+
+def compile_filters(configs: dict) -> dict:
+    """Build {guild_id: AuditFilter} from the loaded guild configs"""
+    filters = {}
+    for guild_id, config in configs.items():
+        filters[guild_id] = AuditFilter(guild_id, config.options.get("filters"))
+        if not filters[guild_id].empty:
+            logger.info("Audit filters active for guild %s", guild_id)
+    return filters
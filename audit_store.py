@@ -0,0 +1,166 @@
+"""
+Day-partitioned local audit history with retention and compaction.
+
+Events are appended to one JSONL file per UTC day (YYYY-MM-DD.jsonl). Once a
+day is over, maintain() compacts its file in the background: torn or
+unparseable lines are dropped and the rest is gzipped to YYYY-MM-DD.jsonl.gz.
+Partitions older than the retention period are deleted whole, one unlink per
+day, never row by row.
+
+Reads pick partitions by name, so a query over the last few days opens only
+those files and costs the same whether a month or years of history are kept.
+A late event for an already compacted day (e.g. replayed after a restart)
+lands in a fresh .jsonl beside the .gz; readers read both and the next
+maintain() merges them.
+"""
+
+import os
+import gzip
+import json
+import logging
+import threading
+from datetime import datetime, timezone
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RETENTION_DAYS = 90
+
+# Files of one partition in read order: compacted, being compacted, still open
+_SUFFIXES = {"jsonl.gz": 0, "jsonl.compacting": 1, "jsonl": 2}
+
+
+def day_of(timestamp: float) -> str:
+    return datetime.fromtimestamp(timestamp, timezone.utc).strftime("%Y-%m-%d")
+
+
+class PartitionedStore:
+    """Append-only daily JSONL partitions under one directory"""
+
+    def __init__(self, directory: str, retention_days: int = DEFAULT_RETENTION_DAYS):
+        self.directory = directory
+        self.retention_days = retention_days
+        self._lock = threading.Lock()
+        self._day = None   # day of the open append handle
+        self._file = None
+        self.dropped_partitions = 0
+        self.compacted_partitions = 0
+
+    def _path(self, day: str, suffix: str = ".jsonl") -> str:
+        return os.path.join(self.directory, f"{day}{suffix}")
+
+    def append(self, events: list):
+        """Append events to their day's partition (blocking; called from the sink's worker thread)"""
+        with self._lock:
+            by_day = {}
+            for event in events:
+                by_day.setdefault(day_of(event.timestamp), []).append(event.to_json() + "\n")
+            for day, lines in by_day.items():
+                if day != self._day:
+                    if self._file is not None:
+                        self._file.close()
+                    os.makedirs(self.directory, exist_ok=True)
+                    self._file = open(self._path(day), "a", encoding="utf-8")
+                    self._day = day
+                self._file.write("".join(lines))
+            if self._file is not None:
+                self._file.flush()
+
+    def partitions(self) -> dict:
+        """{day: [paths]} in read order (compacted first, open file last)"""
+        days = {}
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return days
+        for name in sorted(names, key=lambda name: _SUFFIXES.get(name.partition(".")[2], -1)):
+            day, _, suffix = name.partition(".")
+            if suffix in _SUFFIXES:
+                days.setdefault(day, []).append(os.path.join(self.directory, name))
+        return days
+
+    def iter_lines(self, since: float = None, until: float = None):
+        """Raw JSON lines from the partitions overlapping [since, until), oldest first"""
+        first = day_of(since) if since is not None else None
+        last = day_of(until - 0.001) if until is not None else None  # until is exclusive
+        with self._lock:
+            if self._file is not None:
+                self._file.flush()
+            partitions = self.partitions()
+        for day in sorted(partitions):
+            if (first is not None and day < first) or (last is not None and day > last):
+                continue
+            for path in partitions[day]:
+                opener = gzip.open if path.endswith(".gz") else open
+                try:
+                    with opener(path, "rt", encoding="utf-8") as fh:
+                        yield from fh
+                except FileNotFoundError:
+                    continue  # dropped by retention while we were reading
+
+    def maintain(self, now: float):
+        """Drop expired partitions and compact finished days (blocking, run it in a thread)"""
+        today = day_of(now)
+        cutoff = day_of(now - self.retention_days * 86400) if self.retention_days else None
+        for day, paths in self.partitions().items():
+            if cutoff is not None and day < cutoff:
+                for path in paths:
+                    os.remove(path)
+                self.dropped_partitions += 1
+                logger.info("Dropped audit partition %s (retention %d days)", day, self.retention_days)
+            elif day < today and not paths[-1].endswith(".gz"):
+                self._compact(day)
+
+    def _compact(self, day: str):
+        plain = self._path(day)
+        compacting = self._path(day, ".jsonl.compacting")
+        packed = self._path(day, ".jsonl.gz")
+        with self._lock:
+            # A .compacting file left by an interrupted run is finished first;
+            # the day's .jsonl then waits for the next pass
+            if not os.path.exists(compacting):
+                if self._day == day:
+                    self._file.close()
+                    self._file = None
+                    self._day = None
+                # Late writes from here on start a fresh .jsonl for the day
+                os.replace(plain, compacting)
+
+        kept = dropped = 0
+        tmp_path = f"{packed}.tmp"
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as out:
+            sources = ([packed] if os.path.exists(packed) else []) + [compacting]
+            for path in sources:
+                opener = gzip.open if path.endswith(".gz") else open
+                with opener(path, "rt", encoding="utf-8") as fh:
+                    for line in fh:
+                        try:
+                            json.loads(line)
+                        except ValueError:
+                            dropped += 1
+                            continue
+                        out.write(line if line.endswith("\n") else line + "\n")
+                        kept += 1
+
+        with self._lock:
+            os.replace(tmp_path, packed)
+            os.remove(compacting)
+        self.compacted_partitions += 1
+        logger.info("Compacted audit partition %s: %d event(s), %d bad line(s) dropped", day, kept, dropped)
+
+    def stats(self) -> dict:
+        partitions = self.partitions()
+        size = sum(os.path.getsize(path) for paths in partitions.values() for path in paths if os.path.exists(path))
+        return {
+            "partitions": len(partitions),
+            "bytes": size,
+            "oldest": min(partitions) if partitions else None,
+            "compacted": self.compacted_partitions,
+            "dropped": self.dropped_partitions,
+        }
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+                self._day = None
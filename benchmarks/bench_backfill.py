@@ -0,0 +1,90 @@
+"""
+Reconnect backfill: audit entries missed during a gateway gap.
+
+Fills a FakeGuild's audit log with entries on both sides of a high-water
+mark, then runs main.backfill_guild against a recording audit channel with
+the guild's rate budget in place. Reports how many entries were replayed,
+how many posts that took and how long delivery took. Every entry after the
+mark must reach a post (counted from what is posted, not from the action map),
+and entries at or below the mark must not be posted again.
+
+Usage: python benchmarks/bench_backfill.py [--missed N] [--batch N] [--rate N] [--per SECONDS]
+"""
+
+import os
+import sys
+import time
+import asyncio
+import argparse
+import tempfile
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import discord
+
+from bench_events import load_bot_module, GUILD_ID, AUDIT_CHANNEL_ID
+from fake_discord import FakeAuditEntry, FakeGuild, FakeMember, StubAuditChannel
+
+ACTIONS = (
+    (discord.AuditLogAction.role_update, {"before": "old", "after": "new"}),
+    (discord.AuditLogAction.channel_create, {"after": "#new"}),
+    (discord.AuditLogAction.kick, {"reason": "rule 3"}),
+    (discord.AuditLogAction.member_role_update, {"after": SimpleNamespace(roles=["@helper"])}),
+)
+
+
+async def run(args):
+    with tempfile.TemporaryDirectory() as tmpdir:
+        os.environ["BACKFILL_BATCH"] = str(args.batch)
+        main = load_bot_module(tmpdir, rate=args.rate, per=args.per)
+        guild = FakeGuild(GUILD_ID)
+        channel = StubAuditChannel(guild, channel_id=AUDIT_CHANNEL_ID)
+        guild.attach_audit_channel(channel)
+        main.bot.get_guild = lambda guild_id: guild if guild_id == GUILD_ID else None
+        moderator = FakeMember(guild, "moderator")
+
+        def add_entries(count: int):
+            for i in range(count):
+                action, fields = ACTIONS[i % len(ACTIONS)]
+                guild.audit_log_entries.append(FakeAuditEntry(action, moderator, guild.roles[i % 50], **fields))
+
+        add_entries(50)  # already reported before the gap
+        mark = guild.audit_log_entries[-1].id
+        add_entries(args.missed)
+
+        # Count the entries that actually reach a backfill post, not the ones we expect to be mapped
+        posted = []
+        post_audit = main.post_audit
+
+        def counting_post_audit(guild, member_name, action_text, action="audit", *args, **kwargs):
+            if action == "audit_backfill":
+                posted.extend(action_text.split("\n\n"))
+            return post_audit(guild, member_name, action_text, action, *args, **kwargs)
+
+        main.post_audit = counting_post_audit
+        start = time.perf_counter()
+        await main.backfill_guild(guild, mark, discord.utils.time_snowflake(discord.utils.utcnow()))
+        queued = time.perf_counter() - start
+        await asyncio.gather(*(pipeline.queue.join() for pipeline in main.dispatcher.pipelines.values()))
+        delivered = time.perf_counter() - start
+
+        print(f"{args.missed} missed entries, batch {args.batch}, budget {args.rate}/{args.per}s")
+        reported = len(posted)
+        print(f"reported entries: {reported}, posts: {len(channel.sends)} ({reported / max(len(channel.sends), 1):.1f} entries/post)")
+        print(f"every missed entry reported: {reported == args.missed}")
+        print(f"paged + queued in {queued:.2f}s, delivered after {delivered:.2f}s")
+        print(f"high-water mark advanced to last entry: {main.audit_hwm.get(GUILD_ID) == guild.audit_log_entries[-1].id}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--missed", type=int, default=500)
+    parser.add_argument("--batch", type=int, default=10)
+    parser.add_argument("--rate", type=int, default=50)
+    parser.add_argument("--per", type=float, default=1.0)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
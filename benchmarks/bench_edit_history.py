@@ -0,0 +1,106 @@
+"""
+Memory per edit: delta-encoded EditHistory versus storing every version.
+
+Simulates messages that are edited repeatedly (typo fixes, appended lines,
+occasional rewrites) and measures live allocations with tracemalloc for the
+delta history and for a dict of full-copy version lists. Also times
+rebuilding the newest version and the whole timeline.
+
+Usage: python benchmarks/bench_edit_history.py [--messages N] [--edits N] [--length CHARS]
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from edit_history import EditHistory
+
+WORDS = "the server event starts at eight tonight please read the rules channel before joining voice".split()
+
+
+def edit(text: str, rng: random.Random) -> str:
+    words = text.split(" ")
+    roll = rng.random()
+    if roll < 0.6:      # typo fix / word swap
+        i = rng.randrange(len(words))
+        words[i] = rng.choice(WORDS)
+    elif roll < 0.9:    # append a line
+        words += ["\nedit:"] + [rng.choice(WORDS) for _ in range(rng.randint(3, 10))]
+    else:               # rewrite a chunk
+        i = rng.randrange(len(words))
+        words[i:i + 15] = [rng.choice(WORDS) for _ in range(15)]
+    return " ".join(words)
+
+
+def scripts(messages: int, edits: int, length: int, rng: random.Random) -> list:
+    result = []
+    for _ in range(messages):
+        text = " ".join(rng.choice(WORDS) for _ in range(length // 6))
+        versions = [text]
+        for _ in range(edits):
+            versions.append(edit(versions[-1], rng))
+        result.append(versions)
+    return result
+
+
+def measure(build) -> int:
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    kept = build()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    size = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    del kept
+    return size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=500)
+    parser.add_argument("--edits", type=int, default=10)
+    parser.add_argument("--length", type=int, default=600, help="initial message length, chars")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    data = scripts(args.messages, args.edits, args.length, rng)
+    total_edits = args.messages * args.edits
+
+    def build_history():
+        history = EditHistory(max_bytes=1 << 40, max_versions=args.edits + 1)
+        for message_id, versions in enumerate(data):
+            for before, after in zip(versions, versions[1:]):
+                # Fresh strings, like discord.py hands us, so the stored base is counted
+                history.record(message_id, 1, 2, 3, before.encode().decode(), after.encode().decode())
+        return history
+
+    def build_full_copies():
+        # The copies must be new strings, not references to the script's
+        return {message_id: [v.encode().decode() for v in versions] for message_id, versions in enumerate(data)}
+
+    history_bytes = measure(build_history)
+    full_bytes = measure(build_full_copies)
+
+    history = build_history()
+    start = time.perf_counter()
+    for message_id in range(args.messages):
+        assert history.get(message_id).latest() == data[message_id][-1]
+    latest_us = (time.perf_counter() - start) / args.messages * 1e6
+    start = time.perf_counter()
+    for message_id in range(args.messages):
+        history.get(message_id).timeline()
+    timeline_us = (time.perf_counter() - start) / args.messages * 1e6
+
+    print(f"{args.messages} messages x {args.edits} edits, ~{args.length} chars each")
+    print(f"{'store':<14} {'total KiB':>10} {'bytes/edit':>11}")
+    print(f"{'full copies':<14} {full_bytes / 1024:>10.0f} {full_bytes / total_edits:>11.0f}")
+    print(f"{'delta history':<14} {history_bytes / 1024:>10.0f} {history_bytes / total_edits:>11.0f}")
+    print(f"accounted budget bytes: {history.bytes}, rebuild latest {latest_us:.0f} us, full timeline {timeline_us:.0f} us")
+
+
+if __name__ == "__main__":
+    main()
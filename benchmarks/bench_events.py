@@ -0,0 +1,237 @@
+"""
+Offline event-replay benchmark for main.py's gateway handlers.
+
+Imports the bot module against a temporary guild config, points it at a
+FakeGuild whose audit channel is a recording stub, and replays synthetic
+events through every audit @bot.event handler (plus log_audit_entry).
+Lifecycle handlers that need a live gateway or REST (on_ready, setup_hook,
+on_shard_ready, on_guild_join) are not replayed.
+
+Reports per handler: events/s (handler + outbound pipeline drain), send
+calls per event, and live allocations per event (tracemalloc, separate pass).
+
+Usage: python benchmarks/bench_events.py [--events N] [--latency MS]
+           [--ratelimit-prob P] [--ratelimit-mode retry|raise] [handler ...]
+"""
+
+import os
+import sys
+import copy
+import json
+import time
+import asyncio
+import argparse
+import tempfile
+import tracemalloc
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import discord
+
+from fake_discord import (
+    FakeAuditEntry, FakeEmoji, FakeGuild, FakeInvite, FakeMember,
+    FakeMessage, FakeSticker, FakeThread, FakeThreadMember, StubAuditChannel,
+)
+
+GUILD_ID = 1289789596238086194
+AUDIT_CHANNEL_ID = 1474965686454325331
+CONTENT = "Synthetic audit benchmark message with some realistic length to it. " * 3
+
+
+def load_bot_module(tmpdir: str, **guild_options):
+    """Import main.py against a throwaway config (unlimited rate budget by default)"""
+    config_path = os.path.join(tmpdir, "guilds.json")
+    with open(config_path, "w") as fh:
+        json.dump({
+            "defaults": {"rate": 10 ** 9, "per": 1.0, "queue_size": 10 ** 7},
+            "guilds": {str(GUILD_ID): {"audit_channel_id": AUDIT_CHANNEL_ID, **guild_options}},
+        }, fh)
+    os.environ.update({
+        "GUILD_CONFIG": config_path,
+        "STATE_PATH": os.path.join(tmpdir, "state.json"),
+        "AUDIT_STORE_DIR": os.path.join(tmpdir, "audit"),
+        "LOG_LEVEL": os.environ.get("LOG_LEVEL", "WARNING"),
+    })
+    import main
+    return main
+
+
+def build_scenarios(main, guild: FakeGuild) -> dict:
+    """{name: (handler, make_args(i))}"""
+    members = [FakeMember(guild, f"member{i}", roles=guild.roles[:3]) for i in range(200)]
+    moderator = FakeMember(guild, "moderator")
+    channels = guild.text_channels
+
+    def member_update(i):
+        before = members[i % len(members)]
+        after = copy.copy(before)
+        after.nick = f"nick{i}"
+        after.roles = before.roles + [guild.roles[10 + i % 20]]
+        return before, after
+
+    def guild_update(i):
+        after = copy.copy(guild)
+        after.name = f"{guild.name} {i}"
+        return guild, after
+
+    def role_update(i):
+        before = guild.roles[i % len(guild.roles)]
+        after = copy.copy(before)
+        after.name = f"{before.name}-renamed"
+        after.hoist = not before.hoist
+        return before, after
+
+    def channel_update(i):
+        before = channels[i % len(channels)]
+        after = copy.copy(before)
+        after.name = f"{before.name}-renamed"
+        after.position = before.position + 1
+        return before, after
+
+    threads = [FakeThread(guild, channels[i % 50], members[i % 200], f"thread{i}") for i in range(500)]
+
+    def thread_archive_toggle(i):
+        # Forum churn: coalesced into the periodic summary, no post per event
+        before = threads[i % len(threads)]
+        after = copy.copy(before)
+        after.archived = not before.archived
+        threads[i % len(threads)] = after
+        return before, after
+
+    def emojis_update(i):
+        before = [FakeEmoji(f"emoji{j}") for j in range(20)]
+        return guild, before, before + [FakeEmoji(f"new{i}")]
+
+    def stickers_update(i):
+        before = [FakeSticker(f"sticker{j}") for j in range(5)]
+        return guild, before, before[1:]
+
+    audit_actions = [
+        (discord.AuditLogAction.ban, {"reason": "spam"}),
+        (discord.AuditLogAction.kick, {"reason": "rule 3"}),
+        (discord.AuditLogAction.role_update, {"before": "old", "after": "new"}),
+        (discord.AuditLogAction.channel_create, {"after": "#new"}),
+        (discord.AuditLogAction.message_delete, {"extra": {"count": 3}}),
+    ]
+
+    def audit_entry(i):
+        action, fields = audit_actions[i % len(audit_actions)]
+        return guild, FakeAuditEntry(action, moderator, members[i % len(members)], **fields)
+
+    # on_webhook_update looks the change up in the audit log
+    guild.audit_log_entries.append(FakeAuditEntry(discord.AuditLogAction.webhook_create, moderator, channels[0], extra="hook"))
+
+    return {
+        "on_message": (main.on_message, lambda i: (FakeMessage(guild, channels[i % 50], members[i % 200], CONTENT),)),
+        "on_message_delete": (main.on_message_delete, lambda i: (FakeMessage(guild, channels[i % 50], members[i % 200], CONTENT),)),
+        "on_message_edit": (main.on_message_edit, lambda i: (
+            FakeMessage(guild, channels[i % 50], members[i % 200], CONTENT),
+            FakeMessage(guild, channels[i % 50], members[i % 200], CONTENT + " (edited)"),
+        )),
+        "on_member_join": (main.on_member_join, lambda i: (FakeMember(guild, f"joiner{i}"),)),
+        "on_member_remove": (main.on_member_remove, lambda i: (members[i % 200],)),
+        "on_member_update": (main.on_member_update, member_update),
+        "on_guild_update": (main.on_guild_update, guild_update),
+        "on_guild_role_create": (main.on_guild_role_create, lambda i: (guild.roles[i % 50],)),
+        "on_guild_role_delete": (main.on_guild_role_delete, lambda i: (guild.roles[i % 50],)),
+        "on_guild_role_update": (main.on_guild_role_update, role_update),
+        "on_guild_channel_create": (main.on_guild_channel_create, lambda i: (channels[i % 50],)),
+        "on_guild_channel_delete": (main.on_guild_channel_delete, lambda i: (channels[i % 50],)),
+        "on_guild_channel_update": (main.on_guild_channel_update, channel_update),
+        "on_thread_create": (main.on_thread_create, lambda i: (FakeThread(guild, channels[i % 50], members[i % 200], f"new{i}"),)),
+        "on_thread_update": (main.on_thread_update, thread_archive_toggle),
+        "on_thread_member_join": (main.on_thread_member_join, lambda i: (FakeThreadMember(threads[i % 500], members[i % 200]),)),
+        "on_invite_create": (main.on_invite_create, lambda i: (FakeInvite(guild, channels[i % 50], members[i % 200]),)),
+        "on_webhook_update": (main.on_webhook_update, lambda i: (channels[i % 50],)),
+        "on_guild_emojis_update": (main.on_guild_emojis_update, emojis_update),
+        "on_guild_stickers_update": (main.on_guild_stickers_update, stickers_update),
+        "log_audit_entry": (main.log_audit_entry, audit_entry),
+    }
+
+
+async def drain(main):
+    await asyncio.gather(*(pipeline.queue.join() for pipeline in main.dispatcher.pipelines.values()))
+
+
+async def replay(main, handler, inputs: list, concurrency: int) -> float:
+    """Run the handler over all inputs (batched concurrently) and drain; returns seconds"""
+    start = time.perf_counter()
+    for offset in range(0, len(inputs), concurrency):
+        await asyncio.gather(*(handler(*args) for args in inputs[offset:offset + concurrency]))
+    await drain(main)
+    return time.perf_counter() - start
+
+
+async def measure(main, channel: StubAuditChannel, handler, make_args, events: int, concurrency: int) -> dict:
+    # Timing pass
+    channel.reset()
+    inputs = [make_args(i) for i in range(events)]
+    elapsed = await replay(main, handler, inputs, concurrency)
+    sends = len(channel.sends)
+    rate_limited = channel.rate_limited
+
+    # Allocation pass: live blocks/bytes created by the handler phase (before drain)
+    sample = inputs[:min(events, 500)]
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    for offset in range(0, len(sample), concurrency):
+        await asyncio.gather(*(handler(*args) for args in sample[offset:offset + concurrency]))
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    await drain(main)
+    diff = [stat for stat in after.compare_to(before, "filename") if stat.count_diff > 0]
+    blocks = sum(stat.count_diff for stat in diff)
+    size = sum(stat.size_diff for stat in diff)
+
+    return {
+        "events_per_sec": events / elapsed if elapsed else float("inf"),
+        "sends_per_event": sends / events,
+        "blocks_per_event": blocks / len(sample),
+        "bytes_per_event": size / len(sample),
+        "rate_limited": rate_limited,
+    }
+
+
+async def run(args):
+    with tempfile.TemporaryDirectory() as tmpdir:
+        main = load_bot_module(tmpdir)
+        guild = FakeGuild(GUILD_ID)
+        channel = StubAuditChannel(
+            guild,
+            channel_id=AUDIT_CHANNEL_ID,
+            latency=args.latency / 1000.0,
+            ratelimit_prob=args.ratelimit_prob,
+            ratelimit_mode=args.ratelimit_mode,
+        )
+        guild.attach_audit_channel(channel)
+        main.bot.get_guild = lambda guild_id: guild if guild_id == GUILD_ID else None
+
+        scenarios = build_scenarios(main, guild)
+        names = args.handlers or list(scenarios)
+
+        print(f"{args.events} events/handler, latency {args.latency}ms, 429 p={args.ratelimit_prob} ({args.ratelimit_mode})")
+        print(f"{'handler':<26} {'events/s':>10} {'sends/ev':>9} {'blocks/ev':>10} {'KiB/ev':>8} {'429s':>6}")
+        for name in names:
+            handler, make_args = scenarios[name]
+            result = await measure(main, channel, handler, make_args, args.events, args.concurrency)
+            print(
+                f"{name:<26} {result['events_per_sec']:>10.0f} {result['sends_per_event']:>9.2f} "
+                f"{result['blocks_per_event']:>10.1f} {result['bytes_per_event'] / 1024:>8.2f} {result['rate_limited']:>6}"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("handlers", nargs="*", help="handlers to replay (default: all)")
+    parser.add_argument("--events", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=100, help="events in flight per batch")
+    parser.add_argument("--latency", type=float, default=0.0, help="simulated send latency, ms")
+    parser.add_argument("--ratelimit-prob", type=float, default=0.0, help="chance a send hits a 429")
+    parser.add_argument("--ratelimit-mode", choices=("retry", "raise"), default="retry")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+/auditexport: memory, speed and part sizes for a large store.
+
+Writes a synthetic day-partitioned audit store (several guilds, 30 days),
+then exports one guild through iter_events + export_parts with a
+small upload limit. Reports rows and parts, the largest part against the
+limit, throughput and the tracemalloc peak, which should stay flat as the
+store grows.
+
+Usage: python benchmarks/bench_export.py [--events N] [--limit-kib N] [--format csv|jsonl]
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from audit_export import export_parts, iter_events
+from audit_store import PartitionedStore
+from sinks import AuditEvent
+
+GUILDS = (1, 2, 3, 4)
+ACTIONS = ("message_delete", "message_edit", "member_ban", "member_join", "role_update", "channel_update")
+
+
+def write_store(store: PartitionedStore, events: int, rng: random.Random):
+    start = time.time() - 30 * 86400
+    batch = []
+    for i in range(events):
+        batch.append(AuditEvent(
+            rng.choice(GUILDS), rng.choice(ACTIONS), f"member{rng.randrange(500)}",
+            f"A message was **deleted** in <#{rng.randrange(100)}>\n**Content:** " + "lorem ipsum " * rng.randint(1, 30),
+            start + i * (30 * 86400 / events), user_id=rng.randrange(500), channel_id=rng.randrange(100),
+        ))
+        if len(batch) == 1000:
+            store.append(batch)
+            batch.clear()
+    store.append(batch)
+    store.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=400000)
+    parser.add_argument("--limit-kib", type=int, default=1024, help="upload limit per file")
+    parser.add_argument("--format", choices=("csv", "jsonl"), default="csv")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        store = PartitionedStore(tmpdir)
+        write_store(store, args.events, random.Random(0))
+        store_mib = store.stats()["bytes"] / 1024 / 1024
+        limit = args.limit_kib * 1024
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        rows = parts = largest = 0
+        for _, fh, part_rows in export_parts(iter_events(store, GUILDS[0]), args.format, limit, "bench"):
+            fh.seek(0, os.SEEK_END)
+            largest = max(largest, fh.tell())
+            fh.close()
+            rows += part_rows
+            parts += 1
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    print(f"store: {args.events} events, {store_mib:.0f} MiB; exporting guild {GUILDS[0]} as {args.format}.gz")
+    print(f"rows: {rows}, parts: {parts}, largest part {largest / 1024:.0f} KiB (limit {args.limit_kib} KiB)")
+    print(f"{elapsed:.2f}s ({args.events / elapsed / 1000:.0f}k store lines/s), peak traced memory {peak / 1024:.0f} KiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Cost of filtered-out events versus events that are formatted and queued.
+
+Loads main.py with a guild filter that ignores half the channels, one role,
+bot authors and a content pattern, then times handler calls whose events are
+rejected by the rules against calls that pass and build embeds.
+
+Usage: python benchmarks/bench_filters.py [--events N] [--rules N] [--patterns N]
+"""
+
+import os
+import sys
+import copy
+import time
+import asyncio
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_events import CONTENT, GUILD_ID, AUDIT_CHANNEL_ID, load_bot_module
+from fake_discord import FakeGuild, FakeMember, FakeMessage, StubAuditChannel
+
+
+async def time_calls(main, handler, inputs: list) -> float:
+    """Microseconds per handler call (queue drained outside the timing)"""
+    start = time.perf_counter()
+    for args in inputs:
+        await handler(*args)
+    elapsed = time.perf_counter() - start
+    await asyncio.gather(*(pipeline.queue.join() for pipeline in main.dispatcher.pipelines.values()))
+    return elapsed / len(inputs) * 1e6
+
+
+async def run(args):
+    guild = FakeGuild(GUILD_ID, channels=100)
+    ignored = guild.text_channels[:50]
+    kept = guild.text_channels[50:]
+    noisy_role = guild.roles[0]
+
+    filters = {
+        "ignore": {
+            # Pad with unrelated IDs to show set lookups don't grow with rule count
+            "channels": [c.id for c in ignored] + list(range(1, args.rules)),
+            "roles": [noisy_role.id],
+            "actions": ["channel_update"],
+            "content": [r"^!\w+"] + [rf"\bfiller{i}\b" for i in range(args.patterns)],
+            "bots": True,
+        }
+    }
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        main = load_bot_module(tmpdir, filters=filters)
+        guild.attach_audit_channel(StubAuditChannel(guild, channel_id=AUDIT_CHANNEL_ID))
+        main.bot.get_guild = lambda guild_id: guild if guild_id == GUILD_ID else None
+
+        human = FakeMember(guild, "human", roles=guild.roles[5:8])
+        bot_user = FakeMember(guild, "bot", bot=True)
+        n = args.events
+
+        def member_update(member, role):
+            after = copy.copy(member)
+            after.roles = member.roles + [role]
+            return member, after
+
+        cases = [
+            ("message_delete ignored channel", main.on_message_delete,
+             [(FakeMessage(guild, ignored[i % 50], human, CONTENT),) for i in range(n)]),
+            ("message_delete ignored content", main.on_message_delete,
+             [(FakeMessage(guild, kept[i % 50], human, "!rank " + CONTENT),) for i in range(n)]),
+            ("message_delete kept", main.on_message_delete,
+             [(FakeMessage(guild, kept[i % 50], human, CONTENT),) for i in range(n)]),
+            ("member_update bot", main.on_member_update,
+             [member_update(bot_user, guild.roles[10]) for _ in range(n)]),
+            ("member_update kept", main.on_member_update,
+             [member_update(human, guild.roles[10]) for _ in range(n)]),
+            ("role_update ignored role", main.on_guild_role_update,
+             [(noisy_role, copy.copy(noisy_role)) for _ in range(n)]),
+            ("channel_update ignored action", main.on_guild_channel_update,
+             [(kept[0], copy.copy(kept[0])) for _ in range(n)]),
+        ]
+
+        print(f"{n} events per case, {args.rules} channel rules, {args.patterns + 1} content patterns")
+        print(f"{'case':<32} {'us/event':>9}")
+        for name, handler, inputs in cases:
+            print(f"{name:<32} {await time_calls(main, handler, inputs):>9.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=20000)
+    parser.add_argument("--rules", type=int, default=500, help="ignored channel IDs")
+    # The combined regex is scanned once per message, but Python's re still
+    # tries each alternative per position, so keep content rules few
+    parser.add_argument("--patterns", type=int, default=10, help="extra content patterns")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+RSS and time-to-ready per intents/cache profile.
+
+Starts main.py once per profile against the real gateway (BOT_TOKEN must be
+set), waits for the structured "Bot is ready!" log line and records its
+`ready_seconds` and `rss_kb` fields, then stops the bot.
+
+Usage: python benchmarks/bench_intents.py [profile ...] [--runs N]
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import subprocess
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+# (label, environment overrides)
+DEFAULT_CASES = [
+    ("full, chunked", {"INTENTS_PROFILE": "full", "CHUNK_GUILDS_AT_STARTUP": "1", "MEMBER_CACHE": "all"}),
+    ("standard, chunked", {"INTENTS_PROFILE": "standard", "CHUNK_GUILDS_AT_STARTUP": "1"}),
+    ("standard, lazy", {"INTENTS_PROFILE": "standard"}),
+    ("standard, lazy, no message cache", {"INTENTS_PROFILE": "standard", "MAX_MESSAGES": "0"}),
+    ("moderation, lazy", {"INTENTS_PROFILE": "moderation"}),
+    ("minimal", {"INTENTS_PROFILE": "minimal"}),
+]
+
+
+def run_once(overrides: dict, timeout: float) -> dict:
+    env = {**os.environ, "STATUS_SERVER": "0", "LOG_FORMAT": "json", **overrides}
+    proc = subprocess.Popen(
+        [sys.executable, os.path.join(ROOT, "main.py")],
+        env=env,
+        cwd=ROOT,
+        stderr=subprocess.PIPE,
+        stdout=subprocess.DEVNULL,
+        text=True,
+    )
+    deadline = time.monotonic() + timeout
+    result = None
+    try:
+        for line in proc.stderr:
+            if time.monotonic() > deadline:
+                break
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if "ready_seconds" in record:
+                result = {"ready_seconds": record["ready_seconds"], "rss_kb": record["rss_kb"]}
+                break
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("profiles", nargs="*", help="run only cases whose label starts with these")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--timeout", type=float, default=300.0)
+    args = parser.parse_args()
+
+    if not os.environ.get("BOT_TOKEN"):
+        sys.exit("BOT_TOKEN must be set; this benchmark connects to the real gateway")
+
+    cases = [c for c in DEFAULT_CASES if not args.profiles or any(c[0].startswith(p) for p in args.profiles)]
+    print(f"{'profile':<36} {'ready (s)':>10} {'rss (MiB)':>10}")
+    for label, overrides in cases:
+        samples = [r for r in (run_once(overrides, args.timeout) for _ in range(args.runs)) if r]
+        if not samples:
+            print(f"{label:<36} {'timeout':>10}")
+            continue
+        ready = sorted(s["ready_seconds"] for s in samples)[len(samples) // 2]
+        rss = sorted(s["rss_kb"] for s in samples)[len(samples) // 2]
+        print(f"{label:<36} {ready:>10.2f} {rss / 1024:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
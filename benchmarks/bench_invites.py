@@ -0,0 +1,82 @@
+"""
+Invite attribution for member joins: refetches per join burst and accuracy.
+
+Seeds an InviteTracker from a FakeGuild with many invites, then plays join
+traffic: isolated joins through random invites, and raids where hundreds of
+members join through one or a few invites within the burst window. Each join
+bumps its invite's use count (single-use invites are deleted, as Discord
+does) and awaits attribution. Reports joins, invite refetches and how many
+joins were attributed to exactly the right invite, to a candidate list
+containing it, or not at all.
+
+Usage: python benchmarks/bench_invites.py [--invites N] [--raid N] [--window SECONDS]
+"""
+
+import os
+import sys
+import time
+import random
+import asyncio
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fake_discord import FakeChannel, FakeGuild, FakeInvite, FakeUser
+from invite_tracker import InviteTracker
+
+
+async def join(tracker: InviteTracker, guild: FakeGuild, invite: FakeInvite, results: dict):
+    invite.uses += 1
+    if invite.max_uses and invite.uses >= invite.max_uses:
+        guild.invite_list.remove(invite)
+        tracker.deleted(invite)
+    used = await tracker.attribute(guild)
+    codes = [use.code for use in used]
+    key = "exact" if codes == [invite.code] else "candidate" if invite.code in codes else "missed"
+    results[key] += 1
+
+
+async def run(args):
+    rng = random.Random(0)
+    guild = FakeGuild(1)
+    channel = FakeChannel(guild, "welcome")
+    guild.invite_list = [FakeInvite(guild, channel, FakeUser(f"inviter{i}")) for i in range(args.invites)]
+    for invite in rng.sample(guild.invite_list, args.invites // 10):
+        invite.max_uses = 1
+
+    reusable = [invite for invite in guild.invite_list if not invite.max_uses]
+
+    tracker = InviteTracker(args.window)
+    await tracker.seed(guild)
+    results = {"exact": 0, "candidate": 0, "missed": 0}
+
+    scenarios = (
+        ("isolated joins", 20, lambda: [rng.choice(guild.invite_list)]),
+        ("raid, one invite", 3, lambda: [rng.choice(reusable)] * args.raid),
+        ("raid, three invites", 3, lambda: [rng.choice(picks) for picks in [rng.sample(reusable, 3)] for _ in range(args.raid)]),
+    )
+    print(f"{'scenario':<22} {'joins':>6} {'refetches':>10} {'exact':>6} {'candidate':>10} {'missed':>7} {'s':>6}")
+    for label, bursts, pick in scenarios:
+        before_fetches = guild.invite_fetches
+        before_joins = tracker.joins
+        for key in results:
+            results[key] = 0
+        start = time.perf_counter()
+        for _ in range(bursts):
+            await asyncio.gather(*(join(tracker, guild, invite, results) for invite in pick()))
+        elapsed = time.perf_counter() - start
+        print(f"{label:<22} {tracker.joins - before_joins:>6} {guild.invite_fetches - before_fetches:>10} "
+              f"{results['exact']:>6} {results['candidate']:>10} {results['missed']:>7} {elapsed:>6.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--invites", type=int, default=1000)
+    parser.add_argument("--raid", type=int, default=500, help="joins per raid burst")
+    parser.add_argument("--window", type=float, default=0.2, help="burst window, seconds")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Watchlist match throughput as the number of terms grows.
+
+Compares the Aho-Corasick KeywordMatcher against a per-term substring loop
+and a single combined regex alternation, on synthetic chat messages with a
+configurable share of watchlist hits.
+
+Usage: python benchmarks/bench_keywords.py [--terms 100,1000,5000,10000]
+           [--messages 2000] [--hit-rate 0.05]
+"""
+
+import os
+import re
+import sys
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from keyword_alerts import KeywordMatcher
+
+WORDS = (
+    "the a to and of in is it you that for on with this was are be at have not but what all "
+    "were when we there can an your which their said if do will each about how up out them "
+    "then she many some so these would other into has more her two like him see time could "
+    "server role channel ping mod ban kick nitro gift link free join event"
+).split()
+
+
+def make_terms(count: int, rng: random.Random) -> list:
+    """Random one- to three-word phrases from a made-up vocabulary"""
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    terms = set()
+    while len(terms) < count:
+        words = ["".join(rng.choice(letters) for _ in range(rng.randint(4, 9))) for _ in range(rng.randint(1, 3))]
+        terms.add(" ".join(words))
+    return sorted(terms)
+
+
+def make_messages(count: int, terms: list, hit_rate: float, rng: random.Random) -> list:
+    messages = []
+    for _ in range(count):
+        words = [rng.choice(WORDS) for _ in range(rng.randint(8, 60))]
+        if rng.random() < hit_rate:
+            words.insert(rng.randrange(len(words)), rng.choice(terms))
+        messages.append(" ".join(words))
+    return messages
+
+
+def substring_loop(terms: list):
+    folded = [term.casefold() for term in terms]
+    return lambda text: [term for term in folded if term in text.casefold()]
+
+
+def combined_regex(terms: list):
+    pattern = re.compile("|".join(rf"\b{re.escape(term)}\b" for term in terms), re.IGNORECASE)
+    return lambda text: pattern.findall(text)
+
+
+def time_matcher(match, messages: list) -> tuple:
+    start = time.perf_counter()
+    hits = sum(1 for text in messages if match(text))
+    elapsed = time.perf_counter() - start
+    return elapsed / len(messages) * 1e6, hits
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--terms", type=lambda s: [int(x) for x in s.split(",")], default=[100, 1000, 5000, 10000])
+    parser.add_argument("--messages", type=int, default=2000)
+    parser.add_argument("--hit-rate", type=float, default=0.05)
+    parser.add_argument("--skip-slow", action="store_true", help="only time Aho-Corasick")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    print(f"{args.messages} messages, {args.hit_rate:.0%} with a watchlisted term")
+    print(f"{'terms':>6} {'method':<16} {'build ms':>9} {'us/msg':>9} {'msgs/s':>9} {'hits':>6}")
+    for count in args.terms:
+        terms = make_terms(count, rng)
+        messages = make_messages(args.messages, terms, args.hit_rate, rng)
+        methods = [("aho-corasick", lambda: KeywordMatcher(terms).find)]
+        if not args.skip_slow:
+            methods += [("substring loop", lambda: substring_loop(terms)), ("combined regex", lambda: combined_regex(terms))]
+        for name, build in methods:
+            start = time.perf_counter()
+            match = build()
+            build_ms = (time.perf_counter() - start) * 1000
+            per_message, hits = time_matcher(match, messages)
+            print(f"{count:>6} {name:<16} {build_ms:>9.1f} {per_message:>9.1f} {1e6 / per_message:>9.0f} {hits:>6}")
+
+
+if __name__ == "__main__":
+    main()
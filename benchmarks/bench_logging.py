@@ -0,0 +1,107 @@
+"""
+Per-event logging cost on the calling (event loop) thread.
+
+Compares the old `logging.basicConfig` StreamHandler with f-string messages
+against the queue-based pipeline from logging_setup.py with lazy %-style
+arguments. Output goes to a real file so the synchronous case pays for I/O. Events are
+logged in bursts with short idle gaps, like handlers on a live loop; only
+the time spent inside the logging calls is counted.
+
+Usage: python benchmarks/bench_logging.py [events]
+"""
+
+import os
+import sys
+import time
+import logging
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from logging_setup import setup_logging, stop_logging
+
+GUILD = 1289789596238086194
+BURST = 100  # events logged back-to-back before the loop yields
+
+
+class _Member:
+    """Stand-in with a non-trivial __str__, like discord.Member"""
+
+    def __init__(self, i):
+        self.id = 1289789596238086194 + i
+        self.name = f"member{i}"
+
+    def __str__(self):
+        return f"{self.name}#0001"
+
+
+def _reset_root():
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+        handler.close()
+
+
+def bench_sync(path: str, events: int) -> float:
+    """Old setup: basicConfig StreamHandler, eager f-strings"""
+    _reset_root()
+    stream = open(path, "w")
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        stream=stream,
+        force=True,
+    )
+    log = logging.getLogger("bench")
+    members = [_Member(i) for i in range(64)]
+
+    elapsed = 0
+    for base in range(0, events, BURST):
+        start = time.perf_counter_ns()
+        for i in range(base, base + BURST):
+            member = members[i & 63]
+            log.info(f"Member update event triggered for {member} (ID: {member.id}) in guild {GUILD}")
+        elapsed += time.perf_counter_ns() - start
+        time.sleep(0.001)
+
+    _reset_root()
+    stream.close()
+    return elapsed / events
+
+
+def bench_queue(path: str, events: int, level: str) -> float:
+    """New setup: queue handler + JSON listener, lazy args"""
+    _reset_root()
+    stream = open(path, "w")
+    os.environ["LOG_RATE"] = f"{events}:{events}"  # measure handoff cost, not suppression
+    listener = setup_logging(level=level, fmt="json", stream=stream)
+    log = logging.getLogger("bench")
+    members = [_Member(i) for i in range(64)]
+
+    elapsed = 0
+    for base in range(0, events, BURST):
+        start = time.perf_counter_ns()
+        for i in range(base, base + BURST):
+            member = members[i & 63]
+            log.debug("Member update event triggered for %s (ID: %s) in guild %s", member, member.id, GUILD)
+        elapsed += time.perf_counter_ns() - start
+        time.sleep(0.001)  # idle loop time, when the listener thread catches up
+
+    stop_logging(listener)
+    _reset_root()
+    stream.close()
+    return elapsed / events
+
+
+if __name__ == "__main__":
+    events = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.log")
+        results = [
+            ("sync StreamHandler, f-string, INFO", bench_sync(path, events)),
+            ("queue + JSON, lazy args, emitted", bench_queue(path, events, "DEBUG")),
+            ("queue + JSON, lazy args, below level", bench_queue(path, events, "INFO")),
+        ]
+    print(f"{events} events, cost on calling thread")
+    for label, ns in results:
+        print(f"  {label:<40} {ns / 1000:8.2f} us/event")
@@ -0,0 +1,80 @@
+"""
+/auditgrep: FTS5 index build rate and query latency over millions of rows.
+
+Indexes N synthetic deleted/edited messages (Zipf-ish vocabulary, several
+guilds) through MessageIndex in flush-sized batches, then times searches for
+common, rare and multi-word terms, with and without an author filter.
+Target: every query under 100 ms.
+
+Usage: python benchmarks/bench_message_index.py [--rows N] [--batch N]
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import itertools
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from message_index import DELETED, EDITED, MessageIndex
+
+GUILDS = (1, 2, 3, 4)
+VOCABULARY = [f"word{i}" for i in range(20000)]
+CUM_WEIGHTS = list(itertools.accumulate(1 / (rank + 1) for rank in range(len(VOCABULARY))))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--batch", type=int, default=2000, help="rows per write() transaction")
+    args = parser.parse_args()
+    rng = random.Random(0)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        index = MessageIndex(os.path.join(tmpdir, "messages.db"))
+        # One draw for the whole corpus; per-message draws would dominate the run
+        corpus = rng.choices(VOCABULARY, cum_weights=CUM_WEIGHTS, k=args.rows * 17)
+        position = 0
+        now = time.time() - args.rows
+        build = 0.0
+        for offset in range(0, args.rows, args.batch):
+            for i in range(offset, min(offset + args.batch, args.rows)):
+                length = rng.randint(4, 30)
+                words = corpus[position:position + length]
+                position += length
+                edited = i % 3 == 0
+                index.add(rng.choice(GUILDS), rng.randrange(100), rng.randrange(5000), i,
+                          EDITED if edited else DELETED, " ".join(words),
+                          " ".join(words[:-1]) if edited else "", created=now + i)
+            start = time.perf_counter()
+            index.write(index.take_pending())
+            build += time.perf_counter() - start
+        size_mib = sum(os.path.getsize(os.path.join(tmpdir, name)) for name in os.listdir(tmpdir)) / 2**20
+        print(f"indexed {args.rows} rows in {build:.1f}s ({args.rows / build:.0f} rows/s), {size_mib:.0f} MiB on disk")
+
+        queries = [
+            ("common term", "word0", None),
+            ("mid term", "word50", None),
+            ("rare term", "word19000", None),
+            ("two terms", "word3 word700", None),
+            ("absent term", "nomatch", None),
+            ("common + author", "word0", 42),
+            ("rare + author", "word19000", 42),
+            ("guild token text", "g1", None),
+        ]
+        print(f"{'query':<18} {'ms (median of 20)':>18} {'hits':>5}")
+        for label, text, author in queries:
+            timings = []
+            for _ in range(20):
+                began = time.perf_counter()
+                hits = index.search(GUILDS[0], text, author_id=author, limit=10)
+                timings.append((time.perf_counter() - began) * 1000)
+            print(f"{label:<18} {sorted(timings)[10]:>18.2f} {len(hits):>5}")
+        index.close()
+
+
+if __name__ == "__main__":
+    main()
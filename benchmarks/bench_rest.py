@@ -0,0 +1,179 @@
+"""
+Outbound throughput and loss against the fake Discord REST server.
+
+Runs benchmarks/fake_rest_server.py in-process, points the bot's HTTP base
+URL at it (DISCORD_API_BASE) and logs in with a fake token. The audit
+channel is a real PartialMessageable, so every post goes through
+send_audit_log / post_audit, the guild pipeline and discord.py's HTTP client
+with its real rate-limit handling. Events are offered open-loop at 1x, 10x
+and 100x a base rate, with optional latency, 5xx failures or an outage.
+
+Usage: python benchmarks/bench_rest.py [--base-rate 2] [--duration 10]
+           [--multipliers 1,10,100] [--failure-rate 0.05] [--outage-at 3]
+           [--webhooks 2] [--guild-rate 5 --guild-per 5]
+"""
+
+import os
+import sys
+import time
+import random
+import asyncio
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_events import AUDIT_CHANNEL_ID, GUILD_ID, build_scenarios, load_bot_module
+from fake_discord import FakeGuild
+from fake_rest_server import FakeDiscordRest, FakeRestConfig, start_server
+
+# Handlers mixed into the offered load
+MIX = ("on_message_delete", "on_message_edit", "on_member_update", "on_guild_role_update", "log_audit_entry")
+
+
+class RestAuditChannel:
+    """Audit channel backed by a PartialMessageable, so sends hit the REST server"""
+
+    def __init__(self, partial):
+        self.id = partial.id
+        self.name = "audit-logistics"
+        self.mention = f"<#{partial.id}>"
+        self._partial = partial
+
+    async def send(self, *args, **kwargs):
+        return await self._partial.send(*args, **kwargs)
+
+
+async def offer_load(scenarios: dict, rate: float, duration: float, rng: random.Random) -> int:
+    """Fire handler calls open-loop at `rate`/s for `duration` seconds"""
+    tasks = []
+    interval = 1.0 / rate
+    start = time.perf_counter()
+    offered = 0
+    while time.perf_counter() - start < duration:
+        handler, make_args = scenarios[rng.choice(MIX)]
+        tasks.append(asyncio.create_task(handler(*make_args(offered))))
+        offered += 1
+        next_at = start + offered * interval
+        await asyncio.sleep(max(0.0, next_at - time.perf_counter()))
+    await asyncio.gather(*tasks, return_exceptions=True)
+    return offered
+
+
+async def wait_drained(main, timeout: float) -> bool:
+    try:
+        await asyncio.wait_for(
+            asyncio.gather(*(pipeline.queue.join() for pipeline in main.dispatcher.pipelines.values())),
+            timeout,
+        )
+        return True
+    except asyncio.TimeoutError:
+        return False
+
+
+async def run(args):
+    server = FakeDiscordRest(FakeRestConfig(
+        bucket_limit=args.bucket_limit,
+        bucket_window=args.bucket_window,
+        global_limit=args.global_limit,
+        latency=args.latency / 1000.0,
+        jitter=args.jitter / 1000.0,
+        failure_rate=args.failure_rate,
+    ))
+    runner = await start_server(server, port=args.port)
+    os.environ["DISCORD_API_BASE"] = f"http://127.0.0.1:{args.port}/api/v10"
+
+    guild_options = {"rate": args.guild_rate, "per": args.guild_per, "queue_size": args.queue_size}
+    if args.webhooks:
+        guild_options["webhooks"] = [
+            f"https://discord.com/api/webhooks/{1_450_000_000_000_000_000 + i}/{'t' * 60}{i:08d}" for i in range(args.webhooks)
+        ]
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        main = load_bot_module(tmpdir, **guild_options)
+        await main.bot.http.static_login("fake-token")
+
+        guild = FakeGuild(GUILD_ID)
+        guild.attach_audit_channel(RestAuditChannel(main.bot.get_partial_messageable(AUDIT_CHANNEL_ID, guild_id=GUILD_ID)))
+        main.bot.get_guild = lambda guild_id: guild if guild_id == GUILD_ID else None
+        scenarios = build_scenarios(main, guild)
+        rng = random.Random(0)
+
+        print(
+            f"base {args.base_rate}/s for {args.duration}s, bucket {args.bucket_limit}/{args.bucket_window}s, "
+            f"guild budget {args.guild_rate}/{args.guild_per}s, latency {args.latency}ms, "
+            f"5xx p={args.failure_rate}, webhooks {args.webhooks}"
+        )
+        print(f"{'load':>6} {'offered':>8} {'delivered':>9} {'dropped':>8} {'failed':>7} {'queued':>7} "
+              f"{'loss %':>7} {'deliv/s':>8} {'429s':>6} {'5xx':>6}")
+
+        for multiplier in args.multipliers:
+            server.reset_stats()
+            before = {guild_id: dict(p.stats()) for guild_id, p in main.dispatcher.pipelines.items()}
+            rate = args.base_rate * multiplier
+
+            outage_task = None
+            if args.outage_at is not None:
+                async def outage():
+                    await asyncio.sleep(args.outage_at)
+                    server.config.outage = True
+                    await asyncio.sleep(args.outage_for)
+                    server.config.outage = False
+                outage_task = asyncio.create_task(outage())
+
+            start = time.perf_counter()
+            offered = await offer_load(scenarios, rate, args.duration, rng)
+            await wait_drained(main, args.drain_timeout)
+            elapsed = time.perf_counter() - start
+            if outage_task is not None:
+                outage_task.cancel()
+                server.config.outage = False
+
+            stats = main.dispatcher.pipeline(GUILD_ID).stats()
+            prev = before.get(GUILD_ID, {"sent": 0, "failed": 0, "dropped": 0})
+            delivered = server.stats["messages.accepted"] + server.stats["webhooks.accepted"]
+            dropped = stats["dropped"] - prev["dropped"]
+            failed = stats["failed"] - prev["failed"]
+            rate_limited = sum(v for k, v in server.stats.items() if ".429" in k)
+            server_errors = sum(v for k, v in server.stats.items() if k.endswith((".500", ".502", ".503", ".504")))
+            loss = 100.0 * (offered - delivered) / offered if offered else 0.0
+            print(
+                f"{multiplier:>5}x {offered:>8} {delivered:>9} {dropped:>8} {failed:>7} {stats['queued']:>7} "
+                f"{loss:>7.1f} {delivered / elapsed:>8.1f} {rate_limited:>6} {server_errors:>6}"
+            )
+
+            # Start the next level from an empty queue
+            for pipeline in main.dispatcher.pipelines.values():
+                while not pipeline.queue.empty():
+                    pipeline.queue.get_nowait()
+                    pipeline.queue.task_done()
+
+        await main.webhooks.close()
+        await main.bot.http.close()
+    await runner.cleanup()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--base-rate", type=float, default=2.0, help="normal audit events per second")
+    parser.add_argument("--multipliers", type=lambda s: [int(x) for x in s.split(",")], default=[1, 10, 100])
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds of offered load per level")
+    parser.add_argument("--drain-timeout", type=float, default=30.0)
+    parser.add_argument("--bucket-limit", type=int, default=5)
+    parser.add_argument("--bucket-window", type=float, default=5.0)
+    parser.add_argument("--global-limit", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=20.0, help="server latency, ms")
+    parser.add_argument("--jitter", type=float, default=10.0, help="extra random latency, ms")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="chance of a 502 per request")
+    parser.add_argument("--outage-at", type=float, default=None, help="start a 503 outage after N seconds")
+    parser.add_argument("--outage-for", type=float, default=5.0)
+    parser.add_argument("--webhooks", type=int, default=0, help="deliver through N fake webhooks")
+    parser.add_argument("--guild-rate", type=int, default=5)
+    parser.add_argument("--guild-per", type=float, default=5.0)
+    parser.add_argument("--queue-size", type=int, default=1000)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
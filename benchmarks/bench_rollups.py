@@ -0,0 +1,73 @@
+"""
+/auditstats cost: rolling rollups versus scanning raw event history.
+
+Feeds N synthetic events spread over 30 days (a few hundred actors and
+channels, a dozen action types) into a RollupStore, then times a 7-day query
+against the rollup totals and against a linear scan of the same events.
+Rollup query time should stay flat as N grows; the scan grows with N.
+
+Usage: python benchmarks/bench_rollups.py [--events 10000,100000,1000000]
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+from collections import Counter
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from rollups import RollupStore
+
+ACTIONS = ("message_delete", "message_edit", "member_ban", "member_kick", "member_join", "member_remove",
+           "role_update", "channel_update", "member_update", "invite_create", "emoji_update", "webhook_update")
+DAYS = 30
+
+
+def scan(events: list, now: float, action: str):
+    cutoff = now - 7 * 86400
+    actors = Counter(user_id for ts, name, user_id, _ in events if ts >= cutoff and name == action)
+    return sum(actors.values()), actors.most_common(5)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", default="10000,100000,1000000")
+    args = parser.parse_args()
+
+    print(f"{'events':>9} {'record us/ev':>13} {'rollup query us':>16} {'scan query ms':>14} {'saved KiB':>10}")
+    for total in (int(value) for value in args.events.split(",")):
+        rng = random.Random(total)
+        now = time.time()
+        start_ts = now - DAYS * 86400
+        events = sorted(
+            (start_ts + rng.random() * DAYS * 86400, rng.choice(ACTIONS), rng.randrange(300), rng.randrange(100))
+            for _ in range(total)
+        )
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store = RollupStore(os.path.join(tmpdir, "rollups.json"))
+            start = time.perf_counter()
+            for ts, action, user_id, channel_id in events:
+                store.record(1, ts, action, user_id, channel_id)
+            record_us = (time.perf_counter() - start) / total * 1e6
+
+            start = time.perf_counter()
+            for _ in range(100):
+                count, actors, _, _ = store.query(1, "7d", "member_ban")
+            query_us = (time.perf_counter() - start) / 100 * 1e6
+
+            start = time.perf_counter()
+            scan_count, _ = scan(events, now, "member_ban")
+            scan_ms = (time.perf_counter() - start) * 1000
+
+            store.save()
+            saved_kib = os.path.getsize(store.path) / 1024
+        # The 7 daily buckets include today's partial day, so they cover 6-7 days against the exact 7-day scan
+        print(f"{total:>9} {record_us:>13.2f} {query_us:>16.1f} {scan_ms:>14.1f} {saved_kib:>10.0f}"
+              f"   ({count} vs {scan_count} by scan)")
+
+
+if __name__ == "__main__":
+    main()
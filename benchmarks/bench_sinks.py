@@ -0,0 +1,83 @@
+"""
+Sink isolation: one slow sink must not hold up the others.
+
+Publishes a burst of events to a JSONL file sink, a stdout sink (to
+/dev/null) and a deliberately slow sink whose writes sleep, each with its
+own bounded queue. Reports publish cost per event and each sink's counters
+after the others have drained; the slow sink should drop while the rest
+write everything.
+
+Usage: python benchmarks/bench_sinks.py [--events N] [--slow-ms MS] [--queue-size N]
+"""
+
+import os
+import sys
+import time
+import asyncio
+import logging
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from audit_store import PartitionedStore
+from sinks import AuditEvent, JsonlFileSink, QueuedSink, SinkFanout, StdoutSink
+
+
+class SlowSink(QueuedSink):
+    """Stands in for a stalled disk or remote collector"""
+    name = "slow"
+
+    def __init__(self, delay: float, **kwargs):
+        super().__init__(**kwargs)
+        self.delay = delay
+
+    def write_batch(self, events: list):
+        time.sleep(self.delay)
+
+
+async def run(args):
+    with tempfile.TemporaryDirectory() as tmpdir, open(os.devnull, "w") as devnull:
+        fanout = SinkFanout([
+            JsonlFileSink(PartitionedStore(os.path.join(tmpdir, "audit")), queue_size=args.queue_size),
+            StdoutSink(devnull, queue_size=args.queue_size),
+            SlowSink(args.slow_ms / 1000.0, queue_size=args.queue_size, batch_size=10),
+        ])
+        events = [
+            AuditEvent(1, "message_delete", f"member{i}", "A message was **deleted** " * 8, time.time(), user_id=i)
+            for i in range(args.events)
+        ]
+
+        start = time.perf_counter()
+        publishing = 0.0
+        for i, event in enumerate(events):
+            began = time.perf_counter()
+            fanout.publish(event)
+            publishing += time.perf_counter() - began
+            if i % 100 == 99:
+                await asyncio.sleep(0.001)  # bursts of 100, with gaps like gateway traffic
+        publish_us = publishing / args.events * 1e6
+
+        fast = [sink for sink in fanout.sinks if sink.name != "slow"]
+        await asyncio.gather(*(sink.queue.join() for sink in fast))
+        fast_done = time.perf_counter() - start
+
+        print(f"{args.events} events, queue {args.queue_size}/sink, slow sink {args.slow_ms}ms per 10-event batch")
+        print(f"publish: {publish_us:.1f} us/event, file+stdout drained after {fast_done:.2f}s")
+        print(f"{'sink':<8} {'written':>8} {'queued':>7} {'dropped':>8} {'failed':>7}")
+        for name, stats in fanout.stats().items():
+            print(f"{name:<8} {stats['written']:>8} {stats['queued']:>7} {stats['dropped']:>8} {stats['failed']:>7}")
+        await fanout.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=50000)
+    parser.add_argument("--slow-ms", type=float, default=50.0)
+    parser.add_argument("--queue-size", type=int, default=10000)
+    logging.basicConfig(level=logging.ERROR)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
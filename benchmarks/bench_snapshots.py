@@ -0,0 +1,84 @@
+"""
+Guild snapshot capture and diff cost as guilds grow.
+
+Builds synthetic guilds with N roles and N channels (each channel carrying a
+few permission overwrites), changes about 1% of them plus a mass role
+reorder, and times capture, diff and the JSON round trip. Time per object
+should stay flat as N grows if the diff is linear.
+
+Usage: python benchmarks/bench_snapshots.py [--sizes 1000,5000,20000]
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import discord
+from discord.abc import _Overwrites
+
+from snapshots import capture, diff_snapshots
+
+
+def build_guild(size: int, rng: random.Random) -> SimpleNamespace:
+    roles = [
+        SimpleNamespace(id=10_000 + i, name=f"role-{i}", color=discord.Colour(rng.randrange(1 << 24)),
+                        permissions=discord.Permissions(rng.randrange(1 << 40)), hoist=False, mentionable=False, position=i)
+        for i in range(size)
+    ]
+    channels = [
+        SimpleNamespace(id=1_000_000 + i, name=f"channel-{i}", type=discord.ChannelType.text, category_id=None,
+                        topic="", nsfw=False, slowmode_delay=0, position=i,
+                        _overwrites=[_Overwrites({"id": roles[rng.randrange(size)].id, "allow": "1024", "deny": "0", "type": 0})
+                                     for _ in range(3)])
+        for i in range(size)
+    ]
+    return SimpleNamespace(id=1, roles=roles, channels=channels, emojis=[], stickers=[])
+
+
+def mutate(guild: SimpleNamespace, rng: random.Random):
+    size = len(guild.roles)
+    for role in rng.sample(guild.roles, size // 100):
+        role.name += "-renamed"
+    for channel in rng.sample(guild.channels, size // 100):
+        channel._overwrites = channel._overwrites[1:]
+    for role in guild.roles[size // 2:]:
+        role.position += 1  # one role inserted mid-list renumbers the rest
+    del guild.channels[:size // 200]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="1000,5000,20000", help="roles (and channels) per guild")
+    args = parser.parse_args()
+
+    print(f"{'objects':>8} {'capture ms':>11} {'diff ms':>8} {'ns/object':>10} {'lines':>6} {'JSON KiB':>9} {'load ms':>8}")
+    for size in (int(value) for value in args.sizes.split(",")):
+        rng = random.Random(size)
+        guild = build_guild(size, rng)
+        start = time.perf_counter()
+        old = capture(guild)
+        capture_ms = (time.perf_counter() - start) * 1000
+        payload = json.dumps(old, separators=(",", ":"))
+        start = time.perf_counter()
+        old = json.loads(payload)
+        load_ms = (time.perf_counter() - start) * 1000
+
+        mutate(guild, rng)
+        new = capture(guild)
+        start = time.perf_counter()
+        lines = diff_snapshots(old, new)
+        diff_seconds = time.perf_counter() - start
+
+        objects = 2 * size
+        print(f"{objects:>8} {capture_ms:>11.1f} {diff_seconds * 1000:>8.1f} {diff_seconds / objects * 1e9:>10.0f} "
+              f"{len(lines):>6} {len(payload) / 1024:>9.0f} {load_ms:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
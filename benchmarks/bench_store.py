@@ -0,0 +1,74 @@
+"""
+Partitioned audit store: recent-data queries versus history size, plus
+compaction and retention cost.
+
+Builds stores holding 30 days, 1 year and 3 years of synthetic history, then:
+times a query over the last 2 days (should stay flat as history grows),
+times one maintain() pass that compacts every finished day to gzip, and
+times the retention pass that drops everything past 30 days (one unlink per
+partition, independent of how many events they hold).
+
+Usage: python benchmarks/bench_store.py [--days 30,365,1095] [--per-day N]
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from audit_export import iter_events
+from audit_store import PartitionedStore
+from sinks import AuditEvent
+
+
+def fill(store: PartitionedStore, days: int, per_day: int, now: float):
+    start = now - days * 86400
+    step = 86400 / per_day
+    for day in range(days + 1):
+        base = start + day * 86400
+        store.append([
+            AuditEvent(1, "message_delete", f"member{i % 300}", f"A message was **deleted**\n**Content:** message {i} " * 3,
+                       base + i * step, user_id=i % 300, channel_id=i % 50)
+            for i in range(per_day)
+        ])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--days", default="30,365,1095", help="history lengths to build")
+    parser.add_argument("--per-day", type=int, default=500, help="events per day")
+    args = parser.parse_args()
+
+    print(f"{'days':>5} {'events':>8} {'2-day query ms':>15} {'compact s':>10} {'MiB before':>11} {'MiB after':>10} "
+          f"{'drop ms':>8} {'dropped':>8}")
+    for days in (int(value) for value in args.days.split(",")):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            now = time.time()
+            store = PartitionedStore(tmpdir, retention_days=0)
+            fill(store, days, args.per_day, now)
+            before = store.stats()["bytes"]
+
+            start = time.perf_counter()
+            rows = sum(1 for _ in iter_events(store, 1, since=now - 2 * 86400))
+            query_ms = (time.perf_counter() - start) * 1000
+
+            start = time.perf_counter()
+            store.maintain(now)
+            compact_s = time.perf_counter() - start
+            after = store.stats()["bytes"]
+
+            store.retention_days = 30
+            start = time.perf_counter()
+            store.maintain(now)
+            drop_ms = (time.perf_counter() - start) * 1000
+            store.close()
+
+        print(f"{days:>5} {days * args.per_day:>8} {query_ms:>15.1f} {compact_s:>10.2f} {before / 2**20:>11.1f} "
+              f"{after / 2**20:>10.1f} {drop_ms:>8.1f} {store.dropped_partitions:>8}   ({rows} rows)")
+
+
+if __name__ == "__main__":
+    main()
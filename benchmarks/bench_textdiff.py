@@ -0,0 +1,66 @@
+"""
+Word diff cost on typical and pathological edits.
+
+Each case runs render_word_diff repeatedly and reports the mean and worst
+time per call and whether it produced a diff or fell back to truncation
+(None). The worst case should stay near the time budget however large or
+adversarial the input.
+
+Usage: python benchmarks/bench_textdiff.py [--repeat N] [--budget MS]
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from textdiff import render_word_diff
+
+SENTENCE = "The quick brown fox jumps over the lazy dog while the moderators watch the audit channel. "
+
+
+def cases(rng: random.Random) -> list:
+    long_text = SENTENCE * 45  # ~4000 chars, Discord's Nitro message limit
+    words = long_text.split()
+    shuffled = words[:]
+    rng.shuffle(shuffled)
+    scattered = [f"{word}!" if i % 7 == 0 else word for i, word in enumerate(words)]
+    random_a = " ".join("".join(rng.choice("abcdefgh") for _ in range(5)) for _ in range(700))
+    random_b = " ".join("".join(rng.choice("abcdefgh") for _ in range(5)) for _ in range(700))
+    return [
+        ("typo in short message", "see you at the meeting tomorow", "see you at the meeting tomorrow"),
+        ("one word in 4000 chars", long_text, long_text.replace("lazy", "sleepy", 1)),
+        ("append to 4000 chars", long_text, long_text + "edit: fixed link"),
+        ("every 7th word changed", long_text, " ".join(scattered)),
+        ("shuffled words", long_text, " ".join(shuffled)),
+        ("two unrelated texts", random_a, random_b),
+        ("repeated token shift", "a " * 2000, "b " + "a " * 1999),
+        ("single 4000-char word", "x" * 4000, "x" * 3999 + "y"),
+        ("empty to long", "", long_text),
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--budget", type=float, default=5.0, help="time budget per diff, ms")
+    args = parser.parse_args()
+
+    print(f"{args.repeat} runs per case, budget {args.budget}ms")
+    print(f"{'case':<26} {'mean us':>9} {'max us':>9} {'result':>8}")
+    for name, before, after in cases(random.Random(0)):
+        timings = []
+        result = None
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            result = render_word_diff(before, after, time_budget=args.budget / 1000.0)
+            timings.append((time.perf_counter() - start) * 1e6)
+        outcome = "fallback" if result is None else f"{len(result)} ch"
+        print(f"{name:<26} {sum(timings) / len(timings):>9.0f} {max(timings):>9.0f} {outcome:>8}")
+
+
+if __name__ == "__main__":
+    main()
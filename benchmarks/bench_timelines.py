@@ -0,0 +1,92 @@
+"""
+/audituser: per-member ring buffers under a member cap, and the store fallback.
+
+Publishes N synthetic events (Zipf-ish actors, some with a target member)
+through TimelineSink with max_users well below the number of members, then
+reports the record rate, traced memory (bounded by the cap, not by N),
+lookup latency for an active member, and the cost of rebuilding an
+evicted member's timeline from a day-partitioned store.
+
+Usage: python benchmarks/bench_timelines.py [--events N] [--members N] [--max-users N]
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import itertools
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from audit_store import PartitionedStore
+from sinks import AuditEvent
+from user_timelines import TimelineSink, UserTimelines
+
+ACTIONS = ("message_delete", "message_edit", "member_ban", "member_update", "role_update")
+
+
+def make_events(count: int, members: int, rng: random.Random) -> list:
+    cum_weights = list(itertools.accumulate(1 / (rank + 1) for rank in range(members)))
+    actors = rng.choices(range(members), cum_weights=cum_weights, k=count)
+    start = time.time() - 7 * 86400
+    return [
+        AuditEvent(1, rng.choice(ACTIONS), f"member{actor}", f"**Something happened** to event {i}\n**Details:** ...",
+                   start + i * (7 * 86400 / count), user_id=actor,
+                   target_id=rng.randrange(members) if i % 4 == 0 else None)
+        for i, actor in enumerate(actors)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=500000)
+    parser.add_argument("--members", type=int, default=200000)
+    parser.add_argument("--max-users", type=int, default=20000)
+    args = parser.parse_args()
+    events = make_events(args.events, args.members, random.Random(0))
+
+    timelines = UserTimelines(args.max_users)
+    sink = TimelineSink(timelines)
+    start = time.perf_counter()
+    for event in events:
+        sink.submit(event)
+    elapsed = time.perf_counter() - start
+
+    # Same run again under tracemalloc (which slows it down) for the memory figure
+    tracemalloc.start()
+    measured = TimelineSink(UserTimelines(args.max_users))
+    for event in events:
+        measured.submit(event)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del measured
+    stats = timelines.stats()
+    print(f"recorded {args.events} events in {elapsed:.2f}s ({args.events / elapsed / 1000:.0f}k/s)")
+    print(f"members in memory: {stats['users']} (cap {args.max_users}), evicted {stats['evicted']}, "
+          f"traced memory {current / 2**20:.1f} MiB")
+
+    start = time.perf_counter()
+    for _ in range(1000):
+        timelines.get(1, 0)
+    print(f"hot lookup: {(time.perf_counter() - start) * 1000:.3f} ms per 1000")
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        store = PartitionedStore(tmpdir)
+        for offset in range(0, len(events), 1000):
+            store.append(events[offset:offset + 1000])
+        # An early actor that has since been evicted
+        cold = next(event.user_id for event in events if timelines.get(1, event.user_id) is None)
+        start = time.perf_counter()
+        loaded = timelines.load(store, 1, cold, time.time() - 30 * 86400)
+        entries = timelines.fill(1, cold, loaded)
+        load_ms = (time.perf_counter() - start) * 1000
+        size_mib = store.stats()["bytes"] / 2**20
+        store.close()
+    print(f"cold member {cold}: rebuilt {len(entries)} entries from a {size_mib:.0f} MiB store in {load_ms:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
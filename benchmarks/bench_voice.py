@@ -0,0 +1,117 @@
+"""
+Voice sessions: update throughput, memory for a large voice population, and
+how many log entries the raw voice state updates turn into.
+
+Simulates a guild with M members in voice across many channels over a
+simulated hour: random joins, leaves, moves, self mutes and moderator
+mutes, plus periodic mass moves (one channel dragged into another) and mass
+leaves (a channel emptied at once). Time is simulated, so take_logs() runs
+every simulated second without sleeping. Reports updates/s, traced memory
+of the open sessions, and raw updates versus logged entries.
+
+Usage: python benchmarks/bench_voice.py [--members N] [--channels N] [--updates N]
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import tracemalloc
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from voice_sessions import MASS_LEAVE, MASS_MOVE, SESSION, VoiceSessions
+
+GUILD_ID = 1
+
+
+def voice_state(channel, mute=False, deaf=False, self_mute=False):
+    return SimpleNamespace(channel=channel, mute=mute, deaf=deaf, self_mute=self_mute)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--members", type=int, default=20000, help="members in voice at the start")
+    parser.add_argument("--channels", type=int, default=500)
+    parser.add_argument("--updates", type=int, default=300000, help="random voice updates over the hour")
+    args = parser.parse_args()
+    rng = random.Random(0)
+    channels = [SimpleNamespace(id=1000 + i) for i in range(args.channels)]
+    states = {}  # member_id -> current voice state
+    sessions = VoiceSessions(max_sessions=args.members * 10)
+    logged = {SESSION: 0, MASS_MOVE: 0, MASS_LEAVE: 0}
+    updates = 0
+    elapsed = 0.0
+
+    def apply(member_id, after, now):
+        nonlocal updates, elapsed
+        before = states.get(member_id, voice_state(None))
+        began = time.perf_counter()
+        sessions.update(GUILD_ID, member_id, f"member{member_id}", before, after, now)
+        elapsed += time.perf_counter() - began
+        updates += 1
+        if after.channel is None:
+            states.pop(member_id, None)
+        else:
+            states[member_id] = after
+
+    now = 0.0
+    for member_id in range(args.members):
+        apply(member_id, voice_state(rng.choice(channels)), now)
+
+    per_second = args.updates / 3600
+    next_member = args.members
+    for second in range(1, 3601):
+        now = float(second)
+        for _ in range(int(per_second) + (rng.random() < per_second % 1)):
+            roll = rng.random()
+            if roll < 0.25 or not states:
+                apply(next_member, voice_state(rng.choice(channels)), now)
+                next_member += 1
+                continue
+            member_id = rng.choice(list(states)) if len(states) < 64 else rng.randrange(next_member)
+            current = states.get(member_id)
+            if current is None:
+                continue
+            if roll < 0.5:
+                apply(member_id, voice_state(None), now)
+            elif roll < 0.75:
+                apply(member_id, voice_state(rng.choice(channels), current.mute, current.deaf, current.self_mute), now)
+            elif roll < 0.95:
+                apply(member_id, voice_state(current.channel, current.mute, current.deaf, not current.self_mute), now)
+            else:
+                apply(member_id, voice_state(current.channel, not current.mute, current.deaf, current.self_mute), now)
+        if second % 300 == 0:
+            # A moderator drags one channel into another, and another channel empties at once
+            source, target, emptied = rng.sample(channels, 3)
+            for member_id, state in list(states.items()):
+                if state.channel is source:
+                    apply(member_id, voice_state(target, state.mute, state.deaf, state.self_mute), now)
+                elif state.channel is emptied:
+                    apply(member_id, voice_state(None), now)
+        began = time.perf_counter()
+        for item in sessions.take_logs(now):
+            logged[item[0]] += 1
+        elapsed += time.perf_counter() - began
+
+    tracemalloc.start()
+    measured = VoiceSessions(max_sessions=len(states))
+    for member_id, state in states.items():
+        measured.update(GUILD_ID, member_id, f"member{member_id}", voice_state(None), state, now)
+        measured.update(GUILD_ID, member_id, f"member{member_id}", state,
+                        voice_state(rng.choice(channels), True, False, True), now)
+    current_bytes, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    entries = sum(logged.values())
+    print(f"{updates} voice updates in {elapsed:.2f}s of tracker time ({updates / elapsed / 1000:.0f}k/s)")
+    print(f"open sessions at the end: {len(sessions)}; {len(states)} sessions with a move and a mute "
+          f"take {current_bytes / 2**20:.1f} MiB ({current_bytes / max(len(states), 1):.0f} B each)")
+    print(f"logged {entries} entries for {updates} updates ({updates / max(entries, 1):.1f}x fewer): "
+          f"{logged[SESSION]} sessions, {logged[MASS_MOVE]} mass moves, {logged[MASS_LEAVE]} mass leaves")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,258 @@
+"""
+Synthetic discord.py-shaped objects for offline benchmarks.
+
+These only implement the attributes and methods main.py's handlers touch.
+The audit channel is a stub that records every send and can add latency
+and 429 responses.
+"""
+
+import asyncio
+import itertools
+import random
+from datetime import datetime, timedelta, timezone
+
+import discord
+
+_ids = itertools.count(1_300_000_000_000_000_000)
+
+
+def next_id() -> int:
+    return next(_ids)
+
+
+class FakeResponse:
+    """Minimal aiohttp-like response for discord.HTTPException"""
+
+    def __init__(self, status: int, reason: str):
+        self.status = status
+        self.reason = reason
+
+
+class StubAuditChannel:
+    """Audit channel stand-in: records sends, simulates latency and 429s.
+
+    ratelimit_mode "retry" mimics discord.py (sleep Retry-After, then
+    succeed); "raise" surfaces the 429 as discord.HTTPException.
+    """
+
+    def __init__(self, guild, channel_id: int = None, latency: float = 0.0, ratelimit_prob: float = 0.0,
+                 retry_after: float = 0.05, ratelimit_mode: str = "retry", seed: int = 0):
+        self.id = channel_id or next_id()
+        self.name = "「📄」audit-logistics"
+        self.guild = guild
+        self.mention = f"<#{self.id}>"
+        self.latency = latency
+        self.ratelimit_prob = ratelimit_prob
+        self.retry_after = retry_after
+        self.ratelimit_mode = ratelimit_mode
+        self._random = random.Random(seed)
+        self.sends = []
+        self.rate_limited = 0
+
+    async def send(self, content=None, **kwargs):
+        while self.ratelimit_prob and self._random.random() < self.ratelimit_prob:
+            self.rate_limited += 1
+            if self.ratelimit_mode == "raise":
+                raise discord.HTTPException(FakeResponse(429, "Too Many Requests"), {"message": "You are being rate limited.", "code": 0})
+            await asyncio.sleep(self.retry_after)
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        self.sends.append((content, kwargs))
+
+    def reset(self):
+        self.sends.clear()
+        self.rate_limited = 0
+
+
+class FakeRole:
+    def __init__(self, guild, name: str, position: int = 1):
+        self.id = next_id()
+        self.guild = guild
+        self.name = name
+        self.mention = f"<@&{self.id}>"
+        self.color = discord.Colour(0x43c7c5)
+        self.permissions = discord.Permissions(0x4000)
+        self.hoist = False
+        self.mentionable = False
+        self.position = position
+
+    def __repr__(self):
+        return f"<FakeRole id={self.id} name={self.name!r}>"
+
+
+class FakeCategory:
+    def __init__(self, guild, name: str):
+        self.id = next_id()
+        self.guild = guild
+        self.name = name
+
+
+class FakeChannel:
+    def __init__(self, guild, name: str, category=None, position: int = 0):
+        self.id = next_id()
+        self.guild = guild
+        self.name = name
+        self.mention = f"<#{self.id}>"
+        self.type = discord.ChannelType.text
+        self.category = category
+        self.category_id = category.id if category else None
+        self.position = position
+        self.topic = None
+        self.slowmode_delay = 0
+        self.nsfw = False
+
+
+class FakeUser:
+    def __init__(self, name: str, bot: bool = False):
+        self.id = next_id()
+        self.name = name
+        self.bot = bot
+        self.mention = f"<@{self.id}>"
+        self.created_at = datetime.now(timezone.utc) - timedelta(days=400)
+
+    def __str__(self):
+        return self.name
+
+
+class FakeMember(FakeUser):
+    def __init__(self, guild, name: str, roles=(), bot: bool = False):
+        super().__init__(name, bot=bot)
+        self.guild = guild
+        self.nick = None
+        self.roles = list(roles)
+        self.timed_out_until = None
+
+
+class FakeMessage:
+    def __init__(self, guild, channel, author, content: str):
+        self.id = next_id()
+        self.guild = guild
+        self.channel = channel
+        self.author = author
+        self.content = content
+        self.created_at = datetime.now(timezone.utc)
+
+
+class FakeEmoji:
+    def __init__(self, name: str, animated: bool = False):
+        self.id = next_id()
+        self.name = name
+        self.animated = animated
+
+    def __str__(self):
+        return f"<:{self.name}:{self.id}>"
+
+
+class FakeSticker:
+    def __init__(self, name: str):
+        self.id = next_id()
+        self.name = name
+        self.format = discord.StickerFormatType.png
+
+
+class FakeInvite:
+    def __init__(self, guild, channel, inviter):
+        self.code = f"inv{next_id() % 1_000_000:06d}"
+        self.guild = guild
+        self.channel = channel
+        self.inviter = inviter
+        self.max_age = 86400
+        self.max_uses = 0
+        self.temporary = False
+        self.uses = 0
+
+
+class FakeThread:
+    def __init__(self, guild, parent, owner, name: str):
+        self.id = next_id()
+        self.guild = guild
+        self.parent_id = parent.id
+        self.category_id = getattr(parent, "category_id", None)
+        self.owner = owner
+        self.owner_id = owner.id
+        self.name = name
+        self.mention = f"<#{self.id}>"
+        self.archived = False
+        self.locked = False
+        self.invitable = True
+        self.slowmode_delay = 0
+        self.auto_archive_duration = 1440
+        self.archive_timestamp = datetime.now(timezone.utc)
+        self.last_message_id = None
+
+
+class FakeThreadMember:
+    def __init__(self, thread, user):
+        self.id = user.id
+        self.thread_id = thread.id
+        self.thread = thread
+
+
+class FakeAuditEntry:
+    def __init__(self, action, user, target, reason: str = None, extra=None, before=None, after=None):
+        self.id = next_id()
+        self.action = action
+        self.user = user
+        self.target = target
+        self.reason = reason
+        self.extra = extra
+        self.before = before
+        self.after = after
+        self.created_at = datetime.now(timezone.utc)
+
+
+class FakeGuild:
+    """Guild with roles, channels, members and a scripted audit log"""
+
+    def __init__(self, guild_id: int, name: str = "Benchmark Guild", roles: int = 50, channels: int = 50):
+        self.id = guild_id
+        self.name = name
+        self.shard_id = 0
+        self.chunked = True
+        self.icon = None
+        self.splash = None
+        self.banner = None
+        self.vanity_url_code = None
+        self.verification_level = discord.VerificationLevel.low
+        self.explicit_content_filter = discord.ContentFilter.disabled
+        self.default_notifications = discord.NotificationLevel.only_mentions
+        self.audit_channel = None
+        self.categories = [FakeCategory(self, f"category-{i}") for i in range(5)]
+        self.roles = [FakeRole(self, f"role-{i}", position=i) for i in range(roles)]
+        self.text_channels = [
+            FakeChannel(self, f"channel-{i}", category=self.categories[i % 5], position=i) for i in range(channels)
+        ]
+        self.audit_log_entries = []
+        self.invite_list = []
+        self.invite_fetches = 0
+        self._channels = {channel.id: channel for channel in self.text_channels}
+
+    def attach_audit_channel(self, channel: StubAuditChannel):
+        self.audit_channel = channel
+        self._channels[channel.id] = channel
+
+    def get_channel(self, channel_id: int):
+        return self._channels.get(channel_id)
+
+    async def audit_logs(self, limit: int = 100, action=None, after=None, before=None, oldest_first=False, **kwargs):
+        count = 0
+        entries = self.audit_log_entries if oldest_first else reversed(self.audit_log_entries)
+        for entry in entries:
+            if action is not None and entry.action != action:
+                continue
+            if (after is not None and entry.id <= after.id) or (before is not None and entry.id >= before.id):
+                continue
+            yield entry
+            count += 1
+            if limit is not None and count >= limit:
+                return
+
+    async def invites(self):
+        self.invite_fetches += 1
+        return list(self.invite_list)
+
+    async def chunk(self, cache: bool = True):
+        self.chunked = True
+
+    async def leave(self):
+        pass
@@ -0,0 +1,333 @@
+"""
+Local stand-in for the Discord REST endpoints the bot uses.
+
+Serves channel messages, webhook executes, guild audit logs and the login
+endpoints with Discord-style rate limiting (per-route buckets plus a global
+limit, X-RateLimit-* and Retry-After headers), plus latency and failure
+injection. Message bodies are checked against Discord's embed size limits
+and rejected with 400 like the real API. Point the bot at it with
+DISCORD_API_BASE=http://127.0.0.1:PORT/api/v10.
+
+Control and stats endpoints (not part of Discord's API):
+    GET  /_stats     counters per endpoint
+    POST /_control   JSON body updating FakeRestConfig fields, e.g.
+                     {"outage": true} or {"failure_rate": 0.2, "latency": 0.05}
+
+Usage: python benchmarks/fake_rest_server.py [--port 8765] [--bucket-limit 5 --bucket-window 5]
+"""
+
+import time
+import json
+import random
+import asyncio
+import argparse
+import itertools
+from collections import Counter
+from dataclasses import dataclass, asdict
+
+from aiohttp import web
+
+_snowflakes = itertools.count(1_400_000_000_000_000_000)
+BOT_USER = {"id": "1400000000000000001", "username": "LCSRC Utilities", "discriminator": "0", "avatar": None, "bot": True}
+
+
+@dataclass
+class FakeRestConfig:
+    """Behaviour knobs; all can be changed at runtime via /_control"""
+    bucket_limit: int = 5          # requests per bucket window (Discord: ~5/5s per channel)
+    bucket_window: float = 5.0
+    global_limit: int = 50         # requests per second across all routes
+    latency: float = 0.0           # added to every response, seconds
+    jitter: float = 0.0            # uniform extra latency, seconds
+    failure_rate: float = 0.0      # chance of a 5xx on any API request
+    failure_status: int = 502
+    outage: bool = False           # every API request returns 503
+    seed: int = 0
+
+
+def _json(data, status: int = 200, headers: dict = None) -> web.Response:
+    """JSON response with a bare Content-Type, which discord.py matches exactly"""
+    return web.Response(
+        body=json.dumps(data).encode(),
+        status=status,
+        headers={**(headers or {}), "Content-Type": "application/json"},
+    )
+
+
+def _embed_errors(body: dict) -> list:
+    """Discord's embed limits, as enforced on message create / webhook execute"""
+    errors = []
+    embeds = body.get("embeds") or []
+    if len(embeds) > 10:
+        errors.append("embeds: must be 10 or fewer in length")
+    if len(body.get("content") or "") > 2000:
+        errors.append("content: must be 2000 or fewer in length")
+    total = 0
+    for index, embed in enumerate(embeds):
+        fields = embed.get("fields") or []
+        if len(fields) > 25:
+            errors.append(f"embeds.{index}.fields: must be 25 or fewer in length")
+        size = len(embed.get("title") or "") + len(embed.get("description") or "")
+        size += len((embed.get("footer") or {}).get("text") or "") + len((embed.get("author") or {}).get("name") or "")
+        for field in fields:
+            if not field.get("value", "").strip() or len(field["value"]) > 1024:
+                errors.append(f"embeds.{index}.fields: value must be 1 to 1024 in length")
+            if not field.get("name", "").strip() or len(field["name"]) > 256:
+                errors.append(f"embeds.{index}.fields: name must be 1 to 256 in length")
+            size += len(field.get("name", "")) + len(field.get("value", ""))
+        total += size
+    if total > 6000:
+        errors.append("embeds: total size must be 6000 or fewer")
+    return errors
+
+
+def _invalid_form_body(errors: list) -> web.Response:
+    return _json({"message": "Invalid Form Body", "code": 50035, "errors": errors}, status=400)
+
+
+class Bucket:
+    """Fixed-window bucket like Discord's, reporting X-RateLimit-* values"""
+
+    def __init__(self, key: str, limit: int, window: float):
+        self.key = key
+        self.limit = limit
+        self.window = window
+        self.remaining = limit
+        self.reset_at = time.monotonic() + window
+
+    def hit(self) -> float:
+        """Consume a request; returns 0 if allowed, else seconds until reset"""
+        now = time.monotonic()
+        if now >= self.reset_at:
+            self.remaining = self.limit
+            self.reset_at = now + self.window
+        if self.remaining <= 0:
+            return self.reset_at - now
+        self.remaining -= 1
+        return 0.0
+
+    def headers(self) -> dict:
+        reset_after = max(0.0, self.reset_at - time.monotonic())
+        return {
+            "X-RateLimit-Limit": str(self.limit),
+            "X-RateLimit-Remaining": str(self.remaining),
+            "X-RateLimit-Reset": f"{time.time() + reset_after:.3f}",
+            "X-RateLimit-Reset-After": f"{reset_after:.3f}",
+            "X-RateLimit-Bucket": self.key,
+        }
+
+
+class FakeDiscordRest:
+    def __init__(self, config: FakeRestConfig = None):
+        self.config = config or FakeRestConfig()
+        self.random = random.Random(self.config.seed)
+        self.buckets = {}
+        self.global_bucket = Bucket("global", self.config.global_limit, 1.0)
+        self.stats = Counter()
+        self.messages = Counter()  # accepted messages per channel/webhook
+
+    def _bucket(self, key: str) -> Bucket:
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            bucket = self.buckets[key] = Bucket(key, self.config.bucket_limit, self.config.bucket_window)
+        return bucket
+
+    async def _gate(self, endpoint: str, bucket_key: str):
+        """Latency, failure and rate-limit injection shared by all API routes.
+
+        Returns an error response, or (None, bucket) if the request may proceed.
+        """
+        config = self.config
+        self.stats[f"{endpoint}.requests"] += 1
+        delay = config.latency + (self.random.uniform(0, config.jitter) if config.jitter else 0.0)
+        if delay:
+            await asyncio.sleep(delay)
+
+        if config.outage or (config.failure_rate and self.random.random() < config.failure_rate):
+            status = 503 if config.outage else config.failure_status
+            self.stats[f"{endpoint}.{status}"] += 1
+            return _json({"message": "Service Unavailable", "code": 0}, status=status), None
+
+        retry_after = self.global_bucket.hit()
+        if retry_after:
+            self.stats[f"{endpoint}.429_global"] += 1
+            return self._too_many(retry_after, is_global=True), None
+
+        bucket = self._bucket(bucket_key)
+        retry_after = bucket.hit()
+        if retry_after:
+            self.stats[f"{endpoint}.429"] += 1
+            response = self._too_many(retry_after, is_global=False)
+            response.headers.update(bucket.headers())
+            return response, None
+        return None, bucket
+
+    def _too_many(self, retry_after: float, is_global: bool) -> web.Response:
+        return _json(
+            {"message": "You are being rate limited.", "retry_after": round(retry_after, 3), "global": is_global, "code": 0},
+            status=429,
+            headers={
+                "Retry-After": f"{retry_after:.3f}",
+                "X-RateLimit-Global": "true" if is_global else "false",
+                "X-RateLimit-Scope": "global" if is_global else "user",
+            },
+        )
+
+    def _message(self, channel_id: str, body: dict) -> dict:
+        return {
+            "id": str(next(_snowflakes)),
+            "channel_id": channel_id,
+            "author": BOT_USER,
+            "content": body.get("content") or "",
+            "timestamp": "2024-01-01T00:00:00+00:00",
+            "edited_timestamp": None,
+            "tts": False,
+            "mention_everyone": False,
+            "mentions": [],
+            "mention_roles": [],
+            "attachments": [],
+            "embeds": body.get("embeds") or [],
+            "pinned": False,
+            "type": 0,
+        }
+
+    async def _json_body(self, request: web.Request) -> dict:
+        if request.content_type == "application/json":
+            return await request.json()
+        if request.content_type.startswith("multipart/"):
+            # Attachments: the JSON part is named payload_json
+            reader = await request.multipart()
+            async for part in reader:
+                if part.name == "payload_json":
+                    return json.loads(await part.text())
+                await part.read()
+        return {}
+
+    # ---- Discord API routes ----
+
+    async def users_me(self, request: web.Request) -> web.Response:
+        return _json(BOT_USER)
+
+    async def application_me(self, request: web.Request) -> web.Response:
+        return _json({
+            "id": BOT_USER["id"], "name": "LCSRC Utilities", "description": "", "icon": None,
+            "bot_public": False, "bot_require_code_grant": False, "owner": BOT_USER,
+            "verify_key": "0" * 64, "flags": 0,
+        })
+
+    async def create_message(self, request: web.Request) -> web.Response:
+        channel_id = request.match_info["channel_id"]
+        error, bucket = await self._gate("messages", f"channel:{channel_id}")
+        if error is not None:
+            return error
+        body = await self._json_body(request)
+        errors = _embed_errors(body)
+        if errors:
+            self.stats["messages.400"] += 1
+            return _invalid_form_body(errors)
+        self.messages[f"channel:{channel_id}"] += 1
+        self.stats["messages.accepted"] += 1
+        return _json(self._message(channel_id, body), headers=bucket.headers())
+
+    async def execute_webhook(self, request: web.Request) -> web.Response:
+        webhook_id = request.match_info["webhook_id"]
+        error, bucket = await self._gate("webhooks", f"webhook:{webhook_id}")
+        if error is not None:
+            return error
+        body = await self._json_body(request)
+        errors = _embed_errors(body)
+        if errors:
+            self.stats["webhooks.400"] += 1
+            return _invalid_form_body(errors)
+        self.messages[f"webhook:{webhook_id}"] += 1
+        self.stats["webhooks.accepted"] += 1
+        if request.query.get("wait") == "true":
+            return _json(self._message("0", body), headers=bucket.headers())
+        return web.Response(status=204, headers=bucket.headers())
+
+    async def audit_logs(self, request: web.Request) -> web.Response:
+        guild_id = request.match_info["guild_id"]
+        error, bucket = await self._gate("audit_logs", f"audit:{guild_id}")
+        if error is not None:
+            return error
+        limit = min(int(request.query.get("limit", 50)), 100)
+        action_type = int(request.query.get("action_type", 22))  # default: member ban
+        entries = [
+            {
+                "id": str(next(_snowflakes)),
+                "user_id": BOT_USER["id"],
+                "target_id": str(next(_snowflakes)),
+                "action_type": action_type,
+                "changes": [],
+                "reason": "synthetic",
+            }
+            for _ in range(limit)
+        ]
+        self.stats["audit_logs.accepted"] += 1
+        return _json(
+            {"audit_log_entries": entries, "users": [BOT_USER], "webhooks": [], "threads": [],
+             "integrations": [], "application_commands": [], "auto_moderation_rules": [], "guild_scheduled_events": []},
+            headers=bucket.headers(),
+        )
+
+    # ---- control routes ----
+
+    async def get_stats(self, request: web.Request) -> web.Response:
+        return _json({"stats": dict(self.stats), "messages": dict(self.messages), "config": asdict(self.config)})
+
+    async def control(self, request: web.Request) -> web.Response:
+        for key, value in (await request.json()).items():
+            if hasattr(self.config, key):
+                setattr(self.config, key, value)
+        self.global_bucket = Bucket("global", self.config.global_limit, 1.0)
+        self.buckets.clear()
+        return _json(asdict(self.config))
+
+    def reset_stats(self):
+        self.stats.clear()
+        self.messages.clear()
+
+    def app(self) -> web.Application:
+        app = web.Application(client_max_size=32 * 1024 * 1024)
+        app.router.add_get("/api/v10/users/@me", self.users_me)
+        app.router.add_get("/api/v10/oauth2/applications/@me", self.application_me)
+        app.router.add_post("/api/v10/channels/{channel_id}/messages", self.create_message)
+        app.router.add_post("/api/v10/webhooks/{webhook_id}/{token}", self.execute_webhook)
+        app.router.add_get("/api/v10/guilds/{guild_id}/audit-logs", self.audit_logs)
+        app.router.add_get("/_stats", self.get_stats)
+        app.router.add_post("/_control", self.control)
+        return app
+
+
+async def start_server(server: FakeDiscordRest, host: str = "127.0.0.1", port: int = 8765) -> web.AppRunner:
+    """Start the fake server on the running loop; returns the runner (call .cleanup())"""
+    runner = web.AppRunner(server.app(), access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    return runner
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--bucket-limit", type=int, default=5)
+    parser.add_argument("--bucket-window", type=float, default=5.0)
+    parser.add_argument("--global-limit", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    server = FakeDiscordRest(FakeRestConfig(
+        bucket_limit=args.bucket_limit,
+        bucket_window=args.bucket_window,
+        global_limit=args.global_limit,
+        latency=args.latency,
+        failure_rate=args.failure_rate,
+    ))
+    print(f"Fake Discord REST on http://{args.host}:{args.port}/api/v10")
+    web.run_app(server.app(), host=args.host, port=args.port, access_log=None, print=None)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+"""
+In-memory edit history for messages, stored as a base version plus deltas.
+
+Each edit is kept as a delta against the previous version: copy N characters,
+skip N characters or insert some text, packed into one bytes object as
+varint headers plus UTF-8. A typo fix in a long message costs a few dozen
+bytes instead of another full copy. Any version is rebuilt by replaying
+deltas from the base.
+
+Histories live in an LRU with a total byte budget; the least recently edited
+messages are evicted first, and a message with too many versions folds its
+oldest deltas into the base.
+"""
+
+import sys
+import time
+from array import array
+from collections import OrderedDict
+
+from textdiff import EQUAL, DELETE, diff_words
+
+DEFAULT_MAX_BYTES = 8 * 1024 * 1024
+DEFAULT_MAX_VERSIONS = 50
+_ENTRY_OVERHEAD = 300  # rough per-message bookkeeping: object, lists, OrderedDict slot
+
+# Delta op kinds, stored in the low two bits of each varint header
+_COPY, _SKIP, _INSERT = 0, 1, 2
+
+# Default `runs`: not diffed yet. None is diff_words giving up, which must not be retried.
+_NOT_DIFFED = object()
+
+
+def _splice(old: str, new: str) -> tuple:
+    """Single-region delta from the common prefix/suffix (used when the word diff gives up)"""
+    prefix = 0
+    limit = min(len(old), len(new))
+    while prefix < limit and old[prefix] == new[prefix]:
+        prefix += 1
+    suffix = 0
+    while suffix < limit - prefix and old[-1 - suffix] == new[-1 - suffix]:
+        suffix += 1
+    ops = (prefix, -(len(old) - prefix - suffix), new[prefix:len(new) - suffix], suffix)
+    return tuple(op for op in ops if op)
+
+
+def _pack(ops) -> bytes:
+    """ops: int > 0 copies, int < 0 skips, str inserts"""
+    out = bytearray()
+    for op in ops:
+        if op.__class__ is str:
+            data = op.encode()
+            value = len(data) << 2 | _INSERT
+        else:
+            data = b""
+            value = op << 2 | _COPY if op > 0 else -op << 2 | _SKIP
+        while value > 0x7F:
+            out.append(value & 0x7F | 0x80)
+            value >>= 7
+        out.append(value)
+        out += data
+    return bytes(out)
+
+
+def encode_delta(old: str, new: str, runs=_NOT_DIFFED) -> bytes:
+    """Delta turning old into new; `runs` may be diff_words(old, new) if already computed,
+    including None when it hit a cap (then the delta is a single splice, no second diff)"""
+    if runs is _NOT_DIFFED:
+        runs = diff_words(old, new)
+    if runs is None:
+        return _pack(_splice(old, new))
+    ops = []
+    for op, tokens in runs:
+        text = "".join(tokens)
+        if op == EQUAL:
+            ops.append(len(text))
+        elif op == DELETE:
+            ops.append(-len(text))
+        else:
+            ops.append(text)
+    return _pack(ops)
+
+
+def apply_delta(old: str, delta: bytes) -> str:
+    parts = []
+    position = 0    # in old, characters
+    index = 0       # in delta, bytes
+    end = len(delta)
+    while index < end:
+        value = shift = 0
+        while True:
+            byte = delta[index]
+            index += 1
+            value |= (byte & 0x7F) << shift
+            shift += 7
+            if byte < 0x80:
+                break
+        kind, count = value & 3, value >> 2
+        if kind == _COPY:
+            parts.append(old[position:position + count])
+            position += count
+        elif kind == _SKIP:
+            position += count
+        else:
+            parts.append(delta[index:index + count].decode())
+            index += count
+    return "".join(parts)
+
+
+class MessageHistory:
+    """Versions of one message: base text plus one delta per later version"""
+
+    __slots__ = ("message_id", "guild_id", "channel_id", "author_id", "base", "base_time",
+                 "deltas", "times", "first_version", "last_hash", "size")
+
+    def __init__(self, message_id: int, guild_id: int, channel_id: int, author_id: int, base: str, base_time: float):
+        self.message_id = message_id
+        self.guild_id = guild_id
+        self.channel_id = channel_id
+        self.author_id = author_id
+        self.base = base
+        self.base_time = base_time
+        self.deltas = []             # packed deltas, one per later version
+        self.times = array("d")      # edit timestamps, parallel to deltas
+        self.first_version = 0       # version number of `base` (rises when old versions fold in)
+        self.last_hash = hash(base)  # detects missed edits without rebuilding the latest version
+        self.size = _ENTRY_OVERHEAD + sys.getsizeof(base)
+
+    @property
+    def versions(self) -> int:
+        return self.first_version + len(self.deltas) + 1
+
+    def version(self, number: int) -> str:
+        """Text of version `number` (0 = original as first seen)"""
+        if not self.first_version <= number < self.versions:
+            raise IndexError(number)
+        text = self.base
+        for delta in self.deltas[:number - self.first_version]:
+            text = apply_delta(text, delta)
+        return text
+
+    def timeline(self) -> list:
+        """[(version, timestamp, text)] for every stored version, rebuilt in one pass"""
+        text = self.base
+        rows = [(self.first_version, self.base_time, text)]
+        for offset, (timestamp, delta) in enumerate(zip(self.times, self.deltas), start=1):
+            text = apply_delta(text, delta)
+            rows.append((self.first_version + offset, timestamp, text))
+        return rows
+
+    def latest(self) -> str:
+        return self.version(self.versions - 1)
+
+    def append(self, delta: bytes, timestamp: float, text: str):
+        self.deltas.append(delta)
+        self.times.append(timestamp)
+        self.last_hash = hash(text)
+        self.size += sys.getsizeof(delta) + 16  # list slot + timestamp
+
+    def fold_oldest(self):
+        """Merge the oldest delta into the base (drops the original version)"""
+        delta = self.deltas.pop(0)
+        timestamp = self.times.pop(0)
+        self.size -= sys.getsizeof(delta) + 16 + sys.getsizeof(self.base)
+        self.base = apply_delta(self.base, delta)
+        self.base_time = timestamp
+        self.first_version += 1
+        self.size += sys.getsizeof(self.base)
+
+
+class EditHistory:
+    """LRU of MessageHistory objects under a total byte budget"""
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES, max_versions: int = DEFAULT_MAX_VERSIONS):
+        self.max_bytes = max_bytes
+        self.max_versions = max_versions
+        self.messages = OrderedDict()
+        self.bytes = 0
+        self.evicted = 0
+
+    def __len__(self) -> int:
+        return len(self.messages)
+
+    def get(self, message_id: int) -> MessageHistory:
+        return self.messages.get(message_id)
+
+    def record(self, message_id: int, guild_id: int, channel_id: int, author_id: int,
+               before: str, after: str, runs=_NOT_DIFFED, created_at: float = None):
+        """Store an edit. `runs` is diff_words(before, after) if the caller already has it (None included)."""
+        now = time.time()
+        before = before or ""
+        after = after or ""
+        history = self.messages.get(message_id)
+        if history is None:
+            history = MessageHistory(message_id, guild_id, channel_id, author_id, before, created_at or now)
+            self.messages[message_id] = history
+            self.bytes += history.size
+        else:
+            self.messages.move_to_end(message_id)
+            # The cached "before" is normally our latest version; if we missed an
+            # edit (cache miss, restart), record the jump to it first
+            if history.last_hash != hash(before):
+                self._append(history, encode_delta(history.latest(), before), now, before)
+
+        self._append(history, encode_delta(before, after, runs), now, after)
+        while len(history.deltas) >= self.max_versions:
+            self.bytes -= history.size
+            history.fold_oldest()
+            self.bytes += history.size
+        self._evict()
+
+    def _append(self, history: MessageHistory, delta: bytes, timestamp: float, text: str):
+        self.bytes -= history.size
+        history.append(delta, timestamp, text)
+        self.bytes += history.size
+
+    def _evict(self):
+        while self.bytes > self.max_bytes and len(self.messages) > 1:
+            _, history = self.messages.popitem(last=False)
+            self.bytes -= history.size
+            self.evicted += 1
+
+    def stats(self) -> dict:
+        return {"messages": len(self.messages), "bytes": self.bytes, "evicted": self.evicted}
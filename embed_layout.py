@@ -0,0 +1,94 @@
+"""
+Fit audit text into Discord's embed limits.
+
+Discord rejects a message outright if any embed field value is over 1024
+characters, an embed has more than 25 fields or 6000 characters, or the
+message's embeds add up to more than 6000 characters (10 embeds at most).
+layout_fields splits long values into continuation fields at line, then
+word, then character boundaries, and packs the fields into as few embeds as
+the limits allow. When the text can't fit at all, the caller sends a preview
+and attaches the full text as a file instead.
+
+Attachments travel through the queue as (filename, bytes) under the
+"attachment" key; send_kwargs turns that into a fresh discord.File for each
+send attempt, since discord.py closes a File after sending it.
+"""
+
+import io
+
+import discord
+
+FIELD_NAME_LIMIT = 256
+FIELD_VALUE_LIMIT = 1024
+EMBED_FIELDS_LIMIT = 25
+EMBED_TOTAL_LIMIT = 6000
+MESSAGE_EMBEDS_LIMIT = 10
+MESSAGE_TOTAL_LIMIT = 6000  # across all embeds of one message
+
+CONTINUED = " (cont.)"
+BLANK = "\u200b"  # zero-width space
+
+
+def split_text(text: str, limit: int = FIELD_VALUE_LIMIT) -> list:
+    """Split text into chunks of at most `limit`, preferring line, then word breaks"""
+    chunks = []
+    while len(text) > limit:
+        cut = text.rfind("\n", 0, limit + 1)
+        if cut <= 0:
+            cut = text.rfind(" ", 0, limit + 1)
+        if cut > 0:
+            chunks.append(text[:cut])
+            text = text[cut + 1:]  # drop the break itself
+        else:
+            chunks.append(text[:limit])
+            text = text[limit:]
+    chunks.append(text)
+    return chunks
+
+
+def expand_fields(fields: list) -> list:
+    """[(name, value, inline)] with over-long values split into continuation fields"""
+    expanded = []
+    for name, value, inline in fields:
+        name = name[:FIELD_NAME_LIMIT]
+        # Discord rejects blank field values
+        chunks = [chunk if chunk.strip() else BLANK for chunk in split_text(value or "")]
+        expanded.append((name, chunks[0], inline))
+        continued = (name.rstrip(":") + CONTINUED)[:FIELD_NAME_LIMIT]
+        expanded.extend((continued, chunk, False) for chunk in chunks[1:])
+    return expanded
+
+
+def layout_fields(fields: list, reserved: int = 0, max_embeds: int = MESSAGE_EMBEDS_LIMIT):
+    """Group fields into embeds within every limit: [[(name, value, inline)], ...].
+
+    `reserved` is text already used by other embeds of the message (titles,
+    footers). Returns None if the fields can't fit in one message.
+    """
+    expanded = expand_fields(fields)
+    total = reserved + sum(len(name) + len(value) for name, value, _ in expanded)
+    if total > MESSAGE_TOTAL_LIMIT:
+        return None
+
+    # Total is already under the per-embed size limit, so only the field count splits embeds
+    groups = [expanded[i:i + EMBED_FIELDS_LIMIT] for i in range(0, len(expanded), EMBED_FIELDS_LIMIT)]
+    if len(groups) > max_embeds:
+        return None
+    return groups
+
+
+def truncate(text: str, limit: int, marker: str = "…") -> str:
+    if len(text) <= limit:
+        return text
+    return text[:limit - len(marker)].rstrip() + marker
+
+
+def send_kwargs(payload: dict) -> dict:
+    """Keyword arguments for channel.send / webhook.send from a queued payload"""
+    attachment = payload.get("attachment")
+    if attachment is None:
+        return payload
+    kwargs = {key: value for key, value in payload.items() if key != "attachment"}
+    filename, data = attachment
+    kwargs["file"] = discord.File(io.BytesIO(data), filename=filename)
+    return kwargs
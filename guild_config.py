@@ -0,0 +1,89 @@
+"""
+Per-guild configuration for the audit bot.
+
+The config file maps guild IDs to their audit channel and options. It is read
+once at startup into a dict keyed by guild ID, so every handler does a single
+O(1) lookup to decide whether (and where) to log.
+
+Example guilds.json:
+
+    {
+        "defaults": {"rate": 5, "per": 5.0, "queue_size": 1000},
+        "guilds": {
+            "1289789596238086194": {
+                "name": "ER:LC Communications",
+                "audit_channel_id": 1474965686454325331,
+                "audit_channel_name": "「📄」audit-logistics",
+                "webhooks": ["https://discord.com/api/webhooks/<id>/<token>"]
+            }
+        }
+    }
+"""
+
+import json
+import logging
+import os
+from dataclasses import dataclass, field
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RATE = 5          # audit posts allowed per `per` seconds
+DEFAULT_PER = 5.0
+DEFAULT_QUEUE_SIZE = 1000
+
+
+@dataclass(frozen=True)
+class GuildConfig:
+    """Audit settings for one guild"""
+    guild_id: int
+    audit_channel_id: int = None
+    audit_channel_name: str = None
+    name: str = None
+    rate: int = DEFAULT_RATE
+    per: float = DEFAULT_PER
+    queue_size: int = DEFAULT_QUEUE_SIZE
+    webhooks: tuple = ()
+    options: dict = field(default_factory=dict)
+
+
+_KNOWN_KEYS = {"audit_channel_id", "audit_channel_name", "name", "rate", "per", "queue_size", "webhooks"}
+
+
+def _build(guild_id: int, raw: dict, defaults: dict) -> GuildConfig:
+    merged = {**defaults, **raw}
+    channel_id = merged.get("audit_channel_id")
+    return GuildConfig(
+        guild_id=guild_id,
+        audit_channel_id=int(channel_id) if channel_id else None,
+        audit_channel_name=merged.get("audit_channel_name"),
+        name=merged.get("name"),
+        rate=int(merged.get("rate", DEFAULT_RATE)),
+        per=float(merged.get("per", DEFAULT_PER)),
+        queue_size=int(merged.get("queue_size", DEFAULT_QUEUE_SIZE)),
+        webhooks=tuple(merged.get("webhooks", ())),
+        options={k: v for k, v in merged.items() if k not in _KNOWN_KEYS},
+    )
+
+
+def load_guild_configs(path: str, fallback: GuildConfig = None) -> dict:
+    """Load the guild config file into {guild_id: GuildConfig}.
+
+    If the file does not exist, `fallback` (if given) becomes the only entry,
+    which keeps single-guild deployments working without a config file.
+    """
+    if not os.path.exists(path):
+        if fallback is None:
+            return {}
+        logger.info("No guild config at %s, using single-guild defaults for %s", path, fallback.guild_id)
+        return {fallback.guild_id: fallback}
+
+    with open(path, encoding="utf-8") as fh:
+        data = json.load(fh)
+
+    defaults = data.get("defaults", {})
+    configs = {}
+    for guild_id, raw in data.get("guilds", {}).items():
+        configs[int(guild_id)] = _build(int(guild_id), raw, defaults)
+
+    logger.info("Loaded audit config for %d guild(s) from %s", len(configs), path)
+    return configs
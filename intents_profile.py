@@ -0,0 +1,92 @@
+"""
+Profile-driven gateway intents and cache policy.
+
+Each audit handler group only needs a few intents. A profile names the
+groups that are enabled and the intent set is built from exactly those, so
+the gateway doesn't send (and discord.py doesn't cache) anything unused.
+
+Environment:
+  INTENTS_PROFILE          full | standard | moderation | minimal (default standard)
+  AUDIT_HANDLERS           comma list of groups, overrides the profile's groups
+  MEMBER_CACHE             intents | joined | voice | none | all (default intents)
+  MAX_MESSAGES             message cache size, 0 disables (default 1000)
+  CHUNK_GUILDS_AT_STARTUP  1 to chunk every guild before ready (default 0: after ready, in the background)
+"""
+
+import os
+
+import discord
+
+# Intent flags each handler group depends on
+HANDLER_INTENTS = {
+    # on_guild_update, role/channel create/update/delete, on_ready
+    "server": ("guilds",),
+    # on_message_delete / on_message_edit (content needs the privileged intent)
+    "messages": ("guild_messages", "message_content"),
+    # on_member_join / on_member_remove / on_member_update
+    "members": ("members",),
+    # on_guild_emojis_update / on_guild_stickers_update
+    "emojis": ("emojis_and_stickers",),
+    "invites": ("invites",),
+    "webhooks": ("webhooks",),
+    # on_voice_state_update (voice session summaries)
+    "voice": ("voice_states",),
+    # audit log entry events (bans, kicks, automod)
+    "moderation": ("bans",),  # a.k.a. Intents.moderation in discord.py >= 2.2
+}
+
+PROFILES = {
+    "standard": ("server", "messages", "members", "emojis", "invites", "webhooks", "voice", "moderation"),
+    "moderation": ("server", "members", "emojis", "invites", "webhooks", "voice", "moderation"),
+    "minimal": ("server", "emojis", "webhooks", "moderation"),
+}
+
+
+def enabled_handlers(profile: str = None) -> frozenset:
+    """Handler groups enabled by AUDIT_HANDLERS or the named profile"""
+    explicit = os.environ.get("AUDIT_HANDLERS")
+    if explicit:
+        return frozenset(group.strip() for group in explicit.split(",") if group.strip())
+    profile = profile or os.environ.get("INTENTS_PROFILE", "standard")
+    if profile == "full":
+        return frozenset(HANDLER_INTENTS)
+    return frozenset(PROFILES[profile])
+
+
+def build_intents(profile: str = None) -> discord.Intents:
+    """Intent set for a profile; "full" keeps the legacy all-but-presences set"""
+    profile = profile or os.environ.get("INTENTS_PROFILE", "standard")
+    if profile == "full" and not os.environ.get("AUDIT_HANDLERS"):
+        intents = discord.Intents.all()
+        intents.presences = False
+        return intents
+
+    intents = discord.Intents.none()
+    for group in enabled_handlers(profile):
+        for flag in HANDLER_INTENTS[group]:
+            setattr(intents, flag, True)
+    return intents
+
+
+def build_member_cache_flags(intents: discord.Intents) -> discord.MemberCacheFlags:
+    """Member cache policy from MEMBER_CACHE, constrained by the intents"""
+    policy = os.environ.get("MEMBER_CACHE", "intents")
+    if policy == "none" or not intents.members:
+        return discord.MemberCacheFlags.none()
+    if policy == "all":
+        return discord.MemberCacheFlags.all()
+    if policy == "joined":
+        return discord.MemberCacheFlags(joined=True, voice=False)
+    if policy == "voice":
+        return discord.MemberCacheFlags(joined=False, voice=True)
+    return discord.MemberCacheFlags.from_intents(intents)
+
+
+def bot_cache_options(intents: discord.Intents) -> dict:
+    """Keyword arguments for commands.Bot controlling cache and chunking"""
+    max_messages = int(os.environ.get("MAX_MESSAGES", "1000"))
+    return {
+        "member_cache_flags": build_member_cache_flags(intents),
+        "max_messages": max_messages or None,
+        "chunk_guilds_at_startup": os.environ.get("CHUNK_GUILDS_AT_STARTUP", "0") == "1" and intents.members,
+    }
@@ -0,0 +1,185 @@
+"""
+Invite-use cache for attributing member joins to the invite they used.
+
+Discord doesn't say which invite a joining member used, only each invite's
+running use count. The tracker keeps {code: CachedInvite} per guild, seeded
+once from guild.invites() at startup and kept current from on_invite_create
+and on_invite_delete, and diffs it against a fresh fetch when members join.
+
+Joins are batched: the first join in a guild opens a short window, every
+join in the window waits on the same future, and one refetch at the end of
+the window answers all of them. A raid of 500 joins costs one REST call
+instead of 500. When several invites gained uses in the same window the
+joins can't be told apart, so every candidate is reported.
+
+Invites Discord deletes because their last use was taken are kept as
+"retired" until the next diff, so the join that used them up still counts.
+Only invites that vanished around the burst (from one window before its
+first join) with exactly one use left count, as one use each; older
+deletions, e.g. a moderator removing a half-used invite, are never blamed.
+"""
+
+import time
+import asyncio
+import logging
+from dataclasses import dataclass
+
+import discord
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WINDOW = 1.5  # seconds a join burst is collected before refetching
+
+
+@dataclass
+class CachedInvite:
+    code: str
+    uses: int
+    max_uses: int = 0
+    inviter_id: int = None
+    channel_id: int = None
+
+    @classmethod
+    def from_invite(cls, invite) -> "CachedInvite":
+        inviter = invite.inviter
+        channel = invite.channel
+        return cls(invite.code, invite.uses or 0, invite.max_uses or 0,
+                   inviter.id if inviter is not None else None,
+                   channel.id if channel is not None else None)
+
+
+@dataclass(frozen=True)
+class InviteUse:
+    """An invite that gained `count` uses during a join burst"""
+    code: str
+    count: int
+    inviter_id: int = None
+    channel_id: int = None
+
+
+def diff_uses(old: dict, fresh: dict, retired: dict) -> list:
+    """Invites whose use count went up between `old` and `fresh`, most used first.
+
+    `retired` holds invites deleted during the burst, as {code: CachedInvite}.
+    """
+    used = []
+    for code, invite in fresh.items():
+        before = old.get(code)
+        # Codes created while their create event was missed count from zero
+        gained = invite.uses - (before.uses if before is not None else 0)
+        if gained > 0:
+            used.append(InviteUse(code, gained, invite.inviter_id, invite.channel_id))
+    for code, invite in retired.items():
+        # Only an invite with its last use left can have been deleted by a join taking it
+        if code not in fresh and invite.max_uses and invite.uses == invite.max_uses - 1:
+            used.append(InviteUse(code, 1, invite.inviter_id, invite.channel_id))
+    used.sort(key=lambda use: -use.count)
+    return used
+
+
+class _Burst:
+    __slots__ = ("future", "joins", "opened")
+
+    def __init__(self, future: asyncio.Future):
+        self.future = future
+        self.joins = 0
+        self.opened = time.monotonic()
+
+
+class InviteTracker:
+    """Per-guild invite cache with one refetch per join burst (event loop only)"""
+
+    def __init__(self, window: float = DEFAULT_WINDOW):
+        self.window = window
+        self._invites = {}  # guild_id -> {code: CachedInvite}
+        self._retired = {}  # guild_id -> {code: (CachedInvite, monotonic time deleted)}
+        self._bursts = {}   # guild_id -> _Burst collecting joins
+        self._tasks = set()  # running _resolve tasks; the loop only keeps weak references
+        self.fetches = 0
+        self.joins = 0
+
+    def tracking(self, guild_id: int) -> bool:
+        return guild_id in self._invites
+
+    async def _fetch(self, guild) -> dict:
+        self.fetches += 1
+        return {invite.code: CachedInvite.from_invite(invite) for invite in await guild.invites()}
+
+    async def seed(self, guild) -> bool:
+        """Load a guild's invites; False (and no attribution) without Manage Server"""
+        try:
+            self._invites[guild.id] = await self._fetch(guild)
+        except discord.Forbidden:
+            logger.warning("No permission to list invites in guild %s, joins won't be attributed", guild.id)
+            self.forget(guild.id)
+            return False
+        self._retired.pop(guild.id, None)
+        return True
+
+    def forget(self, guild_id: int):
+        self._invites.pop(guild_id, None)
+        self._retired.pop(guild_id, None)
+
+    def created(self, invite):
+        invites = self._invites.get(invite.guild.id) if invite.guild is not None else None
+        if invites is not None:
+            invites[invite.code] = CachedInvite.from_invite(invite)
+
+    def deleted(self, invite):
+        invites = self._invites.get(invite.guild.id) if invite.guild is not None else None
+        if invites is None:
+            return
+        cached = invites.pop(invite.code, None)
+        if cached is not None:
+            now = time.monotonic()
+            retired = self._retired.setdefault(invite.guild.id, {})
+            # Deletions too old to belong to any upcoming burst are dropped here, not left until the next join
+            for code in [code for code, (_, deleted) in retired.items() if now - deleted > 2 * self.window]:
+                del retired[code]
+            retired[invite.code] = (cached, now)
+
+    async def attribute(self, guild):
+        """Invites used by the current join burst, or None if the guild isn't tracked"""
+        if guild.id not in self._invites:
+            return None
+        self.joins += 1
+        burst = self._bursts.get(guild.id)
+        if burst is None:
+            burst = self._bursts[guild.id] = _Burst(asyncio.get_running_loop().create_future())
+            task = asyncio.create_task(self._resolve(guild, burst))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        burst.joins += 1
+        # Shielded so a cancelled join handler doesn't cancel the answer for the rest
+        return await asyncio.shield(burst.future)
+
+    async def _resolve(self, guild, burst: _Burst):
+        try:
+            await asyncio.sleep(self.window)
+            # Joins from here on start the next burst
+            self._bursts.pop(guild.id, None)
+            try:
+                fresh = await self._fetch(guild)
+            except Exception as e:
+                logger.error("Error fetching invites for guild %s: %s", guild.id, e)
+                self._retired.pop(guild.id, None)
+                return
+            # The delete event can arrive just before the join that caused it
+            since = burst.opened - self.window
+            retired = {code: cached for code, (cached, deleted) in self._retired.pop(guild.id, {}).items() if deleted >= since}
+            old = self._invites.get(guild.id, {})
+            used = diff_uses(old, fresh, retired)
+            if guild.id in self._invites:
+                self._invites[guild.id] = fresh
+            logger.debug("Invite refetch for guild %s: %d join(s), %d invite(s) used", guild.id, burst.joins, len(used))
+            burst.future.set_result(used)
+        finally:
+            # Failed or cancelled: the waiting joins are still logged, just without an invite
+            if self._bursts.get(guild.id) is burst:
+                del self._bursts[guild.id]
+            if not burst.future.done():
+                burst.future.set_result([])
+
+    def stats(self) -> dict:
+        return {"guilds": len(self._invites), "invites": sum(map(len, self._invites.values())),
+                "joins": self.joins, "fetches": self.fetches}
@@ -0,0 +1,146 @@
+"""
+Watchlist matching for deleted and edited message content.
+
+All of a guild's terms are compiled into one Aho-Corasick automaton at
+startup, so a scan walks the message once no matter how many terms there are
+(a combined regex alternation still tries every term at every position).
+
+Configured per guild in guilds.json:
+
+    "keyword_alerts": {
+        "terms": ["free nitro", "discord.gift"],
+        "terms_file": "watchlist.txt",
+        "ping_role_id": 1300000000000000001,
+        "whole_words": true,
+        "respect_filters": false
+    }
+
+terms_file is optional, one term per line (blank lines and # comments are
+skipped). Matching is case-insensitive.
+
+Alerts are checked before the guild's audit filters, so ignore rules for
+channels, bots or content don't hide them; set respect_filters to apply the
+filters to alerts as well.
+"""
+
+import logging
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+
+class KeywordMatcher:
+    """Aho-Corasick automaton over casefolded terms"""
+
+    __slots__ = ("terms", "whole_words", "_goto", "_fail", "_out")
+
+    def __init__(self, terms, whole_words: bool = True):
+        self.terms = sorted({term.casefold().strip() for term in terms if term and term.strip()})
+        self.whole_words = whole_words
+
+        # Trie: one transition dict per state, state 0 is the root
+        goto = [{}]
+        out = [()]
+        for index, term in enumerate(self.terms):
+            state = 0
+            for char in term:
+                next_state = goto[state].get(char)
+                if next_state is None:
+                    next_state = goto[state][char] = len(goto)
+                    goto.append({})
+                    out.append(())
+                state = next_state
+            out[state] = (index,)
+
+        # Failure links, breadth first; outputs inherit the failure state's
+        # outputs so a scan never has to walk the failure chain to report
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in goto[state].items():
+                queue.append(next_state)
+                fallback = fail[state]
+                while fallback and char not in goto[fallback]:
+                    fallback = fail[fallback]
+                fail[next_state] = goto[fallback].get(char, 0)
+                out[next_state] = out[next_state] + out[fail[next_state]]
+
+        self._goto = goto
+        self._fail = fail
+        self._out = out
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    def find(self, text: str) -> list:
+        """Distinct terms found in text, in order of first appearance"""
+        if not text or not self.terms:
+            return []
+        goto, fail, out, terms = self._goto, self._fail, self._out, self.terms
+        text = text.casefold()
+        found = {}
+        state = 0
+        for position, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if out[state]:
+                for index in out[state]:
+                    if index in found:
+                        continue
+                    term = terms[index]
+                    if self.whole_words and not _on_word_boundaries(text, position - len(term) + 1, position + 1):
+                        continue
+                    found[index] = None
+        return [terms[index] for index in found]
+
+
+def _on_word_boundaries(text: str, start: int, end: int) -> bool:
+    """True if text[start:end] isn't glued to letters/digits on either side"""
+    return (start == 0 or not text[start - 1].isalnum()) and (end == len(text) or not text[end].isalnum())
+
+
+def _read_terms_file(path: str) -> list:
+    with open(path, encoding="utf-8") as fh:
+        return [line.strip() for line in fh if line.strip() and not line.lstrip().startswith("#")]
+
+
+class KeywordAlerts:
+    """A guild's compiled watchlist plus who to ping"""
+
+    __slots__ = ("guild_id", "matcher", "ping_role_id", "respect_filters")
+
+    def __init__(self, guild_id: int, matcher: KeywordMatcher, ping_role_id: int = None, respect_filters: bool = False):
+        self.guild_id = guild_id
+        self.matcher = matcher
+        self.ping_role_id = ping_role_id
+        self.respect_filters = respect_filters
+
+    def find(self, *texts) -> list:
+        """Distinct watchlisted terms across the given texts"""
+        found = {}
+        for text in texts:
+            for term in self.matcher.find(text):
+                found[term] = None
+        return list(found)
+
+
+def compile_keyword_alerts(configs: dict) -> dict:
+    """Build {guild_id: KeywordAlerts} for guilds with a non-empty watchlist"""
+    alerts = {}
+    for guild_id, config in configs.items():
+        raw = config.options.get("keyword_alerts")
+        if not raw:
+            continue
+        terms = list(raw.get("terms", ()))
+        if raw.get("terms_file"):
+            terms += _read_terms_file(raw["terms_file"])
+        matcher = KeywordMatcher(terms, whole_words=raw.get("whole_words", True))
+        if not len(matcher):
+            continue
+        role_id = raw.get("ping_role_id")
+        alerts[guild_id] = KeywordAlerts(guild_id, matcher, int(role_id) if role_id else None,
+                                         bool(raw.get("respect_filters", False)))
+        logger.info("Keyword alerts active for guild %s (%d terms)", guild_id, len(matcher))
+    return alerts
@@ -0,0 +1,190 @@
+"""
+LCSRC Utilities - shard cluster launcher
+
+Runs the bot as several worker processes, each owning a contiguous block of
+shards (an AutoShardedBot per process), and serves the aggregated status of
+all shards from the shared status store.
+
+Usage:
+    python launcher.py --shards 8 --clusters 2
+    python launcher.py --clusters 4            # shard count from Discord
+
+Environment: BOT_TOKEN (required), SHARD_STATUS_DB, plus everything main.py reads.
+"""
+
+import os
+import sys
+import json
+import time
+import signal
+import logging
+import argparse
+import threading
+import subprocess
+import urllib.request
+from flask import Flask, jsonify
+
+from logging_setup import setup_logging
+from shard_status import ShardStatusStore, register_status_routes
+
+log_listener = setup_logging()
+logger = logging.getLogger("launcher")
+
+MAIN_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "main.py")
+RESTART_BACKOFF = (1, 5, 15, 60)  # seconds, per consecutive crash
+STOP_TIMEOUT = 30.0  # seconds all clusters together get to drain after SIGTERM
+
+
+def recommended_shard_count(token: str) -> int:
+    """Ask Discord how many shards the bot should run"""
+    request = urllib.request.Request(
+        "https://discord.com/api/v10/gateway/bot",
+        headers={"Authorization": f"Bot {token}", "User-Agent": "LCSRC Utilities launcher"},
+    )
+    with urllib.request.urlopen(request, timeout=10) as response:
+        return int(json.load(response)["shards"])
+
+
+def split_shards(shard_count: int, clusters: int) -> list:
+    """Split shard IDs 0..shard_count-1 into `clusters` contiguous blocks"""
+    clusters = max(1, min(clusters, shard_count))
+    size, extra = divmod(shard_count, clusters)
+    blocks, start = [], 0
+    for i in range(clusters):
+        end = start + size + (1 if i < extra else 0)
+        blocks.append(list(range(start, end)))
+        start = end
+    return blocks
+
+
+class Cluster:
+    """One worker process running a block of shards"""
+
+    def __init__(self, cluster_id: int, shard_ids: list, shard_count: int, status_db: str):
+        self.cluster_id = cluster_id
+        self.shard_ids = shard_ids
+        self.shard_count = shard_count
+        self.status_db = status_db
+        self.process = None
+        self.started_at = None
+        self.crashes = 0
+
+    def start(self):
+        env = {
+            **os.environ,
+            "BOT_MODE": "sharded",
+            "SHARD_COUNT": str(self.shard_count),
+            "SHARD_IDS": ",".join(map(str, self.shard_ids)),
+            "CLUSTER_ID": str(self.cluster_id),
+            "SHARD_STATUS_DB": self.status_db,
+            "STATUS_SERVER": "0",
+        }
+        self.process = subprocess.Popen([sys.executable, MAIN_SCRIPT], env=env)
+        self.started_at = time.monotonic()
+        logger.info("Cluster %s started (pid %s, shards %s)", self.cluster_id, self.process.pid, self.shard_ids)
+
+    def terminate(self):
+        """Ask the worker to drain and exit (doesn't wait)"""
+        if self.process is not None and self.process.poll() is None:
+            self.process.send_signal(signal.SIGTERM)
+
+    def wait(self, deadline: float):
+        """Wait for the worker to exit until `deadline` (time.monotonic), then kill it"""
+        if self.process is None:
+            return
+        try:
+            self.process.wait(timeout=max(deadline - time.monotonic(), 0))
+        except subprocess.TimeoutExpired:
+            logger.warning("Cluster %s did not exit in time, killing", self.cluster_id)
+            self.process.kill()
+            self.process.wait()
+
+
+def run_status_server(store: ShardStatusStore, clusters: list, port: int):
+    app = Flask("launcher")
+    register_status_routes(app, store)
+
+    @app.route('/')
+    def home():
+        summary = store.summary()
+        return jsonify({
+            "status": "online" if summary["ready"] == summary["shards"] and summary["shards"] else "degraded",
+            "bot": "LCSRC Utilities",
+            "clusters": len(clusters),
+            "shards": summary["shards"],
+            "ready": summary["ready"],
+            "guilds": summary["guilds"],
+        })
+
+    @app.route('/health')
+    def health():
+        return jsonify({"status": "healthy"})
+
+    app.run(host='0.0.0.0', port=port)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the audit bot as shard clusters")
+    parser.add_argument("--shards", type=int, default=None, help="total shard count (default: Discord's recommendation)")
+    parser.add_argument("--clusters", type=int, default=os.cpu_count() or 1, help="worker processes")
+    parser.add_argument("--port", type=int, default=8080, help="status server port")
+    args = parser.parse_args()
+
+    token = os.environ.get("BOT_TOKEN")
+    if not token:
+        logger.error("No BOT_TOKEN found in environment variables!")
+        sys.exit(1)
+
+    shard_count = args.shards or recommended_shard_count(token)
+    status_db = os.environ.get("SHARD_STATUS_DB", "data/shard_status.db")
+    store = ShardStatusStore(status_db)
+
+    clusters = [
+        Cluster(cluster_id, shard_ids, shard_count, status_db)
+        for cluster_id, shard_ids in enumerate(split_shards(shard_count, args.clusters))
+    ]
+    logger.info("Launching %d shard(s) across %d cluster(s)", shard_count, len(clusters))
+
+    threading.Thread(target=run_status_server, args=(store, clusters, args.port), daemon=True).start()
+
+    stopping = threading.Event()
+
+    def handle_signal(signum, frame):
+        logger.info("Received signal %s, stopping clusters", signum)
+        stopping.set()
+
+    signal.signal(signal.SIGTERM, handle_signal)
+    signal.signal(signal.SIGINT, handle_signal)
+
+    for cluster in clusters:
+        store.clear_cluster(cluster.cluster_id)
+        cluster.start()
+        # Discord allows one IDENTIFY per 5s per bucket; stagger cluster startup
+        if stopping.wait(5.0):
+            break
+
+    # Supervise: restart crashed clusters with backoff
+    while not stopping.wait(1.0):
+        for cluster in clusters:
+            code = cluster.process.poll() if cluster.process else None
+            if code is None:
+                continue
+            uptime = time.monotonic() - cluster.started_at
+            cluster.crashes = 0 if uptime > 300 else cluster.crashes + 1
+            delay = RESTART_BACKOFF[min(cluster.crashes, len(RESTART_BACKOFF) - 1)]
+            logger.warning("Cluster %s exited with %s after %.0fs, restarting in %ss", cluster.cluster_id, code, uptime, delay)
+            if stopping.wait(delay):
+                break
+            cluster.start()
+
+    # Every cluster drains at once, under one shared deadline
+    for cluster in clusters:
+        cluster.terminate()
+    deadline = time.monotonic() + STOP_TIMEOUT
+    for cluster in clusters:
+        cluster.wait(deadline)
+    logger.info("All clusters stopped")
+
+
+if __name__ == "__main__":
+    main()
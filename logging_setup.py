@@ -0,0 +1,161 @@
+"""
+Non-blocking structured logging for the audit bot.
+
+Records are filtered (level, per-logger rate limit, sampling) on the calling
+thread, handed to a QueueHandler and rendered + written by a QueueListener
+thread, so no formatting or stream I/O ever runs on the event loop.
+"""
+
+import os
+import sys
+import json
+import time
+import queue
+import random
+import atexit
+import logging
+import threading
+import logging.handlers
+from datetime import datetime, timezone
+
+# Attributes every LogRecord carries; anything else was passed via `extra=`
+_RESERVED_ATTRS = frozenset(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    """Render a record as a single JSON line, including any `extra=` fields"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED_ATTRS and not key.startswith("_"):
+                payload[key] = value
+        if record.exc_info:
+            payload["exc"] = self.formatException(record.exc_info)
+        return json.dumps(payload, default=str, ensure_ascii=False)
+
+
+class RateLimitFilter(logging.Filter):
+    """Per-logger token bucket plus optional sampling.
+
+    WARNING and above always pass. Suppressed records are counted and the
+    count is attached to the next record that gets through as `suppressed`.
+    """
+
+    def __init__(self, rate: float = 50.0, burst: int = 100, overrides: dict = None, sample: dict = None):
+        super().__init__()
+        self.rate = rate
+        self.burst = burst
+        self.overrides = overrides or {}
+        self.sample = sample or {}
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+
+        name = record.name
+        sample_rate = self.sample.get(name)
+        if sample_rate is not None and random.random() >= sample_rate:
+            return False
+
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(name)
+            if bucket is None:
+                rate, burst = self.overrides.get(name, (self.rate, self.burst))
+                # [tokens, last_refill, rate, burst, suppressed]
+                bucket = self._buckets[name] = [float(burst), now, rate, burst, 0]
+            tokens = min(bucket[3], bucket[0] + (now - bucket[1]) * bucket[2])
+            bucket[1] = now
+            if tokens < 1.0:
+                bucket[0] = tokens
+                bucket[4] += 1
+                return False
+            bucket[0] = tokens - 1.0
+            if bucket[4]:
+                record.suppressed = bucket[4]
+                bucket[4] = 0
+        return True
+
+
+class LazyQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that defers message formatting to the listener thread.
+
+    The stock `prepare()` merges msg/args on the caller's thread; the queue
+    here is in-process, so the record can be passed through untouched.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def _parse_rate_limits(spec: str) -> dict:
+    """Parse "logger:rate:burst,logger:rate:burst" into {logger: (rate, burst)}"""
+    limits = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        name, rate, burst = item.rsplit(":", 2)
+        limits[name] = (float(rate), int(burst))
+    return limits
+
+
+def _parse_sample(spec: str) -> dict:
+    """Parse "logger:0.1,logger:0.5" into {logger: probability}"""
+    sample = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        name, prob = item.rsplit(":", 1)
+        sample[name] = float(prob)
+    return sample
+
+
+def setup_logging(level: str = None, fmt: str = None, stream=None) -> logging.handlers.QueueListener:
+    """Install the queue-based logging pipeline on the root logger.
+
+    Configuration comes from the environment:
+      LOG_LEVEL        root level (default INFO)
+      LOG_FORMAT       "json" (default) or "text"
+      LOG_RATE         default per-logger "rate:burst" (default 50:100)
+      LOG_RATE_LIMITS  per-logger overrides, "logger:rate:burst,..."
+      LOG_SAMPLE       per-logger sampling, "logger:probability,..."
+    """
+    level = (level or os.environ.get("LOG_LEVEL", "INFO")).upper()
+    fmt = (fmt or os.environ.get("LOG_FORMAT", "json")).lower()
+    rate, burst = os.environ.get("LOG_RATE", "50:100").split(":")
+
+    output = logging.StreamHandler(stream or sys.stderr)
+    if fmt == "json":
+        output.setFormatter(JsonFormatter())
+    else:
+        output.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = LazyQueueHandler(log_queue)
+    queue_handler.addFilter(RateLimitFilter(
+        rate=float(rate),
+        burst=int(burst),
+        overrides=_parse_rate_limits(os.environ.get("LOG_RATE_LIMITS", "")),
+        sample=_parse_sample(os.environ.get("LOG_SAMPLE", "")),
+    ))
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(level)
+
+    listener = logging.handlers.QueueListener(log_queue, output, respect_handler_level=True)
+    listener.start()
+    atexit.register(stop_logging, listener)
+    return listener
+
+
+def stop_logging(listener: logging.handlers.QueueListener):
+    """Flush and stop the listener thread; safe to call more than once"""
+    if listener._thread is not None:
+        listener.stop()
@@ -5,31 +5,153 @@ Guild ID: 1289789596238086194
 """
 
 import os
+import json
+import math
+import time
+import hashlib
+import signal
+import asyncio
 import logging
-from datetime import datetime
+from types import SimpleNamespace
+from datetime import datetime, timezone
 from flask import Flask, jsonify
+from werkzeug.serving import make_server
 
 import discord
 from discord import app_commands
 from discord.ext import commands
 
+from logging_setup import setup_logging
+from guild_config import GuildConfig, load_guild_configs
+from audit_dispatch import AuditDispatcher
+from shard_status import ShardStatusStore, current_rss_kb, register_status_routes
+from intents_profile import build_intents, bot_cache_options
+from state_store import StateStore
+from webhook_delivery import WebhookDelivery
+from audit_filters import compile_filters
+from keyword_alerts import compile_keyword_alerts
+from textdiff import diff_words, render_runs
+from edit_history import EditHistory
+from embed_layout import layout_fields, send_kwargs, truncate
+from sinks import AuditEvent, JsonlFileSink, SinkFanout, build_sinks
+from snapshots import SnapshotStore, capture, diff_snapshots
+from rollups import ALL, WINDOWS, RollupStore, RollupSink
+from user_timelines import ACTOR, TimelineSink, UserTimelines
+from invite_tracker import InviteTracker
+from voice_sessions import MASS_LEAVE, MASS_MOVE, SESSION, VoiceSessions
+from thread_activity import ThreadCoalescer, is_auto_archive
+from audit_export import export_parts, iter_events
+from audit_store import PartitionedStore
+from message_index import DELETED, EDITED, MessageIndex, search_words, snippet
+
 # ============== CONFIGURATION ==============
+# Default guild, used when no guild config file is present
 GUILD_ID = 1289789596238086194
 AUDIT_CHANNEL_NAME = "「📄」audit-logistics"
 AUDIT_CHANNEL_ID = 1474965686454325331  # Channel ID for audit logistics
 BOT_TOKEN = os.environ.get("BOT_TOKEN")
+GUILD_CONFIG_PATH = os.environ.get("GUILD_CONFIG", "guilds.json")
+
+# REST base URL override, e.g. http://127.0.0.1:8765/api/v10 for benchmarks/fake_rest_server.py
+DISCORD_API_BASE = os.environ.get("DISCORD_API_BASE")
+
+# Sharding - set by launcher.py when running shard clusters across processes
+SHARD_COUNT = int(os.environ["SHARD_COUNT"]) if os.environ.get("SHARD_COUNT") else None
+SHARD_IDS = [int(s) for s in os.environ["SHARD_IDS"].split(",")] if os.environ.get("SHARD_IDS") else None
+CLUSTER_ID = int(os.environ.get("CLUSTER_ID", "0"))
+SHARDED = os.environ.get("BOT_MODE", "single") == "sharded" or SHARD_COUNT is not None
+SHARD_STATUS_DB = os.environ.get("SHARD_STATUS_DB", "data/shard_status.db")
+SHARD_REPORT_INTERVAL = 15  # seconds between status store updates
+STATUS_SERVER = os.environ.get("STATUS_SERVER", "1") == "1"  # launcher runs its own
+PROCESS_STARTED = time.monotonic()
+
+FORCE_COMMAND_SYNC = os.environ.get("FORCE_COMMAND_SYNC", "0") == "1"
+
+# Persistent bot state (command tree hashes, checkpoints); one file per cluster
+STATE_PATH = os.environ.get("STATE_PATH", f"data/state-cluster{CLUSTER_ID}.json" if SHARDED else "data/state.json")
+
+# Per-message edit history kept in memory for /audithistory
+EDIT_HISTORY_BYTES = int(os.environ.get("EDIT_HISTORY_BYTES", str(8 * 1024 * 1024)))
+EDIT_HISTORY_VERSIONS = int(os.environ.get("EDIT_HISTORY_VERSIONS", "50"))
+
+# Where audit events go: any of discord, syslog, stdout (comma separated); jsonl,
+# from older configs, just keeps the local store below on when AUDIT_STORE=0
+AUDIT_SINKS = [name.strip() for name in os.environ.get("AUDIT_SINKS", "discord").split(",") if name.strip()]
+# Local history behind /audituser, /auditexport and retention, written whatever the
+# sinks are: one file per UTC day, compacted to gzip once the day is over and
+# dropped after AUDIT_RETENTION_DAYS (0 keeps everything)
+AUDIT_STORE_ENABLED = os.environ.get("AUDIT_STORE", "1") == "1" or "jsonl" in AUDIT_SINKS
+AUDIT_STORE_DIR = os.environ.get("AUDIT_STORE_DIR", f"data/audit-cluster{CLUSTER_ID}" if SHARDED else "data/audit")
+AUDIT_RETENTION_DAYS = int(os.environ.get("AUDIT_RETENTION_DAYS", "90"))
+STORE_MAINTENANCE_INTERVAL = 3600  # seconds between compaction/retention passes
+
+# Full-text index of deleted/edited message content for /auditgrep (same retention)
+MESSAGE_INDEX_PATH = f"{os.path.splitext(STATE_PATH)[0]}-messages.db"
+MESSAGE_INDEX_FLUSH_INTERVAL = 2  # seconds; rows are written in one transaction per flush
+SYSLOG_ADDRESS = os.environ.get("SYSLOG_ADDRESS", "/dev/log")  # unix socket path or host:port
+SINK_QUEUE_SIZE = int(os.environ.get("SINK_QUEUE_SIZE", "10000"))
+
+# Graceful shutdown: seconds to drain outbound queues after SIGTERM, and where
+# anything still undelivered is saved for the next start
+SHUTDOWN_TIMEOUT = float(os.environ.get("SHUTDOWN_TIMEOUT", "20"))
+SHUTDOWN_GRACE = 1.0  # lets handlers already running (e.g. on_member_remove's wait) finish
+PENDING_PATH = f"{os.path.splitext(STATE_PATH)[0]}-pending.jsonl"
+
+# Guild structure snapshots, diffed at startup to report changes made while offline
+SNAPSHOT_DIR = os.environ.get("SNAPSHOT_DIR", f"{os.path.splitext(STATE_PATH)[0]}-snapshots")
+SNAPSHOT_FLUSH_INTERVAL = 30  # seconds between writes of changed snapshots and rollups
+
+# Rolling per-hour/per-day counters behind /auditstats
+ROLLUPS_PATH = f"{os.path.splitext(STATE_PATH)[0]}-rollups.json"
+
+# Per-member ring buffers behind /audituser, LRU-evicted past TIMELINE_MAX_USERS;
+# members not in memory are rebuilt from the last TIMELINE_LOOKBACK_DAYS of the jsonl store
+TIMELINE_MAX_USERS = int(os.environ.get("TIMELINE_MAX_USERS", "20000"))
+TIMELINE_PER_USER = int(os.environ.get("TIMELINE_PER_USER", "25"))
+TIMELINE_LOOKBACK_DAYS = int(os.environ.get("TIMELINE_LOOKBACK_DAYS", "30"))
+
+# Joins arriving within this many seconds share one invite refetch for attribution
+INVITE_BURST_WINDOW = float(os.environ.get("INVITE_BURST_WINDOW", "1.5"))
+
+# Voice activity is logged as one summary per session; moves/leaves of at least
+# VOICE_MASS_THRESHOLD members from one channel within VOICE_GROUP_WINDOW seconds collapse into one entry
+VOICE_MAX_SESSIONS = int(os.environ.get("VOICE_MAX_SESSIONS", "50000"))
+VOICE_GROUP_WINDOW = float(os.environ.get("VOICE_GROUP_WINDOW", "2"))
+VOICE_MASS_THRESHOLD = int(os.environ.get("VOICE_MASS_THRESHOLD", "5"))
+VOICE_FLUSH_INTERVAL = 1  # seconds between checks for closed groups
+
+# Thread archive toggles and thread member joins/leaves are posted as one summary per guild per interval
+THREAD_SUMMARY_INTERVAL = int(os.environ.get("THREAD_SUMMARY_INTERVAL", "300"))
+
+# Reconnect backfill: audit entries missed while the gateway was down, posted
+# BACKFILL_BATCH to a message, at most BACKFILL_MAX_ENTRIES per guild per gap
+BACKFILL_BATCH = int(os.environ.get("BACKFILL_BATCH", "10"))
+BACKFILL_MAX_ENTRIES = int(os.environ.get("BACKFILL_MAX_ENTRIES", "1000"))
 
 # Embed Configuration
 EMBED_COLOR = 0x43c7c5  # #43c7c5
 AUDIT_IMAGE_URL = "https://i.imgur.com/0oNYYxK.png"
 
-# Setup logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+# Setup logging (queue-backed, JSON by default - see logging_setup.py)
+log_listener = setup_logging()
 logger = logging.getLogger(__name__)
 
+# Per-guild audit settings, loaded once: {guild_id: GuildConfig}
+GUILD_CONFIGS = load_guild_configs(
+    GUILD_CONFIG_PATH,
+    fallback=GuildConfig(
+        guild_id=GUILD_ID,
+        audit_channel_id=AUDIT_CHANNEL_ID,
+        audit_channel_name=AUDIT_CHANNEL_NAME,
+    ),
+)
+
+# Per-guild ignore/include rules ("filters" in guilds.json), compiled once
+AUDIT_FILTERS = compile_filters(GUILD_CONFIGS)
+
+# Watchlists for deleted/edited content ("keyword_alerts" in guilds.json)
+KEYWORD_ALERTS = compile_keyword_alerts(GUILD_CONFIGS)
+
 # ============== FLASK APP FOR 24/7 HOSTING ==============
 app = Flask(__name__)
 
@@ -39,7 +161,7 @@ def home():
     return jsonify({
         "status": "online",
         "bot": "LCSRC Utilities",
-        "guild": GUILD_ID,
+        "guilds": [str(guild_id) for guild_id in GUILD_CONFIGS],
         "audit_logger": "active"
     })
 
@@ -48,48 +170,284 @@ def health():
     """Health check endpoint for monitoring"""
     return jsonify({"status": "healthy"})
 
-# Run Flask in a separate thread
+@app.route('/sinks')
+def sink_stats():
+    """Per-sink queue, throughput and drop counters"""
+    return jsonify(audit_sinks.stats())
+
+# Shard status table shared by all processes of a clustered deployment
+shard_store = ShardStatusStore(SHARD_STATUS_DB) if SHARDED else None
+if shard_store is not None:
+    register_status_routes(app, shard_store)
+
+# Run Flask in a separate thread; kept as a server object so shutdown can stop it
+http_server = None
+
 def run_flask():
-    app.run(host='0.0.0.0', port=8080)
+    http_server.serve_forever()
 
 # ============== DISCORD BOT SETUP ==============
-# Required intents for comprehensive audit logging
-intents = discord.Intents.all()
-intents.presences = False  # Disable if not needed for privacy
-
-bot = commands.Bot(
-    command_prefix="!",
-    intents=intents,
-    help_command=None
-)
+if DISCORD_API_BASE:
+    # Used by both the bot's HTTP client and webhooks
+    discord.http.Route.BASE = DISCORD_API_BASE.rstrip("/")
+
+# Only the intents the enabled audit handlers need (INTENTS_PROFILE, see intents_profile.py)
+INTENTS_PROFILE = os.environ.get("INTENTS_PROFILE", "standard")
+intents = build_intents(INTENTS_PROFILE)
+cache_options = bot_cache_options(intents)
+
+# Sent with IDENTIFY, so reconnects don't need a change_presence call
+BOT_ACTIVITY = discord.Game(name="Fulfilling Community Needs")
+
+if SHARDED:
+    # One process owns SHARD_IDS out of SHARD_COUNT (or all shards, if unset)
+    bot = commands.AutoShardedBot(
+        command_prefix="!",
+        intents=intents,
+        help_command=None,
+        shard_count=SHARD_COUNT,
+        shard_ids=SHARD_IDS,
+        activity=BOT_ACTIVITY,
+        status=discord.Status.idle,
+        **cache_options
+    )
+else:
+    bot = commands.Bot(
+        command_prefix="!",
+        intents=intents,
+        help_command=None,
+        activity=BOT_ACTIVITY,
+        status=discord.Status.idle,
+        **cache_options
+    )
 
 # Sync tree for slash commands (use bot's built-in tree)
 tree = bot.tree
 
+state = StateStore(STATE_PATH)
+
+edit_history = EditHistory(EDIT_HISTORY_BYTES, EDIT_HISTORY_VERSIONS)
+snapshots = SnapshotStore(SNAPSHOT_DIR)
+rollups = RollupStore(ROLLUPS_PATH)
+timelines = UserTimelines(TIMELINE_MAX_USERS, TIMELINE_PER_USER)
+invite_tracker = InviteTracker(INVITE_BURST_WINDOW)
+voice_sessions = VoiceSessions(VOICE_MAX_SESSIONS, VOICE_GROUP_WINDOW, VOICE_MASS_THRESHOLD)
+thread_activity = ThreadCoalescer()
+audit_store = PartitionedStore(AUDIT_STORE_DIR, AUDIT_RETENTION_DAYS)
+message_index = MessageIndex(MESSAGE_INDEX_PATH)
+
 # ============== UTILITY FUNCTIONS ==============
+# Cleared on shutdown so handlers stop producing new audit events
+accepting_events = True
+
+# {guild_id: audit-log high-water mark}: the newest audit entry ID already
+# reported; checkpointed to the state file
+audit_hwm = {int(guild_id): mark for guild_id, mark in state.get("audit_hwm", {}).items()}
+
+def advance_hwm(guild_id: int, snowflake: int):
+    if snowflake > audit_hwm.get(guild_id, 0):
+        audit_hwm[guild_id] = snowflake
+
+def checkpoint_state():
+    """Persist the high-water marks (blocking, run it in a thread)"""
+    state.set("audit_hwm", {str(guild_id): mark for guild_id, mark in audit_hwm.items()})
+    state.save()
+
+def is_audited(guild: discord.Guild) -> bool:
+    """True if this guild has an audit config"""
+    return guild is not None and guild.id in GUILD_CONFIGS
+
+def should_audit(guild: discord.Guild, action: str, channel=None, user=None, roles=None, content: str = None) -> bool:
+    """First check in every handler: configured guild and not rejected by its filter rules"""
+    if not accepting_events:
+        return False
+    rules = AUDIT_FILTERS.get(guild.id) if guild is not None else None
+    return rules is not None and rules.allows(action, channel, user, roles, content)
+
+# {guild_id: chunk task} for guilds whose member list is being fetched in the background
+_chunk_tasks = {}
+# Guilds chunked since the last full (non-resumed) connect; a failed chunk isn't listed, so it's retried
+_chunked_guilds = set()
+
+def ensure_chunked(guild: discord.Guild):
+    """Fetch the guild's member list in the background unless it's loaded or loading.
+
+    discord.py drops member updates and removals for uncached members, so
+    every owned guild is chunked once ready, not only when someone joins.
+    """
+    if guild.id in _chunked_guilds or guild.chunked or not bot.intents.members or guild.id in _chunk_tasks:
+        return
+    logger.info("Chunking members for guild %s in the background", guild.id)
+    _chunk_tasks[guild.id] = asyncio.get_running_loop().create_task(_chunk_guild(guild))
+
+async def _chunk_guild(guild: discord.Guild):
+    try:
+        await guild.chunk(cache=True)
+    except Exception as e:
+        logger.error("Error chunking members for guild %s, will retry on the next member event: %s", guild.id, e)
+    else:
+        _chunked_guilds.add(guild.id)
+    finally:
+        _chunk_tasks.pop(guild.id, None)
+
+def owns_guild(guild_id: int) -> bool:
+    """True if this process runs the shard that guild_id lives on"""
+    if SHARD_IDS is None or not SHARD_COUNT:
+        return True
+    return (guild_id >> 22) % SHARD_COUNT in SHARD_IDS
+
 async def get_audit_channel(guild: discord.Guild) -> discord.TextChannel:
-    """Find the audit logistics channel by ID or name"""
+    """Find the guild's audit channel by ID or name"""
+    config = GUILD_CONFIGS.get(guild.id)
+    if config is None:
+        return None
+
     # First try to get by ID
-    channel = guild.get_channel(AUDIT_CHANNEL_ID)
-    if channel:
-        logger.info(f"Found audit channel by ID: {channel.name}")
-        return channel
+    if config.audit_channel_id:
+        channel = guild.get_channel(config.audit_channel_id)
+        if channel:
+            logger.debug("Found audit channel by ID: %s", channel.name)
+            return channel
     
     # Fallback to name lookup
-    channel = discord.utils.get(guild.text_channels, name=AUDIT_CHANNEL_NAME)
-    if channel:
-        logger.info(f"Found audit channel by name: {channel.name}")
-        return channel
+    if config.audit_channel_name:
+        channel = discord.utils.get(guild.text_channels, name=config.audit_channel_name)
+        if channel:
+            logger.debug("Found audit channel by name: %s", channel.name)
+            return channel
     
     # Try to find with similar name (in case of formatting differences)
     for ch in guild.text_channels:
         if "audit" in ch.name.lower() and "logistic" in ch.name.lower():
-            logger.info(f"Found audit channel by partial match: {ch.name}")
+            logger.debug("Found audit channel by partial match: %s", ch.name)
             return ch
     
-    logger.warning("Audit channel not found!")
+    logger.warning("Audit channel not found for guild %s!", guild.id)
     return None
 
+def build_audit_payload(member_name: str, action_text: str, when: datetime = None) -> dict:
+    """Standard image + text embeds for an audit post, laid out within Discord's size limits"""
+    image_embed = discord.Embed()
+    image_embed.set_image(url=AUDIT_IMAGE_URL)
+
+    now = when or datetime.now()
+    timestamp = f"<t:{int(now.timestamp())}>"
+    payload = {}
+
+    # Long action text continues in extra fields/embeds; if even that can't fit,
+    # post a preview and attach the full text so the event is never lost
+    groups = layout_fields(
+        [("Community Member:", member_name, True), ("Action:", action_text, True), ("Timestamp:", timestamp, False)],
+        max_embeds=9
+    )
+    if groups is None:
+        preview = truncate(action_text, 900) + "\n*Full details attached.*"
+        groups = layout_fields(
+            [("Community Member:", member_name, True), ("Action:", preview, True), ("Timestamp:", timestamp, False)],
+            max_embeds=9
+        )
+        payload["attachment"] = (f"audit-{int(now.timestamp())}.txt", action_text.encode())
+
+    embeds = [image_embed]
+    for fields in groups:
+        text_embed = discord.Embed(
+            color=EMBED_COLOR,
+            timestamp=now
+        )
+        for name, value, inline in fields:
+            text_embed.add_field(name=name, value=value, inline=inline)
+        embeds.append(text_embed)
+
+    payload["embeds"] = embeds
+    return payload
+
+async def deliver_audit(guild_id: int, event: AuditEvent):
+    """Pipeline worker callback: post via the guild's webhooks, else the audit channel"""
+    payload = audit_event_payload(event)
+    if await webhooks.send(guild_id, payload):
+        return
+
+    guild = bot.get_guild(guild_id)
+    if guild is None:
+        logger.error("Guild %s not available, dropping audit log", guild_id)
+        return
+
+    channel = await get_audit_channel(guild)
+    if channel is None:
+        logger.error("Could not find audit channel for guild %s", guild_id)
+        return
+
+    await channel.send(**send_kwargs(payload))
+
+# Optional webhook backend (per-guild "webhooks" in guilds.json), one pooled session
+webhooks = WebhookDelivery(GUILD_CONFIGS)
+
+# Per-guild outbound queues and rate budgets
+dispatcher = AuditDispatcher(deliver_audit, GUILD_CONFIGS)
+
+def audit_event_payload(event: AuditEvent) -> dict:
+    """Discord sink rendering: the standard embeds, plus a role ping for alerts"""
+    # Rendered at delivery, so stamp the event's own time, not the send time
+    payload = build_audit_payload(event.member_name, event.text, datetime.fromtimestamp(event.timestamp))
+    if event.ping_role_id:
+        payload["content"] = f"<@&{event.ping_role_id}>"
+        payload["allowed_mentions"] = discord.AllowedMentions(
+            everyone=False, users=False, roles=[discord.Object(event.ping_role_id)]
+        )
+    return payload
+
+# Every audit event fans out to all enabled sinks, each with its own queue;
+# the local store, rollup counters and timelines always see every event
+audit_sinks = SinkFanout(build_sinks(
+    [name for name in AUDIT_SINKS if name != "jsonl"],
+    dispatcher, audit_store, SYSLOG_ADDRESS, queue_size=SINK_QUEUE_SIZE
+) + ([JsonlFileSink(audit_store, queue_size=SINK_QUEUE_SIZE)] if AUDIT_STORE_ENABLED else [])
+  + [RollupSink(rollups), TimelineSink(timelines)])
+
+def post_audit(guild: discord.Guild, member_name: str, action_text: str, action: str = "audit",
+               user=None, channel=None, urgent: bool = False, ping_role_id: int = None, target=None,
+               timestamp: float = None, exclude: tuple = ()) -> bool:
+    """Publish an audit event to every sink not named in `exclude`"""
+    return audit_sinks.publish(AuditEvent(
+        guild_id=guild.id,
+        action=action,
+        member_name=member_name,
+        text=action_text,
+        timestamp=timestamp or time.time(),
+        user_id=user.id if user is not None else None,
+        channel_id=channel.id if channel is not None else None,
+        urgent=urgent,
+        ping_role_id=ping_role_id,
+        target_id=target.id if target is not None else None,
+    ), exclude)
+
+def check_keyword_alerts(message: discord.Message, verb: str, action: str, *texts) -> bool:
+    """Scan for watchlisted terms and alert; runs before the audit filters unless the guild opts in"""
+    alerts = KEYWORD_ALERTS.get(message.guild.id) if message.guild is not None else None
+    if alerts is None or not accepting_events:
+        return False
+    if bot.user is not None and message.author.id == bot.user.id:
+        return False  # our own posts quote watchlisted text
+    if alerts.respect_filters and not should_audit(message.guild, action, message.channel, message.author, content=texts[-1]):
+        return False
+    terms = alerts.find(*texts)
+    return bool(terms) and post_keyword_alert(message, terms, verb)
+
+def post_keyword_alert(message: discord.Message, terms: list, verb: str) -> bool:
+    """Publish a watchlist hit on the fast lane, pinging the configured role"""
+    alerts = KEYWORD_ALERTS[message.guild.id]
+    member_name = getattr(message.author, "nick", None) or message.author.name
+    action_text = (
+        f"⚠️ Watchlisted term(s) in a **{verb}** message in {message.channel.mention}\n"
+        f"**Matched:** {', '.join(f'`{term}`' for term in terms)}\n"
+        f"**Author:** {message.author.mention} (ID: `{message.author.id}`)\n"
+        f"**Message ID:** `{message.id}`"
+    )
+    return post_audit(
+        message.guild, member_name, action_text, "keyword_alert",
+        user=message.author, channel=message.channel, urgent=True, ping_role_id=alerts.ping_role_id
+    )
+
 def format_action_details(audit_log_entry, action_type: str) -> str:
     """Format detailed action summary from audit log"""
     details = []
@@ -145,6 +503,17 @@ def format_action_details(audit_log_entry, action_type: str) -> str:
         if audit_log_entry.reason:
             details.append(f"**Reason:** {audit_log_entry.reason}")
             
+    elif action_type == "member_role_update":
+        # discord.py puts granted roles in after.roles and removed ones in before.roles
+        added = getattr(audit_log_entry.after, "roles", None) or []
+        removed = getattr(audit_log_entry.before, "roles", None) or []
+        if added:
+            details.append(f"**Roles Added:** {', '.join(getattr(role, 'mention', str(role)) for role in added)}")
+        if removed:
+            details.append(f"**Roles Removed:** {', '.join(getattr(role, 'mention', str(role)) for role in removed)}")
+        if audit_log_entry.reason:
+            details.append(f"**Reason:** {audit_log_entry.reason}")
+
     elif action_type in ["role_create", "role_delete", "role_update"]:
         if audit_log_entry.before:
             details.append(f"**Before:** {audit_log_entry.before}")
@@ -280,207 +649,304 @@ def format_action_details(audit_log_entry, action_type: str) -> str:
     
     return "\n".join(details) if details else "No additional details"
 
-async def send_audit_log(guild: discord.Guild, action_type: str, action_name: str, details: str = None, user: discord.Member = None):
+
+async def send_audit_log(guild: discord.Guild, action_type: str, action_name: str, details: str = None,
+                         user: discord.Member = None, target=None):
     """Send audit log embed to the audit channel"""
     try:
-        channel = await get_audit_channel(guild)
-        
-        if channel is None:
-            logger.error(f"Could not find audit channel for guild {guild.id}")
-            return
-        
         # Get user's nickname in the guild
         member_name = "Unknown"
         if user:
-            member_name = user.nick if user.nick else user.name
-        
-        # Build the text embed
-        text_embed = discord.Embed(
-            color=EMBED_COLOR,
-            timestamp=datetime.now()
-        )
-        
-        text_embed.add_field(
-            name="Community Member:",
-            value=member_name,
-            inline=True
-        )
+            member_name = getattr(user, "nick", None) or user.name
         
         action_text = action_name
         if details:
             action_text = f"{action_name}\n{details}"
         
-        text_embed.add_field(
-            name="Action:",
-            value=action_text,
-            inline=True
-        )
-        
-        text_embed.add_field(
-            name="Timestamp:",
-            value=f"<t:{int(datetime.now().timestamp())}>",
-            inline=False
-        )
-        
-        # Create image embed
-        image_embed = discord.Embed()
-        image_embed.set_image(url=AUDIT_IMAGE_URL)
-        
-        # Send both embeds
-        await channel.send(embeds=[image_embed, text_embed])
-        logger.info(f"Audit log sent: {action_type} by {member_name}")
+        post_audit(guild, member_name, action_text, action_type, user=user, target=target)
+        logger.debug("Audit log queued: %s by %s", action_type, member_name)
         
     except Exception as e:
-        logger.error(f"Error sending audit log: {e}")
+        logger.error("Error sending audit log: %s", e)
+
+# Audit log actions we report: (AuditLogAction attribute, readable name, action type).
+# Built once; actions missing from the installed discord.py are skipped.
+_AUDIT_ACTIONS = (
+    ("message_delete", "Message Deleted", "message_delete"),
+    ("ban", "Member Banned", "member_ban"),
+    ("unban", "Member Unbanned", "member_unban"),
+    ("kick", "Member Kicked", "member_kick"),
+    ("member_update", "Member Updated", "member_update"),
+    ("member_role_update", "Member Roles Updated", "member_role_update"),
+    ("role_create", "Role Created", "role_create"),
+    ("role_delete", "Role Deleted", "role_delete"),
+    ("role_update", "Role Updated", "role_update"),
+    ("channel_create", "Channel Created", "channel_create"),
+    ("channel_delete", "Channel Deleted", "channel_delete"),
+    ("channel_update", "Channel Updated", "channel_update"),
+    ("emoji_create", "Emoji Created", "emoji_create"),
+    ("emoji_delete", "Emoji Deleted", "emoji_delete"),
+    ("emoji_update", "Emoji Updated", "emoji_update"),
+    ("sticker_create", "Sticker Created", "sticker_create"),
+    ("sticker_delete", "Sticker Deleted", "sticker_delete"),
+    ("sticker_update", "Sticker Updated", "sticker_update"),
+    ("invite_create", "Invite Created", "invite_create"),
+    ("invite_delete", "Invite Deleted", "invite_delete"),
+    ("invite_update", "Invite Updated", "invite_update"),
+    ("webhook_create", "Webhook Created", "webhook_create"),
+    ("webhook_delete", "Webhook Deleted", "webhook_delete"),
+    ("webhook_update", "Webhook Updated", "webhook_update"),
+    ("integration_create", "Integration Created", "integration_create"),
+    ("integration_delete", "Integration Deleted", "integration_delete"),
+    ("integration_update", "Integration Updated", "integration_update"),
+    ("app_command_permission_update", "Command Permissions Updated", "command_permission_update"),
+    ("thread_create", "Thread Created", "thread_create"),
+    ("thread_delete", "Thread Deleted", "thread_delete"),
+    ("thread_update", "Thread Updated", "thread_update"),
+    ("automod_rule_create", "Automod Rule Created", "automod_rule_create"),
+    ("automod_rule_delete", "Automod Rule Deleted", "automod_rule_delete"),
+    ("automod_rule_update", "Automod Rule Updated", "automod_rule_update"),
+    ("automod_block_message", "Automod Blocked Message", "automod_block"),
+    ("automod_flag_message", "Automod Flagged Message", "automod_flag"),
+    ("automod_timeout_member", "Automod Timeout", "automod_timeout"),
+    ("soundboard_sound_create", "Soundboard Sound Created", "soundboard_create"),
+    ("soundboard_sound_delete", "Soundboard Sound Deleted", "soundboard_delete"),
+    ("soundboard_sound_update", "Soundboard Sound Updated", "soundboard_update"),
+)
+AUDIT_ACTION_NAMES = {
+    getattr(discord.AuditLogAction, attr): (action_name, action_type)
+    for attr, action_name, action_type in _AUDIT_ACTIONS
+    if hasattr(discord.AuditLogAction, attr)
+}
 
-async def log_audit_entry(guild: discord.Guild, entry: discord.AuditLogEntry):
-    """Process and log an audit log entry"""
-    action = entry.action
-    user = entry.user
+def audit_target_member(entry: discord.AuditLogEntry):
+    """The member an audit entry acted on, if its target is a user"""
     target = entry.target
-    
-    # Map audit log actions to readable names
-    action_mapping = {
-        discord.AuditLogAction.message_delete: ("Message Deleted", "message_delete"),
-        discord.AuditLogAction.message_edit: ("Message Edited", "message_edit"),
-        discord.AuditLogAction.ban: ("Member Banned", "member_ban"),
-        discord.AuditLogAction.unban: ("Member Unbanned", "member_unban"),
-        discord.AuditLogAction.kick: ("Member Kicked", "member_kick"),
-        discord.AuditLogAction.member_update: ("Member Updated", "member_update"),
-        discord.AuditLogAction.role_create: ("Role Created", "role_create"),
-        discord.AuditLogAction.role_delete: ("Role Deleted", "role_delete"),
-        discord.AuditLogAction.role_update: ("Role Updated", "role_update"),
-        discord.AuditLogAction.channel_create: ("Channel Created", "channel_create"),
-        discord.AuditLogAction.channel_delete: ("Channel Deleted", "channel_delete"),
-        discord.AuditLogAction.channel_update: ("Channel Updated", "channel_update"),
-        discord.AuditLogAction.emoji_create: ("Emoji Created", "emoji_create"),
-        discord.AuditLogAction.emoji_delete: ("Emoji Deleted", "emoji_delete"),
-        discord.AuditLogAction.emoji_update: ("Emoji Updated", "emoji_update"),
-        discord.AuditLogAction.sticker_create: ("Sticker Created", "sticker_create"),
-        discord.AuditLogAction.sticker_delete: ("Sticker Deleted", "sticker_delete"),
-        discord.AuditLogAction.sticker_update: ("Sticker Updated", "sticker_update"),
-        discord.AuditLogAction.invite_create: ("Invite Created", "invite_create"),
-        discord.AuditLogAction.invite_delete: ("Invite Deleted", "invite_delete"),
-        discord.AuditLogAction.invite_update: ("Invite Updated", "invite_update"),
-        discord.AuditLogAction.webhook_create: ("Webhook Created", "webhook_create"),
-        discord.AuditLogAction.webhook_delete: ("Webhook Deleted", "webhook_delete"),
-        discord.AuditLogAction.webhook_update: ("Webhook Updated", "webhook_update"),
-        discord.AuditLogAction.integration_create: ("Integration Created", "integration_create"),
-        discord.AuditLogAction.integration_delete: ("Integration Deleted", "integration_delete"),
-        discord.AuditLogAction.integration_update: ("Integration Updated", "integration_update"),
-        discord.AuditLogAction.commands_permission_update: ("Command Permissions Updated", "command_permission_update"),
-        discord.AuditLogAction.thread_create: ("Thread Created", "thread_create"),
-        discord.AuditLogAction.thread_delete: ("Thread Deleted", "thread_delete"),
-        discord.AuditLogAction.thread_update: ("Thread Updated", "thread_update"),
-        discord.AuditLogAction.automod_rule_create: ("Automod Rule Created", "automod_rule_create"),
-        discord.AuditLogAction.automod_rule_delete: ("Automod Rule Deleted", "automod_rule_delete"),
-        discord.AuditLogAction.automod_rule_update: ("Automod Rule Updated", "automod_rule_update"),
-        discord.AuditLogAction.automod_block_message: ("Automod Blocked Message", "automod_block"),
-        discord.AuditLogAction.automod_flag_message: ("Automod Flagged Message", "automod_flag"),
-        discord.AuditLogAction.automod_user_timeout: ("Automod Timeout", "automod_timeout"),
-        discord.AuditLogAction.soundboard_sound_create: ("Soundboard Sound Created", "soundboard_create"),
-        discord.AuditLogAction.soundboard_sound_delete: ("Soundboard Sound Deleted", "soundboard_delete"),
-        discord.AuditLogAction.soundboard_sound_update: ("Soundboard Sound Updated", "soundboard_update"),
-    }
-    
-    if action in action_mapping:
-        action_name, action_type = action_mapping[action]
+    # Uncached users come back as discord.Object with the user type attached
+    if isinstance(target, discord.abc.User) or getattr(target, "type", None) in (discord.Member, discord.User):
+        return target
+    return None
+
+async def log_audit_entry(guild: discord.Guild, entry: discord.AuditLogEntry, batch: list = None, quiet=()):
+    """Process and log an audit log entry.
+
+    With `batch`, the Discord post is appended to it for one combined post, while
+    the other sinks still get one event per entry (actions in `quiet` only the latter).
+    """
+    advance_hwm(guild.id, entry.id)
+    mapped = AUDIT_ACTION_NAMES.get(entry.action)
+    if mapped is not None:
+        action_name, action_type = mapped
+        if not should_audit(guild, action_type, user=entry.user):
+            return
         details = format_action_details(entry, action_type)
-        await send_audit_log(guild, action_type, action_name, details, user)
+        if batch is None:
+            await send_audit_log(guild, action_type, action_name, details, entry.user, audit_target_member(entry))
+            return
+        member_name = (getattr(entry.user, "nick", None) or entry.user.name) if entry.user else "Unknown"
+        created = entry.created_at.timestamp()
+        post_audit(guild, member_name, f"{action_name}\n{details}" if details else action_name, action_type,
+                   user=entry.user, target=audit_target_member(entry), timestamp=created, exclude=("discord",))
+        if entry.action not in quiet:
+            batch.append(f"**{action_name}** by {member_name} <t:{int(created)}:T>\n{details}")
 
 # ============== EVENT LISTENERS ==============
-@bot.event
-async def on_ready():
-    """Bot is ready and connected"""
-    logger.info(f"Bot logged in as {bot.user} (ID: {bot.user.id})")
-    
-    # Get the guild
-    guild = bot.get_guild(GUILD_ID)
-    if guild:
-        logger.info(f"Connected to guild: {guild.name} (ID: {guild.id})")
+# Set once the first READY of this process has been handled; later READYs are
+# reconnects that could not resume and must stay cheap (no REST, no audit posts)
+first_ready_done = False
+
+def _command_payload(command) -> dict:
+    """Serialised form of an app command (to_dict takes the tree on discord.py >= 2.4)"""
+    try:
+        return command.to_dict(tree)
+    except TypeError:
+        return command.to_dict()
+
+def command_tree_hash(guild: discord.Guild) -> str:
+    """Stable hash of the command definitions that would be synced to this guild"""
+    payload = sorted(
+        (_command_payload(command) for command in tree.get_commands(guild=guild)),
+        key=lambda command: command["name"]
+    )
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+async def sync_commands_if_changed(guild: discord.Guild):
+    """Sync the guild's command tree only when its definitions changed since the last sync"""
+    tree.copy_global_to(guild=guild)  # local only, no REST call
+    digest = command_tree_hash(guild)
+    synced = state.get("command_hashes", {})
+    if synced.get(str(guild.id)) == digest and not FORCE_COMMAND_SYNC:
+        logger.info("Slash commands unchanged for guild %s, skipping sync", guild.id)
+        return
+
+    await tree.sync(guild=guild)
+    state.set("command_hashes", {**synced, str(guild.id): digest})
+    await asyncio.to_thread(state.save)
+    logger.info("Slash commands synced successfully for guild %s", guild.id)
+
+async def report_offline_changes(guild: discord.Guild) -> bool:
+    """Diff the live guild against its stored snapshot and post one consolidated report.
+
+    True if the snapshot covered the offline gap, so the startup backfill can leave
+    structure changes (SNAPSHOT_ACTIONS) to this report instead of posting them twice.
+    """
+    stored = await asyncio.to_thread(snapshots.load, guild.id)
+    live = capture(guild)
+    snapshots.replace(guild.id, live)
+    if stored is None:
+        logger.info("No structure snapshot for guild %s yet, starting one", guild.id)
+        return False
+    if not should_audit(guild, "offline_changes"):
+        return False
+    lines = diff_snapshots(stored, live)
+    if not lines:
+        return True
+    action_text = (
+        f"**{len(lines)} change(s) made while the bot was offline** "
+        f"(since <t:{int(stored['taken_at'])}:f>)\n" + "\n".join(lines)
+    )
+    post_audit(guild, "Server Settings", action_text, "offline_changes")
+    logger.info("Reported %d offline change(s) for guild %s", len(lines), guild.id)
+    return True
+
+async def on_first_ready():
+    """One-time startup work: pending replay, channel checks, command sync and the startup post"""
+    # Posts still queued when the previous process shut down go out first, in order
+    pending = await asyncio.to_thread(load_pending)
+    discord_sink = audit_sinks.sink("discord")
+    if pending and discord_sink is not None:
+        replayed = 0
+        for event in pending:
+            # Guilds removed from the config (or now owned by another cluster) have no pipeline here
+            if event.guild_id not in GUILD_CONFIGS or not owns_guild(event.guild_id):
+                logger.warning("Dropping saved audit post for guild %s, which is no longer configured here", event.guild_id)
+                continue
+            discord_sink.submit(event)
+            replayed += 1
+        logger.info("Replaying %d audit post(s) saved at last shutdown", replayed)
+
+    for guild_id, config in GUILD_CONFIGS.items():
+        if not owns_guild(guild_id):
+            continue  # handled by another cluster
+
+        guild = bot.get_guild(guild_id)
+        if guild is None:
+            logger.error("Could not find guild with ID: %s", guild_id)
+            continue
+
+        logger.info("Connected to guild: %s (ID: %s)", guild.name, guild.id)
+        ensure_chunked(guild)
+
+        # With a checkpointed mark, entries made while the bot was down are backfilled
+        # (below); without one, backfill starts from now
+        resume_from = audit_hwm.get(guild.id)
+        if resume_from is None:
+            advance_hwm(guild.id, discord.utils.time_snowflake(discord.utils.utcnow()))
+
+        snapshot_reported = False
+        try:
+            snapshot_reported = await report_offline_changes(guild)
+        except Exception as e:
+            logger.error("Error comparing guild %s with its snapshot: %s", guild_id, e)
+
+        if bot.intents.members:
+            try:
+                await invite_tracker.seed(guild)
+            except Exception as e:
+                logger.error("Error loading invites for guild %s: %s", guild_id, e)
         
         # Log all text channels for debugging
-        channels = [f"{ch.name} (ID: {ch.id})" for ch in guild.text_channels]
-        logger.info(f"Available text channels: {channels}")
+        if logger.isEnabledFor(logging.DEBUG):
+            channels = [f"{ch.name} (ID: {ch.id})" for ch in guild.text_channels]
+            logger.debug("Available text channels: %s", channels)
         
         # Check for audit channel
-        audit_ch = guild.get_channel(AUDIT_CHANNEL_ID)
+        audit_ch = await get_audit_channel(guild)
         if audit_ch:
-            logger.info(f"Audit channel found: {audit_ch.name} (ID: {audit_ch.id})")
+            logger.info("Audit channel found: %s (ID: %s)", audit_ch.name, audit_ch.id)
         else:
-            logger.warning(f"Audit channel with ID {AUDIT_CHANNEL_ID} not found!")
+            logger.warning("Audit channel with ID %s not found in guild %s!", config.audit_channel_id, guild_id)
         
         # Sync commands for this guild
         try:
-            tree.copy_global_to(guild=guild)
-            await tree.sync(guild=guild)
-            logger.info("Slash commands synced successfully")
+            await sync_commands_if_changed(guild)
         except Exception as e:
-            logger.error(f"Error syncing commands: {e}")
-    else:
-        logger.error(f"Could not find guild with ID: {GUILD_ID}")
-    
-    # Change bot status
-    await bot.change_presence(
-        activity=discord.Game(name="Fulfilling Community Needs"),
-        status=discord.Status.idle
-    )
-    
-    # Send startup test message to audit channel
-    try:
-        audit_ch = guild.get_channel(AUDIT_CHANNEL_ID)
+            logger.error("Error syncing commands for guild %s: %s", guild_id, e)
+        
+        # Send startup test message to audit channel
         if audit_ch:
-            image_embed = discord.Embed()
-            image_embed.set_image(url=AUDIT_IMAGE_URL)
-            
-            text_embed = discord.Embed(
-                color=EMBED_COLOR,
-                timestamp=datetime.now()
-            )
-            
-            text_embed.add_field(
-                name="Community Member:",
-                value="LCSRC Utilities Bot",
-                inline=True
-            )
-            
-            text_embed.add_field(
-                name="Action:",
-                value="Bot started successfully! Audit logging is now active.",
-                inline=True
-            )
-            
-            text_embed.add_field(
-                name="Timestamp:",
-                value=f"<t:{int(datetime.now().timestamp())}>",
-                inline=False
-            )
-            
-            await audit_ch.send(embeds=[image_embed, text_embed])
-            logger.info("Startup test message sent to audit channel!")
+            post_audit(guild, "LCSRC Utilities Bot", "Bot started successfully! Audit logging is now active.", "bot_startup")
+            logger.info("Startup test message queued for guild %s", guild_id)
         else:
             logger.warning("Could not send startup test - audit channel not found!")
-    except Exception as e:
-        logger.error(f"Error sending startup test: {e}")
-    
-    logger.info("Bot is ready!")
+
+        if resume_from is not None:
+            start_backfill([guild], "missed while offline", skip=SNAPSHOT_ACTIONS if snapshot_reported else ())
+
+@bot.event
+async def on_ready():
+    """Bot is ready and connected (fires again after every non-resumed reconnect)"""
+    global first_ready_done
+
+    if first_ready_done:
+        logger.info("Reconnected as %s with a new session, skipping startup work", bot.user)
+        # A new session starts with an empty member cache
+        _chunked_guilds.clear()
+        for guild in bot.guilds:
+            if is_audited(guild) and owns_guild(guild.id):
+                ensure_chunked(guild)
+        # The audit log covers the gap; the snapshots only need to catch up so the
+        # next restart doesn't report the same changes again
+        for guild in bot.guilds:
+            if is_audited(guild) and owns_guild(guild.id):
+                snapshots.replace(guild.id, capture(guild))
+        start_backfill(bot.guilds)
+        return
+    first_ready_done = True
+
+    logger.info("Bot logged in as %s (ID: %s)", bot.user, bot.user.id)
+    await on_first_ready()
+    
+    # Structured fields are picked up by benchmarks/bench_intents.py
+    ready_seconds = time.monotonic() - PROCESS_STARTED
+    rss_kb = current_rss_kb()
+    logger.info(
+        "Bot is ready! (%.2fs after start, rss %d KiB, intents profile %s)",
+        ready_seconds, rss_kb, INTENTS_PROFILE,
+        extra={"ready_seconds": round(ready_seconds, 3), "rss_kb": rss_kb, "intents_profile": INTENTS_PROFILE}
+    )
 
 @bot.event
 async def on_guild_join(guild: discord.Guild):
     """When bot joins a new guild - security check"""
-    if guild.id != GUILD_ID:
-        # Leave any other guild immediately for security
-        logger.warning(f"Bot was invited to wrong guild {guild.id}, leaving...")
+    if not is_audited(guild):
+        # Leave any unconfigured guild immediately for security
+        logger.warning("Bot was invited to unconfigured guild %s, leaving...", guild.id)
         await guild.leave()
         return
     
-    logger.info(f"Joined correct guild: {guild.name}")
+    logger.info("Joined configured guild: %s", guild.name)
+
+    # Commands were removed with the bot, so the stored hash is stale
+    synced = state.get("command_hashes", {})
+    synced.pop(str(guild.id), None)
+    state.set("command_hashes", synced)
+    try:
+        await sync_commands_if_changed(guild)
+    except Exception as e:
+        logger.error("Error syncing commands for guild %s: %s", guild.id, e)
+
+    if bot.intents.members:
+        try:
+            await invite_tracker.seed(guild)
+        except Exception as e:
+            logger.error("Error loading invites for guild %s: %s", guild.id, e)
 
 @bot.event
 async def on_message(message: discord.Message):
     """Log message sent events"""
-    # Only process messages from our target guild
-    if message.guild is None or message.guild.id != GUILD_ID:
+    # Only process messages from configured guilds
+    if not should_audit(message.guild, "message", message.channel, message.author, content=message.content):
         return
     
     # Ignore bot messages to prevent feedback loops
@@ -494,27 +960,18 @@ async def on_message(message: discord.Message):
 @bot.event
 async def on_message_delete(message: discord.Message):
     """Log deleted messages"""
-    logger.info(f"Message delete event triggered for guild: {message.guild.id if message.guild else 'None'}")
-    
-    if message.guild is None or message.guild.id != GUILD_ID:
-        logger.info(f"Ignoring message delete - not our guild")
+    check_keyword_alerts(message, "deleted", "message_delete", message.content)
+    if not should_audit(message.guild, "message_delete", message.channel, message.author, content=message.content):
+        logger.debug("Ignoring message delete - not a configured guild or filtered")
         return
 
     if message.author.bot:
-        logger.info(f"Ignoring bot message delete")
+        logger.debug("Ignoring bot message delete")
         return
 
     try:
-        channel = await get_audit_channel(message.guild)
-        
-        if channel is None:
-            logger.error("Audit channel not found for message delete!")
-            return
-            
-        logger.info(f"Sending message delete log to {channel.name}")
-
         # Get user's nickname
-        member_name = message.author.nick if message.author.nick else message.author.name
+        member_name = getattr(message.author, "nick", None) or message.author.name
         
         # Create detailed action description
         action_text = (
@@ -524,42 +981,20 @@ async def on_message_delete(message: discord.Message):
             f"**Channel:** #{message.channel.name}"
         )
         
-        # Build embeds
-        image_embed = discord.Embed()
-        image_embed.set_image(url=AUDIT_IMAGE_URL)
-        
-        text_embed = discord.Embed(
-            color=EMBED_COLOR,
-            timestamp=datetime.now()
-        )
-        
-        text_embed.add_field(
-            name="Community Member:",
-            value=member_name,
-            inline=True
-        )
-        
-        text_embed.add_field(
-            name="Action:",
-            value=action_text,
-            inline=True
-        )
-        
-        text_embed.add_field(
-            name="Timestamp:",
-            value=f"<t:{int(datetime.now().timestamp())}>",
-            inline=False
-        )
-        
-        await channel.send(embeds=[image_embed, text_embed])
+        # Who deleted it isn't known here (the author or a moderator), so the author is the target
+        post_audit(message.guild, member_name, action_text, "message_delete", channel=message.channel, target=message.author)
+        message_index.add(message.guild.id, message.channel.id, message.author.id, message.id, DELETED, message.content)
         
     except Exception as e:
-        logger.error(f"Error logging message delete: {e}")
+        logger.error("Error logging message delete: %s", e)
 
 @bot.event
 async def on_message_edit(before: discord.Message, after: discord.Message):
     """Log edited messages"""
-    if before.guild is None or before.guild.id != GUILD_ID:
+    # Check both versions: editing a term away is as interesting as adding one
+    if before.content != after.content:
+        check_keyword_alerts(after, "edited", "message_edit", before.content, after.content)
+    if not should_audit(before.guild, "message_edit", before.channel, before.author, content=after.content):
         return
     
     if before.author.bot:
@@ -569,67 +1004,63 @@ async def on_message_edit(before: discord.Message, after: discord.Message):
         return  # No actual edit
     
     try:
-        channel = await get_audit_channel(before.guild)
+        member_name = getattr(before.author, "nick", None) or before.author.name
         
-        member_name = before.author.nick if before.author.nick else before.author.name
+        # One diff serves both the embed and the stored edit history
+        runs = diff_words(before.content or "", after.content or "")
+        edit_history.record(
+            before.id, before.guild.id, before.channel.id, before.author.id,
+            before.content, after.content, runs=runs, created_at=before.created_at.timestamp()
+        )
+        
+        diff = render_runs(runs) if runs is not None else None
+        if diff is not None:
+            changes = f"**Changes:** {diff}\n"
+        else:
+            # Too big or too different to diff within budget: show both, truncated
+            changes = (
+                f"**Before:** {before.content[:500] if before.content else '(No content)'}\n"
+                f"**After:** {after.content[:500] if after.content else '(No content)'}\n"
+            )
         
         action_text = (
             f"A message was **edited** in {before.channel.mention}\n"
-            f"**Before:** {before.content[:500] if before.content else '(No content)'}\n"
-            f"**After:** {after.content[:500] if after.content else '(No content)'}\n"
+            f"{changes}"
             f"**Message ID:** `{before.id}`\n"
             f"**Channel:** #{before.channel.name}"
         )
         
-        image_embed = discord.Embed()
-        image_embed.set_image(url=AUDIT_IMAGE_URL)
-        
-        text_embed = discord.Embed(
-            color=EMBED_COLOR,
-            timestamp=datetime.now()
-        )
-        
-        text_embed.add_field(
-            name="Community Member:",
-            value=member_name,
-            inline=True
-        )
-        
-        text_embed.add_field(
-            name="Action:",
-            value=action_text,
-            inline=True
-        )
-        
-        text_embed.add_field(
-            name="Timestamp:",
-            value=f"<t:{int(datetime.now().timestamp())}>",
-            inline=False
+        post_audit(before.guild, member_name, action_text, "message_edit", before.author, before.channel)
+        message_index.add(
+            before.guild.id, before.channel.id, before.author.id, before.id, EDITED, before.content, after.content
         )
         
-        await channel.send(embeds=[image_embed, text_embed])
-        
     except Exception as e:
-        logger.error(f"Error logging message edit: {e}")
+        logger.error("Error logging message edit: %s", e)
+
+def describe_invite_use(used: list) -> str:
+    """Join log line for the invite(s) a join burst used"""
+    if not used:
+        return "Unknown (vanity URL or an invite the bot can't see)"
+    described = [
+        f"`{use.code}`" + (f" by <@{use.inviter_id}>" if use.inviter_id else "")
+        + (f" ({use.count} uses)" if len(used) > 1 else "")
+        for use in used[:5]
+    ]
+    return described[0] if len(described) == 1 else "one of " + ", ".join(described)
 
 @bot.event
 async def on_member_join(member: discord.Member):
     """Log member join"""
-    logger.info(f"Member join event: {member} in guild {member.guild.id}")
-    
-    if member.guild.id != GUILD_ID:
-        logger.info(f"Ignoring member join - not our guild")
+    if not should_audit(member.guild, "member_join", user=member):
+        logger.debug("Ignoring member join - not a configured guild or filtered")
         return
 
+    ensure_chunked(member.guild)
+
     try:
-        channel = await get_audit_channel(member.guild)
-        
-        if channel is None:
-            logger.error("Audit channel not found for member join!")
-            return
-        
-        logger.info(f"Sending member join log to {channel.name}")
-        
+        # Waits for the join burst's invite refetch (at most INVITE_BURST_WINDOW plus one REST call)
+        used = await invite_tracker.attribute(member.guild)
         member_name = member.nick if member.nick else member.name
         
         action_text = (
@@ -638,47 +1069,23 @@ async def on_member_join(member: discord.Member):
             f"**User ID:** `{member.id}`\n"
             f"**Account Age:** {discord.utils.format_dt(member.created_at, 'R')}"
         )
+        if used is not None:
+            action_text += f"\n**Invite:** {describe_invite_use(used)}"
         
-        image_embed = discord.Embed()
-        image_embed.set_image(url=AUDIT_IMAGE_URL)
-        
-        text_embed = discord.Embed(
-            color=EMBED_COLOR,
-            timestamp=datetime.now()
-        )
-        
-        text_embed.add_field(
-            name="Community Member:",
-            value=member_name,
-            inline=True
-        )
-        
-        text_embed.add_field(
-            name="Action:",
-            value=action_text,
-            inline=True
-        )
-        
-        text_embed.add_field(
-            name="Timestamp:",
-            value=f"<t:{int(datetime.now().timestamp())}>",
-            inline=False
-        )
-        
-        await channel.send(embeds=[image_embed, text_embed])
+        post_audit(member.guild, member_name, action_text, "member_join", member)
         
     except Exception as e:
-        logger.error(f"Error logging member join: {e}")
+        logger.error("Error logging member join: %s", e)
 
 @bot.event
 async def on_member_remove(member: discord.Member):
     """Log member leave/kick - try to determine which via audit log"""
-    if member.guild.id != GUILD_ID:
+    if not should_audit(member.guild, "member_remove", user=member):
         return
     
     try:
         # Give Discord a moment to create the audit log entry
-        await discord.utils.sleep_until(datetime.now() + discord.utils.utcnow().timestamp() + 0.5)
+        await asyncio.sleep(0.5)
         
         # Check audit log for kick
         async for entry in member.guild.audit_logs(limit=10, action=discord.AuditLogAction.kick):
@@ -689,13 +1096,12 @@ async def on_member_remove(member: discord.Member):
                     "member_kick",
                     "Member Kicked",
                     f"**Reason:** {entry.reason if entry.reason else 'No reason provided'}",
-                    entry.user
+                    entry.user,
+                    member
                 )
                 return
         
         # If no kick found, it's a leave
-        channel = await get_audit_channel(member.guild)
-        
         member_name = member.nick if member.nick else member.name
         
         action_text = (
@@ -703,60 +1109,42 @@ async def on_member_remove(member: discord.Member):
             f"**User ID:** `{member.id}`"
         )
         
-        image_embed = discord.Embed()
-        image_embed.set_image(url=AUDIT_IMAGE_URL)
-        
-        text_embed = discord.Embed(
-            color=EMBED_COLOR,
-            timestamp=datetime.now()
-        )
-        
-        text_embed.add_field(
-            name="Community Member:",
-            value=member_name,
-            inline=True
-        )
-        
-        text_embed.add_field(
-            name="Action:",
-            value=action_text,
-            inline=True
-        )
-        
-        text_embed.add_field(
-            name="Timestamp:",
-            value=f"<t:{int(datetime.now().timestamp())}>",
-            inline=False
-        )
-        
-        await channel.send(embeds=[image_embed, text_embed])
+        post_audit(member.guild, member_name, action_text, "member_remove", member)
         
     except Exception as e:
-        logger.error(f"Error logging member remove: {e}")
+        logger.error("Error logging member remove: %s", e)
+
+@bot.event
+async def on_raw_member_remove(payload: discord.RawMemberRemoveEvent):
+    """Fires for uncached members too: retry chunking a guild whose chunk failed"""
+    guild = bot.get_guild(payload.guild_id)
+    if is_audited(guild) and owns_guild(guild.id):
+        ensure_chunked(guild)
 
 @bot.event
 async def on_member_update(before: discord.Member, after: discord.Member):
     """Log member updates (nickname, roles, timeout, etc.)"""
-    logger.info(f"Member update event triggered for {before} (ID: {before.id}) in guild {before.guild.id}")
-    
-    if before.guild.id != GUILD_ID:
-        logger.info(f"Ignoring member update - not our guild")
+    if not should_audit(before.guild, "member_update", user=after):
+        logger.debug("Ignoring member update - not a configured guild or filtered")
         return
 
+    logger.debug("Member update event triggered for %s (ID: %s) in guild %s", before, before.id, before.guild.id)
+    ensure_chunked(before.guild)
+
     changes = []
 
     # Nickname change
     if before.nick != after.nick:
-        logger.info(f"Nickname changed: {before.nick} -> {after.nick}")
+        logger.debug("Nickname changed: %s -> %s", before.nick, after.nick)
         old_nick = before.nick if before.nick else before.name
         new_nick = after.nick if after.nick else after.name
         changes.append(f"**Nickname:** `{old_nick}` → `{new_nick}`")
 
     # Timeout change
-    if before.timeout != after.timeout:
-        logger.info(f"Timeout changed: {before.timeout} -> {after.timeout}")
-        if after.timeout:
-            changes.append(f"**Timeout Set:** Until <t:{int(after.timeout.timestamp())}>")
+    if before.timed_out_until != after.timed_out_until:
+        logger.debug("Timeout changed: %s -> %s", before.timed_out_until, after.timed_out_until)
+        if after.timed_out_until:
+            changes.append(f"**Timeout Set:** Until <t:{int(after.timed_out_until.timestamp())}>")
         else:
             changes.append(f"**Timeout Removed**")
 
@@ -768,12 +1156,12 @@ async def on_member_update(before: discord.Member, after: discord.Member):
     removed_roles = before_roles - after_roles
 
     if added_roles:
-        logger.info(f"Roles added: {[r.name for r in added_roles]}")
+        logger.debug("Roles added: %s", added_roles)
         role_names = ", ".join([r.mention for r in added_roles])
         changes.append(f"**Roles Added:** {role_names}")
 
     if removed_roles:
-        logger.info(f"Roles removed: {[r.name for r in removed_roles]}")
+        logger.debug("Roles removed: %s", removed_roles)
         role_names = ", ".join([r.mention for r in removed_roles])
         changes.append(f"**Roles Removed:** {role_names}")
 
@@ -781,47 +1169,20 @@ async def on_member_update(before: discord.Member, after: discord.Member):
         return
     
     try:
-        channel = await get_audit_channel(before.guild)
-        
         member_name = after.nick if after.nick else after.name
         
         action_text = f"Member profile **updated**\n" + "\n".join(changes)
         
-        image_embed = discord.Embed()
-        image_embed.set_image(url=AUDIT_IMAGE_URL)
-        
-        text_embed = discord.Embed(
-            color=EMBED_COLOR,
-            timestamp=datetime.now()
-        )
-        
-        text_embed.add_field(
-            name="Community Member:",
-            value=member_name,
-            inline=True
-        )
-        
-        text_embed.add_field(
-            name="Action:",
-            value=action_text,
-            inline=True
-        )
-        
-        text_embed.add_field(
-            name="Timestamp:",
-            value=f"<t:{int(datetime.now().timestamp())}>",
-            inline=False
-        )
-        
-        await channel.send(embeds=[image_embed, text_embed])
+        # Changed by a moderator or by themselves (nickname); the actor isn't in the event
+        post_audit(before.guild, member_name, action_text, "member_update", target=after)
         
     except Exception as e:
-        logger.error(f"Error logging member update: {e}")
+        logger.error("Error logging member update: %s", e)
 
 @bot.event
 async def on_guild_update(before: discord.Guild, after: discord.Guild):
     """Log guild updates"""
-    if before.id != GUILD_ID:
+    if not should_audit(before, "guild_update"):
         return
     
     changes = []
@@ -857,50 +1218,21 @@ async def on_guild_update(before: discord.Guild, after: discord.Guild):
         return
     
     try:
-        channel = await get_audit_channel(before)
-        
         action_text = "Server settings **updated**\n" + "\n".join(changes)
         
-        image_embed = discord.Embed()
-        image_embed.set_image(url=AUDIT_IMAGE_URL)
-        
-        text_embed = discord.Embed(
-            color=EMBED_COLOR,
-            timestamp=datetime.now()
-        )
-        
-        text_embed.add_field(
-            name="Community Member:",
-            value="Server Settings",
-            inline=True
-        )
-        
-        text_embed.add_field(
-            name="Action:",
-            value=action_text,
-            inline=True
-        )
-        
-        text_embed.add_field(
-            name="Timestamp:",
-            value=f"<t:{int(datetime.now().timestamp())}>",
-            inline=False
-        )
-        
-        await channel.send(embeds=[image_embed, text_embed])
+        post_audit(after, "Server Settings", action_text, "guild_update")
         
     except Exception as e:
-        logger.error(f"Error logging guild update: {e}")
+        logger.error("Error logging guild update: %s", e)
 
 @bot.event
 async def on_guild_role_create(role: discord.Role):
     """Log role creation"""
-    if role.guild.id != GUILD_ID:
+    snapshots.track(role.guild.id, "roles", role)
+    if not should_audit(role.guild, "role_create", roles=(role.id,)):
         return
     
     try:
-        channel = await get_audit_channel(role.guild)
-        
         action_text = (
             f"A new role was **created**\n"
             f"**Role:** {role.mention}\n"
@@ -908,46 +1240,19 @@ async def on_guild_role_create(role: discord.Role):
             f"**Permissions:** {role.permissions.value}"
         )
         
-        image_embed = discord.Embed()
-        image_embed.set_image(url=AUDIT_IMAGE_URL)
-        
-        text_embed = discord.Embed(
-            color=EMBED_COLOR,
-            timestamp=datetime.now()
-        )
-        
-        text_embed.add_field(
-            name="Community Member:",
-            value="Server Settings",
-            inline=True
-        )
-        
-        text_embed.add_field(
-            name="Action:",
-            value=action_text,
-            inline=True
-        )
-        
-        text_embed.add_field(
-            name="Timestamp:",
-            value=f"<t:{int(datetime.now().timestamp())}>",
-            inline=False
-        )
-        
-        await channel.send(embeds=[image_embed, text_embed])
+        post_audit(role.guild, "Server Settings", action_text, "role_create")
         
     except Exception as e:
-        logger.error(f"Error logging role create: {e}")
+        logger.error("Error logging role create: %s", e)
 
 @bot.event
 async def on_guild_role_delete(role: discord.Role):
     """Log role deletion"""
-    if role.guild.id != GUILD_ID:
+    snapshots.forget(role.guild.id, "roles", role.id)
+    if not should_audit(role.guild, "role_delete", roles=(role.id,)):
         return
     
     try:
-        channel = await get_audit_channel(role.guild)
-        
         action_text = (
             f"A role was **deleted**\n"
             f"**Role Name:** {role.name}\n"
@@ -955,41 +1260,16 @@ async def on_guild_role_delete(role: discord.Role):
             f"**Color:** {role.color}"
         )
         
-        image_embed = discord.Embed()
-        image_embed.set_image(url=AUDIT_IMAGE_URL)
-        
-        text_embed = discord.Embed(
-            color=EMBED_COLOR,
-            timestamp=datetime.now()
-        )
-        
-        text_embed.add_field(
-            name="Community Member:",
-            value="Server Settings",
-            inline=True
-        )
-        
-        text_embed.add_field(
-            name="Action:",
-            value=action_text,
-            inline=True
-        )
-        
-        text_embed.add_field(
-            name="Timestamp:",
-            value=f"<t:{int(datetime.now().timestamp())}>",
-            inline=False
-        )
-        
-        await channel.send(embeds=[image_embed, text_embed])
+        post_audit(role.guild, "Server Settings", action_text, "role_delete")
         
     except Exception as e:
-        logger.error(f"Error logging role delete: {e}")
+        logger.error("Error logging role delete: %s", e)
 
 @bot.event
 async def on_guild_role_update(before: discord.Role, after: discord.Role):
     """Log role updates"""
-    if before.guild.id != GUILD_ID:
+    snapshots.track(after.guild.id, "roles", after)
+    if not should_audit(before.guild, "role_update", roles=(before.id,)):
         return
     
     changes = []
@@ -1013,50 +1293,21 @@ async def on_guild_role_update(before: discord.Role, after: discord.Role):
         return
     
     try:
-        channel = await get_audit_channel(before.guild)
-        
         action_text = f"Role **updated**\n" + "\n".join(changes)
         
-        image_embed = discord.Embed()
-        image_embed.set_image(url=AUDIT_IMAGE_URL)
-        
-        text_embed = discord.Embed(
-            color=EMBED_COLOR,
-            timestamp=datetime.now()
-        )
-        
-        text_embed.add_field(
-            name="Community Member:",
-            value="Server Settings",
-            inline=True
-        )
-        
-        text_embed.add_field(
-            name="Action:",
-            value=action_text,
-            inline=True
-        )
-        
-        text_embed.add_field(
-            name="Timestamp:",
-            value=f"<t:{int(datetime.now().timestamp())}>",
-            inline=False
-        )
-        
-        await channel.send(embeds=[image_embed, text_embed])
+        post_audit(before.guild, "Server Settings", action_text, "role_update")
         
     except Exception as e:
-        logger.error(f"Error logging role update: {e}")
+        logger.error("Error logging role update: %s", e)
 
 @bot.event
 async def on_guild_channel_create(channel: discord.abc.GuildChannel):
     """Log channel creation"""
-    if channel.guild.id != GUILD_ID:
+    snapshots.track(channel.guild.id, "channels", channel)
+    if not should_audit(channel.guild, "channel_create", channel):
         return
     
     try:
-        audit_channel = await get_audit_channel(channel.guild)
-        
         action_text = (
             f"A new channel was **created**\n"
             f"**Channel:** {channel.mention}\n"
@@ -1064,46 +1315,19 @@ async def on_guild_channel_create(channel: discord.abc.GuildChannel):
             f"**Category:** {channel.category.name if channel.category else 'None'}"
         )
         
-        image_embed = discord.Embed()
-        image_embed.set_image(url=AUDIT_IMAGE_URL)
-        
-        text_embed = discord.Embed(
-            color=EMBED_COLOR,
-            timestamp=datetime.now()
-        )
-        
-        text_embed.add_field(
-            name="Community Member:",
-            value="Server Settings",
-            inline=True
-        )
-        
-        text_embed.add_field(
-            name="Action:",
-            value=action_text,
-            inline=True
-        )
-        
-        text_embed.add_field(
-            name="Timestamp:",
-            value=f"<t:{int(datetime.now().timestamp())}>",
-            inline=False
-        )
-        
-        await audit_channel.send(embeds=[image_embed, text_embed])
+        post_audit(channel.guild, "Server Settings", action_text, "channel_create", channel=channel)
         
     except Exception as e:
-        logger.error(f"Error logging channel create: {e}")
+        logger.error("Error logging channel create: %s", e)
 
 @bot.event
 async def on_guild_channel_delete(channel: discord.abc.GuildChannel):
     """Log channel deletion"""
-    if channel.guild.id != GUILD_ID:
+    snapshots.forget(channel.guild.id, "channels", channel.id)
+    if not should_audit(channel.guild, "channel_delete", channel):
         return
     
     try:
-        audit_channel = await get_audit_channel(channel.guild)
-        
         action_text = (
             f"A channel was **deleted**\n"
             f"**Channel Name:** {channel.name}\n"
@@ -1111,41 +1335,16 @@ async def on_guild_channel_delete(channel: discord.abc.GuildChannel):
             f"**Category:** {channel.category.name if channel.category else 'None'}"
         )
         
-        image_embed = discord.Embed()
-        image_embed.set_image(url=AUDIT_IMAGE_URL)
-        
-        text_embed = discord.Embed(
-            color=EMBED_COLOR,
-            timestamp=datetime.now()
-        )
-        
-        text_embed.add_field(
-            name="Community Member:",
-            value="Server Settings",
-            inline=True
-        )
-        
-        text_embed.add_field(
-            name="Action:",
-            value=action_text,
-            inline=True
-        )
-        
-        text_embed.add_field(
-            name="Timestamp:",
-            value=f"<t:{int(datetime.now().timestamp())}>",
-            inline=False
-        )
-        
-        await audit_channel.send(embeds=[image_embed, text_embed])
+        post_audit(channel.guild, "Server Settings", action_text, "channel_delete", channel=channel)
         
     except Exception as e:
-        logger.error(f"Error logging channel delete: {e}")
+        logger.error("Error logging channel delete: %s", e)
 
 @bot.event
 async def on_guild_channel_update(before: discord.abc.GuildChannel, after: discord.abc.GuildChannel):
     """Log channel updates"""
-    if before.guild.id != GUILD_ID:
+    snapshots.track(after.guild.id, "channels", after)
+    if not should_audit(before.guild, "channel_update", after):
         return
     
     changes = []
@@ -1174,50 +1373,135 @@ async def on_guild_channel_update(before: discord.abc.GuildChannel, after: disco
         return
     
     try:
-        audit_channel = await get_audit_channel(before.guild)
-        
         action_text = f"Channel **updated**\n" + "\n".join(changes)
         
-        image_embed = discord.Embed()
-        image_embed.set_image(url=AUDIT_IMAGE_URL)
-        
-        text_embed = discord.Embed(
-            color=EMBED_COLOR,
-            timestamp=datetime.now()
-        )
-        
-        text_embed.add_field(
-            name="Community Member:",
-            value="Server Settings",
-            inline=True
-        )
+        post_audit(before.guild, "Server Settings", action_text, "channel_update", channel=after)
         
-        text_embed.add_field(
-            name="Action:",
-            value=action_text,
-            inline=True
+    except Exception as e:
+        logger.error("Error logging channel update: %s", e)
+
+async def find_audit_actor(guild: discord.Guild, action: discord.AuditLogAction, target_id: int):
+    """Who made a change, from the newest matching audit log entries (None if not found)"""
+    # Give Discord a moment to create the audit log entry
+    await asyncio.sleep(0.5)
+    async for entry in guild.audit_logs(limit=5, action=action):
+        if entry.target is not None and entry.target.id == target_id:
+            return entry.user
+    return None
+
+@bot.event
+async def on_thread_create(thread: discord.Thread):
+    """Log thread creation"""
+    if not should_audit(thread.guild, "thread_create", thread, thread.owner):
+        return
+
+    try:
+        action_text = (
+            f"A thread was **created**\n"
+            f"**Thread:** {thread.mention} (`{thread.name}`)\n"
+            f"**Parent:** <#{thread.parent_id}>\n"
+            f"**Owner:** <@{thread.owner_id}>"
         )
-        
-        text_embed.add_field(
-            name="Timestamp:",
-            value=f"<t:{int(datetime.now().timestamp())}>",
-            inline=False
+        owner_name = (getattr(thread.owner, "nick", None) or thread.owner.name) if thread.owner else "Unknown"
+
+        post_audit(thread.guild, owner_name, action_text, "thread_create", thread.owner, thread)
+
+    except Exception as e:
+        logger.error("Error logging thread create: %s", e)
+
+@bot.event
+async def on_raw_thread_delete(payload: discord.RawThreadDeleteEvent):
+    """Log thread deletion immediately (raw, so uncached threads are covered too)"""
+    guild = bot.get_guild(payload.guild_id)
+    thread_activity.forget(payload.guild_id, payload.thread_id)
+    thread = payload.thread
+    if thread is None and guild is not None:
+        # Stand-in with the parent's IDs, so the parent channel and category filter rules still apply
+        parent = guild.get_channel(payload.parent_id)
+        thread_target = SimpleNamespace(id=payload.thread_id, parent_id=payload.parent_id,
+                                        category_id=getattr(parent, "category_id", None))
+    else:
+        thread_target = thread
+    if not should_audit(guild, "thread_delete", thread_target):
+        return
+
+    try:
+        actor = await find_audit_actor(guild, discord.AuditLogAction.thread_delete, payload.thread_id)
+        action_text = (
+            f"A thread was **deleted**\n"
+            f"**Thread Name:** {f'`{thread.name}`' if thread else f'Unknown (ID: `{payload.thread_id}`)'}\n"
+            f"**Parent:** <#{payload.parent_id}>"
         )
-        
-        await audit_channel.send(embeds=[image_embed, text_embed])
-        
+        actor_name = (getattr(actor, "nick", None) or actor.name) if actor else "Unknown"
+
+        post_audit(guild, actor_name, action_text, "thread_delete", actor, thread_target)
+
+    except Exception as e:
+        logger.error("Error logging thread delete: %s", e)
+
+@bot.event
+async def on_thread_update(before: discord.Thread, after: discord.Thread):
+    """Log thread edits and locks immediately; archive toggles go to the periodic summary"""
+    if not should_audit(after.guild, "thread_update", after):
+        return
+
+    changes = []
+    if before.locked != after.locked:
+        changes.append(f"**Locked:** {before.locked} → {after.locked}")
+    if before.name != after.name:
+        changes.append(f"**Name:** `{before.name}` → `{after.name}`")
+    if before.slowmode_delay != after.slowmode_delay:
+        changes.append(f"**Slowmode:** {before.slowmode_delay}s → {after.slowmode_delay}s")
+    if before.auto_archive_duration != after.auto_archive_duration:
+        changes.append(f"**Auto Archive:** {before.auto_archive_duration}m → {after.auto_archive_duration}m")
+    if before.invitable != after.invitable:
+        changes.append(f"**Invitable:** {before.invitable} → {after.invitable}")
+
+    if before.archived != after.archived:
+        if changes:
+            # Archived together with a lock or edit: part of that entry, not churn
+            changes.append(f"**Archived:** {before.archived} → {after.archived}")
+        else:
+            thread_activity.archive_toggle(after.guild.id, after.id, after.name, after.archived,
+                                           after.archived and is_auto_archive(after))
+            return
+    if not changes:
+        return
+
+    try:
+        actor = None
+        if before.locked != after.locked:
+            actor = await find_audit_actor(after.guild, discord.AuditLogAction.thread_update, after.id)
+        action_text = f"Thread {after.mention} **updated**\n" + "\n".join(changes)
+        actor_name = (getattr(actor, "nick", None) or actor.name) if actor else "Server Settings"
+
+        post_audit(after.guild, actor_name, action_text, "thread_update", actor, after)
+
     except Exception as e:
-        logger.error(f"Error logging channel update: {e}")
+        logger.error("Error logging thread update: %s", e)
+
+@bot.event
+async def on_thread_member_join(member: discord.ThreadMember):
+    """Counted for the periodic thread summary"""
+    thread = member.thread
+    if should_audit(thread.guild, "thread_member", thread):
+        thread_activity.member_change(thread.guild.id, thread.id, thread.name, True)
+
+@bot.event
+async def on_thread_member_remove(member: discord.ThreadMember):
+    """Counted for the periodic thread summary"""
+    thread = member.thread
+    if should_audit(thread.guild, "thread_member", thread):
+        thread_activity.member_change(thread.guild.id, thread.id, thread.name, False)
 
 @bot.event
 async def on_invite_create(invite: discord.Invite):
     """Log invite creation"""
-    if invite.guild is None or invite.guild.id != GUILD_ID:
+    invite_tracker.created(invite)
+    if not should_audit(invite.guild, "invite_create", invite.channel, invite.inviter):
         return
     
     try:
-        channel = await get_audit_channel(invite.guild)
-        
         action_text = (
             f"A new invite was **created**\n"
             f"**Code:** `{invite.code}`\n"
@@ -1227,43 +1511,22 @@ async def on_invite_create(invite: discord.Invite):
             f"**Temporary:** {invite.temporary}"
         )
         
-        image_embed = discord.Embed()
-        image_embed.set_image(url=AUDIT_IMAGE_URL)
+        inviter_name = (getattr(invite.inviter, "nick", None) or invite.inviter.name) if invite.inviter else "Unknown"
         
-        text_embed = discord.Embed(
-            color=EMBED_COLOR,
-            timestamp=datetime.now()
-        )
-        
-        inviter_name = invite.inviter.nick if invite.inviter.nick else invite.inviter.name if invite.inviter else "Unknown"
-        
-        text_embed.add_field(
-            name="Community Member:",
-            value=inviter_name,
-            inline=True
-        )
-        
-        text_embed.add_field(
-            name="Action:",
-            value=action_text,
-            inline=True
-        )
-        
-        text_embed.add_field(
-            name="Timestamp:",
-            value=f"<t:{int(datetime.now().timestamp())}>",
-            inline=False
-        )
-        
-        await channel.send(embeds=[image_embed, text_embed])
+        post_audit(invite.guild, inviter_name, action_text, "invite_create", invite.inviter, invite.channel)
         
     except Exception as e:
-        logger.error(f"Error logging invite create: {e}")
+        logger.error("Error logging invite create: %s", e)
+
+@bot.event
+async def on_invite_delete(invite: discord.Invite):
+    """Keep the invite cache current (the deletion itself is logged from the audit log entry)"""
+    invite_tracker.deleted(invite)
 
 @bot.event
 async def on_webhook_update(channel: discord.TextChannel):
     """Log webhook updates"""
-    if channel.guild.id != GUILD_ID:
+    if not should_audit(channel.guild, "webhook_update", channel):
         return
     
     try:
@@ -1273,12 +1536,13 @@ async def on_webhook_update(channel: discord.TextChannel):
                 await log_audit_entry(channel.guild, entry)
                 return
     except Exception as e:
-        logger.error(f"Error logging webhook update: {e}")
+        logger.error("Error logging webhook update: %s", e)
 
 @bot.event
 async def on_guild_emojis_update(guild: discord.Guild, before: list, after: list):
     """Log emoji updates"""
-    if guild.id != GUILD_ID:
+    snapshots.track_all(guild.id, "emojis", after)
+    if not should_audit(guild, "emoji_update"):
         return
     
     try:
@@ -1286,8 +1550,6 @@ async def on_guild_emojis_update(guild: discord.Guild, before: list, after: list
         removed = [e for e in before if e not in after]
         
         for emoji in added:
-            channel = await get_audit_channel(guild)
-            
             action_text = (
                 f"A new emoji was **added**\n"
                 f"**Emoji:** {emoji}\n"
@@ -1295,78 +1557,25 @@ async def on_guild_emojis_update(guild: discord.Guild, before: list, after: list
                 f"**Animated:** {emoji.animated}"
             )
             
-            image_embed = discord.Embed()
-            image_embed.set_image(url=AUDIT_IMAGE_URL)
-            
-            text_embed = discord.Embed(
-                color=EMBED_COLOR,
-                timestamp=datetime.now()
-            )
-            
-            text_embed.add_field(
-                name="Community Member:",
-                value="Server Settings",
-                inline=True
-            )
-            
-            text_embed.add_field(
-                name="Action:",
-                value=action_text,
-                inline=True
-            )
-            
-            text_embed.add_field(
-                name="Timestamp:",
-                value=f"<t:{int(datetime.now().timestamp())}>",
-                inline=False
-            )
-            
-            await channel.send(embeds=[image_embed, text_embed])
+            post_audit(guild, "Server Settings", action_text, "emoji_create")
         
         for emoji in removed:
-            channel = await get_audit_channel(guild)
-            
             action_text = (
                 f"An emoji was **removed**\n"
                 f"**Name:** {emoji.name}\n"
                 f"**Animated:** {emoji.animated}"
             )
             
-            image_embed = discord.Embed()
-            image_embed.set_image(url=AUDIT_IMAGE_URL)
-            
-            text_embed = discord.Embed(
-                color=EMBED_COLOR,
-                timestamp=datetime.now()
-            )
-            
-            text_embed.add_field(
-                name="Community Member:",
-                value="Server Settings",
-                inline=True
-            )
-            
-            text_embed.add_field(
-                name="Action:",
-                value=action_text,
-                inline=True
-            )
-            
-            text_embed.add_field(
-                name="Timestamp:",
-                value=f"<t:{int(datetime.now().timestamp())}>",
-                inline=False
-            )
-            
-            await channel.send(embeds=[image_embed, text_embed])
+            post_audit(guild, "Server Settings", action_text, "emoji_delete")
         
     except Exception as e:
-        logger.error(f"Error logging emoji update: {e}")
+        logger.error("Error logging emoji update: %s", e)
 
 @bot.event
 async def on_guild_stickers_update(guild: discord.Guild, before: list, after: list):
     """Log sticker updates"""
-    if guild.id != GUILD_ID:
+    snapshots.track_all(guild.id, "stickers", after)
+    if not should_audit(guild, "sticker_update"):
         return
     
     try:
@@ -1374,80 +1583,322 @@ async def on_guild_stickers_update(guild: discord.Guild, before: list, after: li
         removed = [s for s in before if s not in after]
         
         for sticker in added:
-            channel = await get_audit_channel(guild)
-            
             action_text = (
                 f"A new sticker was **added**\n"
                 f"**Name:** {sticker.name}\n"
                 f"**Format:** {sticker.format}"
             )
             
-            image_embed = discord.Embed()
-            image_embed.set_image(url=AUDIT_IMAGE_URL)
-            
-            text_embed = discord.Embed(
-                color=EMBED_COLOR,
-                timestamp=datetime.now()
-            )
-            
-            text_embed.add_field(
-                name="Community Member:",
-                value="Server Settings",
-                inline=True
-            )
-            
-            text_embed.add_field(
-                name="Action:",
-                value=action_text,
-                inline=True
-            )
-            
-            text_embed.add_field(
-                name="Timestamp:",
-                value=f"<t:{int(datetime.now().timestamp())}>",
-                inline=False
-            )
-            
-            await channel.send(embeds=[image_embed, text_embed])
+            post_audit(guild, "Server Settings", action_text, "sticker_create")
         
         for sticker in removed:
-            channel = await get_audit_channel(guild)
-            
             action_text = (
                 f"A sticker was **removed**\n"
                 f"**Name:** {sticker.name}"
             )
             
-            image_embed = discord.Embed()
-            image_embed.set_image(url=AUDIT_IMAGE_URL)
-            
-            text_embed = discord.Embed(
-                color=EMBED_COLOR,
-                timestamp=datetime.now()
-            )
-            
-            text_embed.add_field(
-                name="Community Member:",
-                value="Server Settings",
-                inline=True
-            )
-            
-            text_embed.add_field(
-                name="Action:",
-                value=action_text,
-                inline=True
-            )
-            
-            text_embed.add_field(
-                name="Timestamp:",
-                value=f"<t:{int(datetime.now().timestamp())}>",
-                inline=False
-            )
-            
-            await channel.send(embeds=[image_embed, text_embed])
+            post_audit(guild, "Server Settings", action_text, "sticker_delete")
         
     except Exception as e:
-        logger.error(f"Error logging sticker update: {e}")
+        logger.error("Error logging sticker update: %s", e)
+
+@bot.event
+async def on_voice_state_update(member: discord.Member, before: discord.VoiceState, after: discord.VoiceState):
+    """Fold voice changes into the member's session; voice_session_flusher posts the summaries"""
+    if not should_audit(member.guild, "voice_session", after.channel or before.channel, member):
+        return
+    voice_sessions.update(member.guild.id, member.id, getattr(member, "nick", None) or member.name, before, after)
+
+@bot.event
+async def on_shard_ready(shard_id: int):
+    """Record per-shard startup time (sharded mode only)"""
+    startup = time.monotonic() - PROCESS_STARTED
+    if shard_id in shard_ready_times:
+        # A later READY means the shard reconnected without resuming
+        logger.info("Shard %s reconnected with a new session", shard_id)
+        start_backfill([guild for guild in bot.guilds if guild.shard_id == shard_id])
+        return
+    shard_ready_times[shard_id] = startup
+    logger.info("Shard %s ready after %.2fs (cluster %s)", shard_id, startup, CLUSTER_ID)
+
+@bot.event
+async def setup_hook():
+    """Start background tasks once the bot has a running loop"""
+    if shard_store is not None:
+        bot.loop.create_task(shard_status_reporter())
+    bot.loop.create_task(store_flusher())
+    bot.loop.create_task(message_index_flusher())
+    if bot.intents.voice_states:
+        bot.loop.create_task(voice_session_flusher())
+    bot.loop.create_task(thread_summary_flusher())
+    if AUDIT_STORE_ENABLED:
+        bot.loop.create_task(audit_store_maintainer())
+
+# ============== SHARD STATUS REPORTING ==============
+# {shard_id: seconds from process start to first ready}
+shard_ready_times = {}
+
+def shard_status_rows() -> list:
+    """Snapshot of this process's shards for the shared status store"""
+    rss_kb = current_rss_kb()
+    guild_counts = {}
+    for guild in bot.guilds:
+        guild_counts[guild.shard_id] = guild_counts.get(guild.shard_id, 0) + 1
+
+    rows = []
+    for shard_id in SHARD_IDS or sorted(bot.shards):
+        info = bot.get_shard(shard_id)
+        if shard_id not in shard_ready_times:
+            status = "starting"
+        elif info is None or info.is_closed():
+            status = "disconnected"
+        else:
+            status = "ready"
+        latency = info.latency * 1000 if info is not None and math.isfinite(info.latency) else None
+        rows.append({
+            "shard_id": shard_id,
+            "cluster_id": CLUSTER_ID,
+            "status": status,
+            "latency_ms": latency,
+            "guilds": guild_counts.get(shard_id, 0),
+            "rss_kb": rss_kb,
+            "startup_seconds": shard_ready_times.get(shard_id),
+        })
+    return rows
+
+async def shard_status_reporter():
+    """Periodically write this process's shard rows to the shared store"""
+    while not bot.is_closed():
+        try:
+            await asyncio.to_thread(shard_store.report, shard_status_rows())
+        except Exception as e:
+            logger.error("Error reporting shard status: %s", e)
+        await asyncio.sleep(SHARD_REPORT_INTERVAL)
+
+# ============== GUILD SNAPSHOTS ==============
+async def store_flusher():
+    """Periodically write changed guild snapshots and the audit rollups"""
+    while not bot.is_closed():
+        await asyncio.sleep(SNAPSHOT_FLUSH_INTERVAL)
+        try:
+            await asyncio.to_thread(snapshots.flush)
+            await asyncio.to_thread(rollups.save)
+        except Exception as e:
+            logger.error("Error saving guild snapshots or rollups: %s", e)
+
+async def audit_store_maintainer():
+    """Compact finished days and drop expired ones in the local audit store"""
+    while not bot.is_closed():
+        try:
+            await asyncio.to_thread(audit_store.maintain, time.time())
+        except Exception as e:
+            logger.error("Error maintaining audit store: %s", e)
+        await asyncio.sleep(STORE_MAINTENANCE_INTERVAL)
+
+async def message_index_flusher():
+    """Batch queued message rows into the full-text index; prune past retention hourly"""
+    last_prune = 0.0
+    while not bot.is_closed():
+        await asyncio.sleep(MESSAGE_INDEX_FLUSH_INTERVAL)
+        try:
+            await asyncio.to_thread(message_index.write, message_index.take_pending())
+            if AUDIT_RETENTION_DAYS and time.monotonic() - last_prune > STORE_MAINTENANCE_INTERVAL:
+                last_prune = time.monotonic()
+                await asyncio.to_thread(message_index.prune, time.time() - AUDIT_RETENTION_DAYS * 86400)
+        except Exception as e:
+            logger.error("Error updating message index: %s", e)
+
+# ============== VOICE SESSIONS ==============
+def format_duration(seconds: float) -> str:
+    """1h 05m / 4m 12s / 9s"""
+    seconds = int(seconds)
+    if seconds >= 3600:
+        return f"{seconds // 3600}h {seconds % 3600 // 60:02d}m"
+    if seconds >= 60:
+        return f"{seconds // 60}m {seconds % 60:02d}s"
+    return f"{seconds}s"
+
+def format_voice_actions(session) -> str:
+    """A session's moderator mute/deafen actions on one line"""
+    actions = ", ".join(f"{description} <t:{int(when)}:T>" for when, description in session.actions)
+    if session.extra_actions:
+        actions += f" (+{session.extra_actions} more)"
+    return actions
+
+def post_voice_log(item: tuple):
+    """Publish one take_logs() item: a session summary or a collapsed mass move/leave"""
+    guild = bot.get_guild(item[1].guild_id if item[0] == SESSION else item[1])
+    if guild is None:
+        return
+    if item[0] == SESSION:
+        session = item[1]
+        channels = " → ".join(f"<#{channel_id}>" for channel_id in session.channels)
+        if session.extra_channels:
+            channels += f" (+{session.extra_channels} more)"
+        action_text = (
+            f"A voice session **ended**\n"
+            f"**Duration:** {format_duration(session.duration)}"
+            f"{'' if session.seen_join else ' (joined before tracking started)'}\n"
+            f"**Channels:** {channels}"
+        )
+        if session.moves:
+            action_text += f"\n**Moves:** {session.moves}"
+        if session.actions:
+            action_text += f"\n**Moderator Actions:** {format_voice_actions(session)}"
+        if session.self_mutes:
+            action_text += f"\n**Self Mutes:** {session.self_mutes}"
+        post_audit(guild, session.member_name, action_text, "voice_session",
+                   discord.Object(id=session.member_id), discord.Object(id=session.channels[0]))
+    elif item[0] == MASS_MOVE:
+        _, _, from_channel, to_channel, member_ids = item
+        action_text = (
+            f"**{len(member_ids)} members** were moved from <#{from_channel}> to <#{to_channel}>\n"
+            f"**Members:** {' '.join(f'<@{member_id}>' for member_id in member_ids[:40])}"
+            f"{f' (+{len(member_ids) - 40} more)' if len(member_ids) > 40 else ''}"
+        )
+        post_audit(guild, "Voice", action_text, "voice_mass_move", channel=discord.Object(id=from_channel))
+    elif item[0] == MASS_LEAVE:
+        _, _, channel_id, sessions = item
+        total = sum(session.duration for session in sessions)
+        action_text = (
+            f"**{len(sessions)} members** left <#{channel_id}> together\n"
+            f"**Average Session:** {format_duration(total / len(sessions))}\n"
+            f"**Members:** {' '.join(f'<@{session.member_id}>' for session in sessions[:40])}"
+            f"{f' (+{len(sessions) - 40} more)' if len(sessions) > 40 else ''}"
+        )
+        # Moderator actions are the part of a session that matters; keep them per member
+        actioned = [session for session in sessions if session.actions]
+        if actioned:
+            action_text += "\n**Moderator Actions:**\n" + "\n".join(
+                f"<@{session.member_id}>: {format_voice_actions(session)}" for session in actioned[:20]
+            )
+            if len(actioned) > 20:
+                action_text += f"\n(+{len(actioned) - 20} more members with moderator actions)"
+        post_audit(guild, "Voice", action_text, "voice_mass_leave", channel=discord.Object(id=channel_id))
+
+async def voice_session_flusher():
+    """Post summaries for ended sessions once their move/leave group window has closed"""
+    while not bot.is_closed():
+        await asyncio.sleep(VOICE_FLUSH_INTERVAL)
+        for item in voice_sessions.take_logs():
+            try:
+                post_voice_log(item)
+            except Exception as e:
+                logger.error("Error logging voice session: %s", e)
+
+# ============== THREAD SUMMARIES ==============
+# When the counters now in thread_activity started
+thread_summary_since = time.time()
+
+def post_thread_summaries():
+    """One summary per guild of the archive toggles and member changes counted since the last call"""
+    global thread_summary_since
+    minutes = (time.time() - thread_summary_since) / 60
+    thread_summary_since = time.time()
+    for guild_id, churn in thread_activity.take().items():
+        guild = bot.get_guild(guild_id)
+        if guild is None:
+            continue
+        totals = churn.totals
+        lines = [f"Thread activity in the last **{max(minutes, 1):.0f}m**"]
+        if totals.archived or totals.unarchived:
+            lines.append(f"**Archived:** {totals.archived} ({totals.auto_archived} automatically) · "
+                         f"**Unarchived:** {totals.unarchived}")
+        if totals.joined or totals.left:
+            lines.append(f"**Thread Members:** +{totals.joined} / -{totals.left}")
+        busiest = []
+        for thread_id, thread in churn.busiest(10):
+            parts = []
+            if thread.archived or thread.unarchived:
+                parts.append(f"archived ×{thread.archived}, unarchived ×{thread.unarchived} "
+                             f"({'archived' if thread.is_archived else 'open'})")
+            if thread.joined or thread.left:
+                parts.append(f"+{thread.joined}/-{thread.left} members")
+            busiest.append(f"<#{thread_id}>: {'; '.join(parts)}")
+        if busiest:
+            lines.append("**Busiest:**\n" + "\n".join(busiest))
+        if len(churn.threads) > len(busiest):
+            lines.append(f"...and {len(churn.threads) - len(busiest)} more thread(s)")
+        post_audit(guild, "Threads", "\n".join(lines), "thread_activity")
+
+async def thread_summary_flusher():
+    """Post the coalesced thread churn every THREAD_SUMMARY_INTERVAL"""
+    while not bot.is_closed():
+        await asyncio.sleep(THREAD_SUMMARY_INTERVAL)
+        try:
+            post_thread_summaries()
+        except Exception as e:
+            logger.error("Error posting thread summaries: %s", e)
+
+# ============== RECONNECT BACKFILL ==============
+# {guild_id: task} so overlapping READYs (bot and shard) backfill a guild once
+_backfill_tasks = {}
+
+@bot.event
+async def on_audit_log_entry_create(entry: discord.AuditLogEntry):
+    """Live entries are posted by the specific handlers; only move the high-water mark"""
+    if is_audited(entry.guild):
+        advance_hwm(entry.guild.id, entry.id)
+
+# Role, channel, emoji and sticker changes: the structure snapshot diff reports these after a restart
+SNAPSHOT_ACTIONS = frozenset(
+    getattr(discord.AuditLogAction, f"{kind}_{change}")
+    for kind in ("role", "channel", "emoji", "sticker")
+    for change in ("create", "delete", "update")
+    if hasattr(discord.AuditLogAction, f"{kind}_{change}")
+)
+
+def start_backfill(guilds: list, reason: str = "reconnect backfill", skip=()):
+    """Backfill each audited guild from its high-water mark (after a restart or a non-resumed reconnect).
+
+    Entries whose action is in `skip` are left out of the Discord posts.
+    """
+    until = discord.utils.time_snowflake(discord.utils.utcnow())
+    for guild in guilds:
+        if not is_audited(guild) or guild.id not in audit_hwm:
+            continue
+        task = _backfill_tasks.get(guild.id)
+        if task is not None and not task.done():
+            continue
+        # Snapshot the mark now: live entries after READY move it past the gap
+        _backfill_tasks[guild.id] = bot.loop.create_task(backfill_guild(guild, audit_hwm[guild.id], until, reason, skip))
+
+async def backfill_guild(guild: discord.Guild, after: int, until: int, reason: str = "reconnect backfill", skip=()):
+    """Post audit entries between the high-water mark and `until`, oldest first.
+
+    Discord gets one combined post per BACKFILL_BATCH entries; every other sink
+    gets each entry as its own event, with its real action, actor and target.
+    """
+    pipeline = dispatcher.pipeline(guild.id)
+    batch = []
+    seen = 0
+
+    async def flush():
+        # Leave room in the guild's queue for live events rather than crowding them out
+        while pipeline.queue.qsize() >= pipeline.queue_size // 2:
+            await asyncio.sleep(1)
+        post_audit(guild, f"Audit Log ({reason})", "\n\n".join(batch), "audit_backfill",
+                   exclude=tuple(sink.name for sink in audit_sinks.sinks if sink.name != "discord"))
+        batch.clear()
+
+    try:
+        async for entry in guild.audit_logs(
+            limit=BACKFILL_MAX_ENTRIES, after=discord.Object(after), before=discord.Object(until), oldest_first=True
+        ):
+            seen += 1
+            await log_audit_entry(guild, entry, batch, skip)
+            if len(batch) >= BACKFILL_BATCH:
+                await flush()
+        if batch:
+            await flush()
+        if seen:
+            logger.info("Backfilled %d audit log entries for guild %s (%s)", seen, guild.id, reason)
+        if seen >= BACKFILL_MAX_ENTRIES:
+            logger.warning("Backfill for guild %s stopped at %d entries", guild.id, BACKFILL_MAX_ENTRIES)
+    except discord.Forbidden:
+        logger.warning("Missing View Audit Log in guild %s, cannot backfill", guild.id)
+    except Exception as e:
+        logger.error("Error backfilling audit log for guild %s: %s", guild.id, e)
 
 # ============== BACKGROUND TASK FOR AUDIT LOG CHECKING ==============
 async def audit_log_checker():
@@ -1456,22 +1907,30 @@ async def audit_log_checker():
     
     while not bot.is_closed():
         try:
-            guild = bot.get_guild(GUILD_ID)
-            if guild:
-                # Check recent audit log entries
-                async for entry in guild.audit_logs(limit=20):
-                    # This is a fallback - most actions should be caught by events
-                    # Only log if not already handled (you could add tracking here)
-                    pass
+            for guild_id in GUILD_CONFIGS:
+                guild = bot.get_guild(guild_id)
+                if guild:
+                    # Check recent audit log entries
+                    async for entry in guild.audit_logs(limit=20):
+                        # This is a fallback - most actions should be caught by events
+                        # Only log if not already handled (you could add tracking here)
+                        pass
         except Exception as e:
-            logger.error(f"Error in audit log checker: {e}")
+            logger.error("Error in audit log checker: %s", e)
         
-        await discord.utils.sleep_until(discord.utils.utcnow() + 5)  # Check every 5 seconds
+        await asyncio.sleep(5)  # Check every 5 seconds
 
 # ============== SLASH COMMANDS ==============
-@tree.command(name="auditstatus", description="Check the audit logger status", guild=discord.Object(id=GUILD_ID))
+# Commands are registered globally and copied to each configured guild in on_ready
+@tree.command(name="auditstatus", description="Check the audit logger status")
 async def audit_status(interaction: discord.Interaction):
     """Check if the audit logger is running"""
+    config = GUILD_CONFIGS.get(interaction.guild_id)
+    if config is None:
+        await interaction.response.send_message("❌ This server is not configured for audit logging.", ephemeral=True)
+        return
+
+    stats = dispatcher.pipeline(config.guild_id).stats()
     await interaction.response.send_message(
         embed=discord.Embed(
             title="LCSRC Utilities - Audit Logger",
@@ -1479,17 +1938,218 @@ async def audit_status(interaction: discord.Interaction):
             color=EMBED_COLOR
         ).add_field(
             name="Guild ID",
-            value=str(GUILD_ID),
+            value=str(config.guild_id),
             inline=True
         ).add_field(
             name="Audit Channel",
-            value=AUDIT_CHANNEL_NAME,
+            value=config.audit_channel_name or str(config.audit_channel_id),
             inline=True
+        ).add_field(
+            name="Queue",
+            value=f"{stats['queued']} queued | {stats['sent']} sent | {stats['dropped']} dropped | {stats['urgent']} alerts",
+            inline=False
+        ).add_field(
+            name="Sinks",
+            value="\n".join(
+                f"**{name}:** {s['written']} written | {s['queued']} queued | {s['dropped']} dropped | {s['failed']} failed"
+                for name, s in audit_sinks.stats().items()
+            ),
+            inline=False
         ),
         ephemeral=True
     )
 
-@tree.command(name="ping", description="Check bot latency", guild=discord.Object(id=GUILD_ID))
+@tree.command(name="audithistory", description="Show every recorded version of an edited message")
+@app_commands.describe(message_id="ID of the edited message")
+@app_commands.default_permissions(manage_messages=True)
+async def audit_history(interaction: discord.Interaction, message_id: str):
+    """Rebuild a message's versions from its stored edit history"""
+    history = edit_history.get(int(message_id)) if message_id.isdigit() else None
+    if history is None or history.guild_id != interaction.guild_id:
+        await interaction.response.send_message("❌ No edit history recorded for that message.", ephemeral=True)
+        return
+
+    embed = discord.Embed(
+        title="Edit History",
+        description=f"Message `{history.message_id}` by <@{history.author_id}> in <#{history.channel_id}>",
+        color=EMBED_COLOR
+    )
+    timeline = history.timeline()
+    if history.first_version:
+        embed.set_footer(text=f"Versions before v{history.first_version} were dropped to save memory")
+    # Newest versions matter most; an embed holds at most 25 fields and 6000 characters
+    shown = timeline[-25:]
+    limit = min(900, 4500 // len(shown))
+    for number, timestamp, text in shown:
+        label = "Original" if number == 0 else f"Edit {number}"
+        embed.add_field(
+            name=f"v{number} · {label}",
+            value=f"<t:{int(timestamp)}:R>\n{text[:limit] if text else '(No content)'}",
+            inline=False
+        )
+    await interaction.response.send_message(embed=embed, ephemeral=True)
+
+@tree.command(name="auditstats", description="Audit event counts by action, actor and channel")
+@app_commands.describe(window="Time window", action="Only count this action type (e.g. member_ban)")
+@app_commands.choices(window=[app_commands.Choice(name=name, value=name) for name in WINDOWS])
+@app_commands.default_permissions(manage_guild=True)
+async def audit_stats(interaction: discord.Interaction, window: str = "7d", action: str = None):
+    """Answer from the rolling counters; no history is scanned"""
+    if not is_audited(interaction.guild):
+        await interaction.response.send_message("❌ This server is not configured for audit logging.", ephemeral=True)
+        return
+
+    count, actors, channels, actions = rollups.query(interaction.guild_id, window, action or ALL)
+    embed = discord.Embed(
+        title="Audit Stats",
+        description=f"**{count}** {f'`{action}` ' if action else ''}event(s) in the last **{window}**",
+        color=EMBED_COLOR
+    )
+    if not action:
+        embed.add_field(
+            name="By Action",
+            value="\n".join(f"`{name}`: {n}" for name, n in actions) or "None",
+            inline=False
+        )
+    embed.add_field(name="Top Actors", value="\n".join(f"<@{user_id}>: {n}" for user_id, n in actors) or "None", inline=True)
+    embed.add_field(name="Top Channels", value="\n".join(f"<#{channel_id}>: {n}" for channel_id, n in channels) or "None", inline=True)
+    await interaction.response.send_message(embed=embed, ephemeral=True)
+
+def parse_export_date(value: str) -> float:
+    """YYYY-MM-DD (UTC) to a timestamp"""
+    return datetime.strptime(value, "%Y-%m-%d").replace(tzinfo=timezone.utc).timestamp()
+
+@tree.command(name="auditexport", description="Export stored audit events as a compressed CSV or JSONL file")
+@app_commands.describe(
+    since="First day to include, YYYY-MM-DD (default: 7 days ago)",
+    until="Last day to include, YYYY-MM-DD (default: today)",
+    user="Only events by this member",
+    action="Only this action type (e.g. member_ban)",
+    file_format="File format"
+)
+@app_commands.rename(file_format="format")
+@app_commands.choices(file_format=[app_commands.Choice(name="CSV", value="csv"), app_commands.Choice(name="JSONL", value="jsonl")])
+@app_commands.default_permissions(view_audit_log=True)
+async def audit_export(interaction: discord.Interaction, since: str = None, until: str = None,
+                       user: discord.User = None, action: str = None, file_format: str = "csv"):
+    """Stream matching events from the JSONL store into upload-sized gzip parts"""
+    if not is_audited(interaction.guild):
+        await interaction.response.send_message("❌ This server is not configured for audit logging.", ephemeral=True)
+        return
+    if not await asyncio.to_thread(audit_store.partitions):
+        await interaction.response.send_message("❌ No local audit store to export from (set `AUDIT_STORE=1`).", ephemeral=True)
+        return
+    try:
+        start = parse_export_date(since) if since else time.time() - 7 * 86400
+        end = parse_export_date(until) + 86400 if until else None
+    except ValueError:
+        await interaction.response.send_message("❌ Dates must look like `2024-05-31`.", ephemeral=True)
+        return
+
+    await interaction.response.defer(ephemeral=True, thinking=True)
+    events = iter_events(audit_store, interaction.guild_id, start, end, user.id if user else None, action)
+    basename = f"audit-{interaction.guild_id}-{datetime.now(timezone.utc):%Y%m%d-%H%M%S}"
+    parts = export_parts(events, file_format, interaction.guild.filesize_limit, basename)
+
+    total = 0
+    sent = 0
+    try:
+        # Each part is read and compressed in a worker thread, then uploaded before the next starts
+        while (part := await asyncio.to_thread(next, parts, None)) is not None:
+            filename, fh, rows = part
+            try:
+                await interaction.followup.send(f"Part {sent + 1}: {rows} event(s)", file=discord.File(fh, filename=filename), ephemeral=True)
+            finally:
+                fh.close()  # discord.File closes it after an upload, not when the send fails first
+            total += rows
+            sent += 1
+    except Exception as e:
+        logger.error("Error exporting audit events for guild %s: %s", interaction.guild_id, e)
+        await interaction.followup.send(f"❌ Export failed after {sent} part(s): {e}", ephemeral=True)
+        return
+    finally:
+        parts.close()
+    await interaction.followup.send(f"✅ Exported {total} event(s) in {sent} file(s).", ephemeral=True)
+
+@tree.command(name="auditgrep", description="Search deleted and edited message content")
+@app_commands.describe(text="Words to find (all must match)", user="Only messages by this member")
+@app_commands.default_permissions(manage_messages=True)
+async def audit_grep(interaction: discord.Interaction, text: str, user: discord.User = None):
+    """Newest matches from the full-text index"""
+    if not is_audited(interaction.guild):
+        await interaction.response.send_message("❌ This server is not configured for audit logging.", ephemeral=True)
+        return
+    words = search_words(text)
+    if not words:
+        await interaction.response.send_message("❌ Give at least one word to search for.", ephemeral=True)
+        return
+
+    try:
+        hits = await asyncio.to_thread(message_index.search, interaction.guild_id, text, user.id if user else None, 10)
+    except Exception as e:
+        logger.error("Error searching message index: %s", e)
+        await interaction.response.send_message("❌ Search failed, try simpler words.", ephemeral=True)
+        return
+
+    embed = discord.Embed(
+        title="Message Search",
+        description=f"Newest deleted/edited messages matching `{discord.utils.escape_markdown(text)[:100]}`",
+        color=EMBED_COLOR
+    )
+    for hit in hits:
+        body = snippet(hit["content"], words, 250)
+        if hit["kind"] == EDITED and hit["after"]:
+            body += f"\n**After:** {snippet(hit['after'], words, 100)}"
+        embed.add_field(
+            name=f"{hit['kind'].capitalize()} · message {hit['message_id']}",
+            value=f"<@{hit['author_id']}> in <#{hit['channel_id']}> <t:{int(hit['created'])}:R>\n{body}"[:1024],
+            inline=False
+        )
+    if not hits:
+        embed.add_field(name="No matches", value="Nothing indexed matches those words.", inline=False)
+    await interaction.response.send_message(embed=embed, ephemeral=True)
+
+@tree.command(name="audituser", description="Recent audit events by or against a member")
+@app_commands.describe(member="Member to show")
+@app_commands.default_permissions(view_audit_log=True)
+async def audit_user(interaction: discord.Interaction, member: discord.User):
+    """From the member's ring buffer; rebuilt from the local store if it is not in memory"""
+    if not is_audited(interaction.guild):
+        await interaction.response.send_message("❌ This server is not configured for audit logging.", ephemeral=True)
+        return
+
+    entries = timelines.get(interaction.guild_id, member.id)
+    if entries is None:
+        if AUDIT_STORE_ENABLED:
+            try:
+                since = time.time() - TIMELINE_LOOKBACK_DAYS * 86400
+                loaded = await asyncio.to_thread(timelines.load, audit_store, interaction.guild_id, member.id, since)
+                entries = timelines.fill(interaction.guild_id, member.id, loaded)
+            except Exception as e:
+                logger.error("Error loading timeline for %s from the audit store: %s", member.id, e)
+                entries = timelines.peek(interaction.guild_id, member.id)
+        else:
+            entries = timelines.peek(interaction.guild_id, member.id)
+
+    lines = []
+    length = 0
+    for timestamp, action, role, summary in entries:
+        line = f"<t:{int(timestamp)}:R> `{action}`{'' if role == ACTOR else ' (target)'} {summary}"
+        length += len(line) + 1
+        if length > 4000:
+            break
+        lines.append(line)
+    embed = discord.Embed(
+        title="Audit Timeline",
+        description=f"{member.mention} (ID: `{member.id}`)\n\n" + ("\n".join(lines) or "No recent audit events."),
+        color=EMBED_COLOR
+    )
+    if not AUDIT_STORE_ENABLED:
+        embed.set_footer(text="Local audit store is off: only events since the last restart are shown, "
+                              f"at most {TIMELINE_PER_USER} per member.")
+    await interaction.response.send_message(embed=embed, ephemeral=True)
+
+@tree.command(name="ping", description="Check bot latency")
 async def ping_command(interaction: discord.Interaction):
     """Check bot latency"""
     await interaction.response.send_message(
@@ -1501,12 +2161,16 @@ async def ping_command(interaction: discord.Interaction):
         ephemeral=True
     )
 
-@tree.command(name="testaudit", description="Test the audit logger", guild=discord.Object(id=GUILD_ID))
+@tree.command(name="testaudit", description="Test the audit logger")
 async def test_audit(interaction: discord.Interaction):
     """Test if audit logging is working"""
     await interaction.response.send_message("Testing audit logger...", ephemeral=True)
     
     guild = interaction.guild
+    if not is_audited(guild):
+        await interaction.followup.send("❌ This server is not configured for audit logging.", ephemeral=True)
+        return
+
     channel = await get_audit_channel(guild)
     
     if channel is None:
@@ -1514,35 +2178,94 @@ async def test_audit(interaction: discord.Interaction):
         return
     
     # Send a test message
-    image_embed = discord.Embed()
-    image_embed.set_image(url=AUDIT_IMAGE_URL)
-    
-    text_embed = discord.Embed(
-        color=EMBED_COLOR,
-        timestamp=datetime.now()
-    )
-    
-    text_embed.add_field(
-        name="Community Member:",
-        value=interaction.user.nick if interaction.user.nick else interaction.user.name,
-        inline=True
+    member_name = interaction.user.nick if interaction.user.nick else interaction.user.name
+    post_audit(
+        guild,
+        member_name,
+        "Test audit log message - This is a test to verify the audit logger is working correctly!",
+        "test_audit",
+        interaction.user
     )
-    
-    text_embed.add_field(
-        name="Action:",
-        value="Test audit log message - This is a test to verify the audit logger is working correctly!",
-        inline=True
-    )
-    
-    text_embed.add_field(
-        name="Timestamp:",
-        value=f"<t:{int(datetime.now().timestamp())}>",
-        inline=False
-    )
-    
-    await channel.send(embeds=[image_embed, text_embed])
     await interaction.followup.send("✅ Test audit message sent!", ephemeral=True)
 
+# ============== SHUTDOWN ==============
+shutdown_task = None
+
+def save_pending(events: list):
+    """Write undelivered Discord events to PENDING_PATH (blocking)"""
+    directory = os.path.dirname(PENDING_PATH)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(PENDING_PATH, "a", encoding="utf-8") as fh:
+        fh.write("".join(event.to_json() + "\n" for event in events))
+        fh.flush()
+        os.fsync(fh.fileno())
+
+def load_pending() -> list:
+    """Read and remove events saved by the previous shutdown (blocking)"""
+    if not os.path.exists(PENDING_PATH):
+        return []
+    with open(PENDING_PATH, encoding="utf-8") as fh:
+        events = [AuditEvent(**json.loads(line)) for line in fh if line.strip()]
+    os.remove(PENDING_PATH)
+    return events
+
+async def shutdown(reason: str):
+    """Stop taking events, drain outbound queues, checkpoint, then disconnect"""
+    global accepting_events
+    if not accepting_events:
+        return
+    accepting_events = False
+    logger.info("Shutting down (%s): draining audit queues for up to %.0fs", reason, SHUTDOWN_TIMEOUT)
+
+    try:
+        await asyncio.sleep(SHUTDOWN_GRACE)
+        # Ended sessions still inside their grouping window; sessions still open are not logged
+        for item in voice_sessions.flush():
+            post_voice_log(item)
+        post_thread_summaries()
+        drained = await audit_sinks.drain(SHUTDOWN_TIMEOUT)
+        if not all(drained.values()):
+            logger.warning("Shutdown timeout hit before draining: %s", drained)
+
+        # Discord posts still queued (rate limits, outage) are saved and replayed on the next start
+        discord_sink = audit_sinks.sink("discord")
+        pending = discord_sink.take_pending() if discord_sink is not None else []
+        if pending:
+            await asyncio.to_thread(save_pending, pending)
+            logger.info("Saved %d undelivered audit post(s) to %s", len(pending), PENDING_PATH)
+
+        await audit_sinks.close()
+        await asyncio.to_thread(checkpoint_state)
+        await asyncio.to_thread(snapshots.flush)
+        await asyncio.to_thread(rollups.save)
+        await asyncio.to_thread(message_index.write, message_index.take_pending())
+        logger.info("Checkpoint saved: %s", audit_hwm)
+    except Exception as e:
+        logger.error("Error during shutdown: %s", e)
+    finally:
+        if http_server is not None:
+            await asyncio.to_thread(http_server.shutdown)
+        await webhooks.close()
+        await bot.close()
+
+async def run_bot():
+    """Run the bot with SIGTERM/SIGINT wired to a graceful shutdown"""
+    loop = asyncio.get_running_loop()
+
+    def on_signal(sig: signal.Signals):
+        global shutdown_task
+        if shutdown_task is None:
+            shutdown_task = loop.create_task(shutdown(sig.name))
+
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, on_signal, sig)
+
+    async with bot:
+        await bot.start(BOT_TOKEN, reconnect=True)
+    if shutdown_task is not None:
+        await shutdown_task
+
 # ============== MAIN ==============
 if __name__ == "__main__":
     if not BOT_TOKEN:
@@ -1550,13 +2273,14 @@ if __name__ == "__main__":
         logger.error("Please set the BOT_TOKEN environment variable.")
         exit(1)
     
-    # Run Flask in background thread
-    import threading
-    flask_thread = threading.Thread(target=run_flask, daemon=True)
-    flask_thread.start()
-    logger.info("Flask server started on port 8080")
+    # Run Flask in background thread (the cluster launcher serves status itself)
+    if STATUS_SERVER:
+        import threading
+        http_server = make_server('0.0.0.0', 8080, app, threaded=True)
+        flask_thread = threading.Thread(target=run_flask, daemon=True)
+        flask_thread.start()
+        logger.info("Flask server started on port 8080")
     
-    # Run Discord bot
+    # Run Discord bot; discord.py adds no log handler when started this way
     logger.info("Starting Discord bot...")
-    bot.run(BOT_TOKEN, reconnect=True)
-
+    asyncio.run(run_bot())
@@ -0,0 +1,181 @@
+"""
+Full-text index of deleted and edited message content (SQLite FTS5).
+
+on_message_delete and on_message_edit add one row per event: the deleted
+text, or the text before and after an edit. Rows are buffered in memory on
+the event loop and written in one transaction per batch from a worker
+thread, so the gateway handlers never touch the database. The database is
+opened on first write or search, not when the bot module is imported.
+
+The FTS table carries the guild and author as indexed "g<id>"/"u<id>"
+tokens, so a search is a single MATCH ("guild:g123 AND (...)", plus
+"author:u456" for one member) that intersects posting lists instead of
+filtering rows. Results come newest first by rowid, which FTS5 returns in index order
+without sorting the matches.
+"""
+
+import os
+import re
+import time
+import sqlite3
+import logging
+import threading
+
+from discord.utils import escape_markdown
+
+logger = logging.getLogger(__name__)
+
+DELETED = "deleted"
+EDITED = "edited"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS messages (
+    id INTEGER PRIMARY KEY,
+    guild_id INTEGER NOT NULL,
+    channel_id INTEGER,
+    author_id INTEGER,
+    message_id INTEGER,
+    kind TEXT NOT NULL,
+    created REAL NOT NULL,
+    content TEXT NOT NULL,
+    after TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS messages_created ON messages (created);
+CREATE VIRTUAL TABLE IF NOT EXISTS messages_fts USING fts5(
+    guild, author, content, after,
+    content='', tokenize='unicode61 remove_diacritics 2'
+);
+"""
+
+
+_WORD_RE = re.compile(r"\w")
+
+
+def search_words(text: str) -> list:
+    """Words of `text` that can match; punctuation-only words tokenize to nothing and would match no row"""
+    return [word for word in text.split() if _WORD_RE.search(word)]
+
+
+def match_query(guild_id: int, text: str, author_id: int = None) -> str:
+    """FTS5 query: every searchable word of `text` as a quoted term, within the guild (and author).
+
+    None if no word is left to search for.
+    """
+    words = search_words(text)
+    if not words:
+        return None
+    terms = " AND ".join('"' + word.replace('"', '""') + '"' for word in words)
+    scope = f'guild:"g{guild_id}"' + (f' AND author:"u{author_id}"' if author_id is not None else "")
+    # Words only match message text, never the guild/author tokens
+    return f"{scope} AND (- {{guild author}} : ({terms}))"
+
+
+def snippet(text: str, words: list, width: int = 160) -> str:
+    """Window of `text` around the first searched word, with the words in bold"""
+    pattern = re.compile("|".join(re.escape(word) for word in words), re.IGNORECASE) if words else None
+    found = pattern.search(text) if pattern else None
+    start = max(0, found.start() - width // 3) if found else 0
+    window = text[start:start + width]
+    parts = []
+    position = 0
+    for match in pattern.finditer(window) if pattern else ():
+        parts.append(escape_markdown(window[position:match.start()]))
+        parts.append(f"**{escape_markdown(match.group())}**")
+        position = match.end()
+    parts.append(escape_markdown(window[position:]))
+    return ("…" if start else "") + "".join(parts) + ("…" if start + width < len(text) else "")
+
+
+class MessageIndex:
+    """Buffered writer and searcher over one SQLite database"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._db = None
+        self._lock = threading.Lock()
+        self._pending = []
+        self.indexed = 0
+
+    def add(self, guild_id: int, channel_id: int, author_id: int, message_id: int,
+            kind: str, content: str, after: str = "", created: float = None):
+        """Queue a row (event loop only); written with the next batch"""
+        if content or after:
+            self._pending.append((guild_id, channel_id, author_id, message_id, kind,
+                                  created or time.time(), content or "", after or ""))
+
+    def _connection(self) -> sqlite3.Connection:
+        """Open (and create) the database on first use; caller holds the lock"""
+        if self._db is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            db = sqlite3.connect(self.path, check_same_thread=False)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.executescript(_SCHEMA)
+            self._db = db
+        return self._db
+
+    def take_pending(self) -> list:
+        """Queued rows, handed over for write() (event loop only)"""
+        rows, self._pending = self._pending, []
+        return rows
+
+    def write(self, rows: list):
+        """Insert rows in one transaction (blocking, run it in a thread)"""
+        if not rows:
+            return
+        with self._lock, self._connection() as db:
+            cursor = db.cursor()
+            for row in rows:
+                cursor.execute(
+                    "INSERT INTO messages (guild_id, channel_id, author_id, message_id, kind, created, content, after) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)", row
+                )
+                cursor.execute(
+                    "INSERT INTO messages_fts (rowid, guild, author, content, after) VALUES (?, ?, ?, ?, ?)",
+                    (cursor.lastrowid, f"g{row[0]}", f"u{row[2]}", row[6], row[7])
+                )
+        self.indexed += len(rows)
+
+    def search(self, guild_id: int, text: str, author_id: int = None, limit: int = 10) -> list:
+        """Newest matching rows as dicts (blocking, run it in a thread)"""
+        query = (
+            "SELECT m.id, m.channel_id, m.author_id, m.message_id, m.kind, m.created, m.content, m.after "
+            "FROM messages_fts JOIN messages m ON m.id = messages_fts.rowid "
+            "WHERE messages_fts MATCH ? ORDER BY messages_fts.rowid DESC LIMIT ?"
+        )
+        match = match_query(guild_id, text, author_id)
+        if match is None:
+            return []
+        params = (match, limit)
+        columns = ("id", "channel_id", "author_id", "message_id", "kind", "created", "content", "after")
+        with self._lock:
+            return [dict(zip(columns, row)) for row in self._connection().execute(query, params)]
+
+    def prune(self, before: float):
+        """Delete rows created before `before`, oldest first in chunks (blocking, run it in a thread)"""
+        removed = 0
+        while True:
+            with self._lock, self._connection() as db:
+                stale = db.execute(
+                    "SELECT id, guild_id, author_id, content, after FROM messages WHERE created < ? ORDER BY id LIMIT 5000",
+                    (before,)
+                ).fetchall()
+                if not stale:
+                    return removed
+                # Contentless FTS rows are removed with the special 'delete' command and the original values
+                db.executemany(
+                    "INSERT INTO messages_fts (messages_fts, rowid, guild, author, content, after) "
+                    "VALUES ('delete', ?, ?, ?, ?, ?)",
+                    ((row_id, f"g{guild_id}", f"u{author_id}", content, after)
+                     for row_id, guild_id, author_id, content, after in stale)
+                )
+                db.executemany("DELETE FROM messages WHERE id = ?", ((row[0],) for row in stale))
+            removed += len(stale)
+
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
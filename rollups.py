@@ -0,0 +1,208 @@
+"""
+Rolling per-hour and per-day audit counters.
+
+Every audit event bumps a count for its action, its actor and its channel in
+the current bucket of each window (24 hourly buckets, 7 and 30 daily
+buckets). Each window also keeps running totals: a bucket's counts are
+added on the way in and subtracted when it ages out, so a query reads the
+totals directly instead of summing buckets or scanning history. The cost of
+a query depends only on how many distinct actions, actors and channels are
+in the window.
+
+Only the buckets are saved (compact JSON, IDs as keys); totals are rebuilt
+from them on load.
+"""
+
+import os
+import json
+import time
+import heapq
+import logging
+import threading
+from collections import deque
+
+from sinks import Sink
+
+logger = logging.getLogger(__name__)
+
+ALL = "*"  # pseudo-action counting every event
+
+# name: (bucket width in seconds, buckets kept)
+WINDOWS = {
+    "24h": (3600, 24),
+    "7d": (86400, 7),
+    "30d": (86400, 30),
+}
+
+
+def _add(stats: dict, action: str, user_id, channel_id, count: int = 1):
+    """stats: {action: [count, {user_id: n}, {channel_id: n}]}"""
+    entry = stats.get(action)
+    if entry is None:
+        entry = stats[action] = [0, {}, {}]
+    entry[0] += count
+    if user_id is not None:
+        entry[1][user_id] = entry[1].get(user_id, 0) + count
+    if channel_id is not None:
+        entry[2][channel_id] = entry[2].get(channel_id, 0) + count
+
+
+def _merge(totals: dict, stats: dict, sign: int):
+    for action, (count, users, channels) in stats.items():
+        entry = totals.get(action)
+        if entry is None:
+            entry = totals[action] = [0, {}, {}]
+        entry[0] += sign * count
+        for counts, source in ((entry[1], users), (entry[2], channels)):
+            for key, value in source.items():
+                value = counts.get(key, 0) + sign * value
+                if value:
+                    counts[key] = value
+                else:
+                    del counts[key]
+        if not entry[0]:
+            del totals[action]
+
+
+class RollingWindow:
+    """Fixed-width buckets plus running totals over the newest `count` of them"""
+
+    __slots__ = ("width", "count", "buckets", "totals")
+
+    def __init__(self, width: int, count: int):
+        self.width = width
+        self.count = count
+        self.buckets = deque()  # (bucket index, stats), oldest first
+        self.totals = {}
+
+    def _expire(self, index: int):
+        while self.buckets and self.buckets[0][0] <= index - self.count:
+            _, stats = self.buckets.popleft()
+            _merge(self.totals, stats, -1)
+
+    def add(self, timestamp: float, action: str, user_id=None, channel_id=None):
+        index = int(timestamp // self.width)
+        self._expire(index)
+        if self.buckets and index < self.buckets[-1][0]:
+            # Late event: goes into its own bucket if that is still in the window
+            if index <= self.buckets[-1][0] - self.count:
+                return
+            position = 0
+            for position, (i, stats) in enumerate(self.buckets):
+                if i >= index:
+                    break
+            if self.buckets[position][0] == index:
+                bucket = self.buckets[position][1]
+            else:
+                bucket = {}
+                self.buckets.insert(position, (index, bucket))
+        else:
+            if not self.buckets or self.buckets[-1][0] != index:
+                self.buckets.append((index, {}))
+            bucket = self.buckets[-1][1]
+        for name in (action, ALL):
+            _add(bucket, name, user_id, channel_id)
+            _add(self.totals, name, user_id, channel_id)
+
+    def query(self, now: float = None) -> dict:
+        self._expire(int((now or time.time()) // self.width))
+        return self.totals
+
+    def dump(self) -> list:
+        """Copy of the buckets that later add() calls won't touch"""
+        return [[index, {action: [count, dict(users), dict(channels)]
+                         for action, (count, users, channels) in stats.items()}]
+                for index, stats in self.buckets]
+
+    def load(self, buckets: list):
+        for index, stats in buckets:
+            # JSON keys are strings; restore integer IDs
+            stats = {
+                action: [count, {int(k): v for k, v in users.items()}, {int(k): v for k, v in channels.items()}]
+                for action, (count, users, channels) in stats.items()
+            }
+            self.buckets.append((index, stats))
+            _merge(self.totals, stats, 1)
+
+
+def top(counts: dict, n: int = 5) -> list:
+    """[(key, count)] with the largest counts"""
+    return heapq.nlargest(n, counts.items(), key=lambda item: item[1])
+
+
+class RollupStore:
+    """Rolling windows per guild, saved as one JSON file"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.guilds = {}  # {guild_id: {window name: RollingWindow}}
+        self.dirty = False
+        self._lock = threading.Lock()
+        if os.path.exists(path):
+            try:
+                with open(path, encoding="utf-8") as fh:
+                    data = json.load(fh)
+                for guild_id, windows in data.items():
+                    for name, buckets in windows.items():
+                        if name in WINDOWS:
+                            self._windows(int(guild_id))[name].load(buckets)
+            except (OSError, ValueError) as e:
+                logger.error("Could not read rollups %s, starting fresh: %s", path, e)
+
+    def _windows(self, guild_id: int) -> dict:
+        windows = self.guilds.get(guild_id)
+        if windows is None:
+            windows = self.guilds[guild_id] = {name: RollingWindow(*spec) for name, spec in WINDOWS.items()}
+        return windows
+
+    def record(self, guild_id: int, timestamp: float, action: str, user_id=None, channel_id=None):
+        with self._lock:
+            for window in self._windows(guild_id).values():
+                window.add(timestamp, action, user_id, channel_id)
+            self.dirty = True
+
+    def query(self, guild_id: int, window: str, action: str = ALL) -> tuple:
+        """(count, top actors, top channels, top actions) for one window; reads running totals only"""
+        with self._lock:
+            totals = self._windows(guild_id)[window].query()
+            count, users, channels = totals.get(action, (0, {}, {}))
+            actions = top({name: entry[0] for name, entry in totals.items() if name != ALL}, 10)
+            return count, top(users), top(channels), actions
+
+    def save(self):
+        """Write every guild's buckets if anything changed (blocking, run it in a thread)"""
+        # Only the copy happens under the lock; record() runs on the event loop and waits on it
+        with self._lock:
+            if not self.dirty:
+                return
+            self.dirty = False
+            data = {str(guild_id): {name: window.dump() for name, window in windows.items()}
+                    for guild_id, windows in self.guilds.items()}
+        payload = json.dumps(data, separators=(",", ":"))
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as fh:
+            fh.write(payload)
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp_path, self.path)
+
+
+class RollupSink(Sink):
+    """Counts every published audit event into the rollups (in-memory, never queues)"""
+    name = "rollups"
+
+    def __init__(self, store: RollupStore):
+        self.store = store
+        self.submitted = 0
+
+    def submit(self, event) -> bool:
+        self.store.record(event.guild_id, event.timestamp, event.action, event.user_id, event.channel_id)
+        self.submitted += 1
+        return True
+
+    def stats(self) -> dict:
+        return {"queued": 0, "submitted": self.submitted, "written": self.submitted,
+                "failed": 0, "dropped": 0, "per_second": 0.0}
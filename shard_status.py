@@ -0,0 +1,123 @@
+"""
+Shared shard status store for multi-process (clustered) deployments.
+
+Each bot process writes one row per shard it owns into a local SQLite file
+(WAL mode, so many writers and the status server can share it). The status
+server reads the table back and aggregates it per cluster.
+"""
+
+import os
+import sqlite3
+import time
+
+from flask import jsonify
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS shard_status (
+    shard_id INTEGER PRIMARY KEY,
+    cluster_id INTEGER NOT NULL,
+    pid INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    latency_ms REAL,
+    guilds INTEGER NOT NULL DEFAULT 0,
+    rss_kb INTEGER,
+    startup_seconds REAL,
+    updated_at REAL NOT NULL
+)
+"""
+
+# Rows older than this are reported as stale by the status server
+STALE_AFTER = 60.0
+
+
+def current_rss_kb() -> int:
+    """Resident set size of this process in KiB"""
+    try:
+        with open("/proc/self/status") as fh:
+            for line in fh:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+class ShardStatusStore:
+    """Tiny SQLite-backed table of per-shard status rows"""
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=5.0)
+
+    def report(self, rows: list):
+        """Upsert a batch of row dicts (one per shard)"""
+        now = time.time()
+        pid = os.getpid()
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO shard_status "
+                "(shard_id, cluster_id, pid, status, latency_ms, guilds, rss_kb, startup_seconds, updated_at) "
+                "VALUES (:shard_id, :cluster_id, :pid, :status, :latency_ms, :guilds, :rss_kb, :startup_seconds, :updated_at)",
+                [{**row, "pid": pid, "updated_at": now} for row in rows],
+            )
+
+    def clear_cluster(self, cluster_id: int):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM shard_status WHERE cluster_id = ?", (cluster_id,))
+
+    def rows(self) -> list:
+        with self._connect() as conn:
+            conn.row_factory = sqlite3.Row
+            return [dict(row) for row in conn.execute("SELECT * FROM shard_status ORDER BY shard_id")]
+
+    def summary(self) -> dict:
+        """Aggregate rows per cluster, flagging stale shards"""
+        now = time.time()
+        clusters = {}
+        shards = self.rows()
+        for row in shards:
+            row["stale"] = now - row["updated_at"] > STALE_AFTER
+            cluster = clusters.setdefault(row["cluster_id"], {
+                "pid": row["pid"],
+                "shards": [],
+                "guilds": 0,
+                "rss_kb": row["rss_kb"],
+                "ready": 0,
+                "startup_seconds": None,
+            })
+            cluster["shards"].append(row["shard_id"])
+            if row["startup_seconds"] is not None:
+                cluster["startup_seconds"] = max(cluster["startup_seconds"] or 0.0, row["startup_seconds"])
+            cluster["guilds"] += row["guilds"]
+            if row["status"] == "ready" and not row["stale"]:
+                cluster["ready"] += 1
+
+        for cluster in clusters.values():
+            if cluster["rss_kb"] and cluster["shards"]:
+                cluster["rss_kb_per_shard"] = cluster["rss_kb"] // len(cluster["shards"])
+
+        return {
+            "shards": len(shards),
+            "ready": sum(c["ready"] for c in clusters.values()),
+            "guilds": sum(c["guilds"] for c in clusters.values()),
+            "clusters": clusters,
+            "detail": shards,
+        }
+
+
+def register_status_routes(app, store: ShardStatusStore):
+    """Expose the aggregated shard table on a Flask app at /shards"""
+
+    @app.route('/shards')
+    def shards():
+        """Aggregated status of every shard across all clusters"""
+        return jsonify(store.summary())
@@ -0,0 +1,284 @@
+"""
+Audit event sinks: Discord, JSONL store, syslog and stdout.
+
+Every audit event is published to all enabled sinks at once. Each sink owns
+its own bounded queue and worker, so a slow disk or a rate-limited channel
+only backs up (and eventually drops from) its own queue; the other sinks and
+the gateway handlers never wait on it. Blocking writes (file, syslog,
+stdout) run in a thread, a batch at a time.
+
+The Discord sink is the existing per-guild AuditDispatcher, which already
+gives each guild its own queue and rate budget. It queues the events
+themselves and renders embeds at delivery time, so anything still queued at
+shutdown can be saved and replayed.
+"""
+
+import sys
+import json
+import time
+import socket
+import asyncio
+import logging
+import logging.handlers
+from dataclasses import dataclass, asdict
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_QUEUE_SIZE = 10000
+BATCH_SIZE = 500
+
+
+@dataclass(frozen=True)
+class AuditEvent:
+    """One audit log line, independent of how any sink renders it"""
+    guild_id: int
+    action: str
+    member_name: str
+    text: str
+    timestamp: float
+    user_id: int = None
+    channel_id: int = None
+    urgent: bool = False
+    ping_role_id: int = None
+    target_id: int = None  # member acted on, when that is not the actor
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), ensure_ascii=False, separators=(",", ":"))
+
+
+class Sink:
+    """Interface: submit() must never block; stats() returns counters"""
+    name = "sink"
+
+    def submit(self, event: AuditEvent) -> bool:
+        raise NotImplementedError
+
+    def stats(self) -> dict:
+        raise NotImplementedError
+
+    async def drain(self, timeout: float) -> bool:
+        """Wait for queued events to be written; False on timeout"""
+        return True
+
+    async def close(self):
+        pass
+
+
+class QueuedSink(Sink):
+    """Bounded queue + one worker writing batches in a thread"""
+
+    def __init__(self, queue_size: int = DEFAULT_QUEUE_SIZE, batch_size: int = BATCH_SIZE):
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.batch_size = batch_size
+        self.submitted = 0
+        self.written = 0
+        self.failed = 0
+        self.dropped = 0
+        self.started = time.monotonic()
+        self._task = None
+
+    def submit(self, event: AuditEvent) -> bool:
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.dropped += 1
+            if self.dropped == 1 or self.dropped % 1000 == 0:
+                logger.warning("%s sink queue full, dropped %d event(s) so far", self.name, self.dropped)
+            return False
+        self.submitted += 1
+        return True
+
+    async def _run(self):
+        while True:
+            batch = [await self.queue.get()]
+            while len(batch) < self.batch_size and not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+            try:
+                await asyncio.to_thread(self.write_batch, batch)
+                self.written += len(batch)
+            except Exception as e:
+                self.failed += len(batch)
+                logger.error("%s sink failed to write %d event(s): %s", self.name, len(batch), e)
+            finally:
+                for _ in batch:
+                    self.queue.task_done()
+
+    def write_batch(self, events: list):
+        """Called in a worker thread"""
+        raise NotImplementedError
+
+    async def drain(self, timeout: float) -> bool:
+        try:
+            await asyncio.wait_for(self.queue.join(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    def stats(self) -> dict:
+        elapsed = time.monotonic() - self.started
+        return {
+            "queued": self.queue.qsize(),
+            "submitted": self.submitted,
+            "written": self.written,
+            "failed": self.failed,
+            "dropped": self.dropped,
+            "per_second": round(self.written / elapsed, 2) if elapsed else 0.0,
+        }
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+
+
+class JsonlFileSink(QueuedSink):
+    """Appends one JSON object per event to the day-partitioned local store"""
+    name = "jsonl"
+
+    def __init__(self, store, **kwargs):
+        super().__init__(**kwargs)
+        self.store = store
+
+    def write_batch(self, events: list):
+        self.store.append(events)
+
+    async def close(self):
+        await super().close()
+        self.store.close()
+
+
+class StdoutSink(QueuedSink):
+    """JSON lines on stdout, for container log collectors"""
+    name = "stdout"
+
+    def __init__(self, stream=None, **kwargs):
+        super().__init__(**kwargs)
+        self.stream = stream or sys.stdout
+
+    def write_batch(self, events: list):
+        self.stream.write("".join(event.to_json() + "\n" for event in events))
+        self.stream.flush()
+
+
+class SyslogSink(QueuedSink):
+    """RFC 3164 messages via the stdlib SysLogHandler (unix socket or UDP host:port)"""
+    name = "syslog"
+
+    def __init__(self, address: str = "/dev/log", facility: str = "local0", **kwargs):
+        super().__init__(**kwargs)
+        if ":" in address:
+            host, port = address.rsplit(":", 1)
+            target = (host, int(port))
+        else:
+            target = address
+        self._handler = logging.handlers.SysLogHandler(
+            address=target,
+            facility=facility,
+            socktype=socket.SOCK_DGRAM,
+        )
+        self._handler.ident = "lcsrc-audit: "
+        self._handler.setFormatter(logging.Formatter("%(message)s"))
+
+    def write_batch(self, events: list):
+        for event in events:
+            record = logging.LogRecord("audit", logging.INFO, __file__, 0, event.to_json(), None, None)
+            self._handler.emit(record)
+
+    async def close(self):
+        await super().close()
+        self._handler.close()
+
+
+class DiscordSink(Sink):
+    """Posts through the per-guild AuditDispatcher (its deliver callback renders the embeds)"""
+    name = "discord"
+
+    def __init__(self, dispatcher):
+        self.dispatcher = dispatcher
+        self.submitted = 0
+        self.started = time.monotonic()
+
+    def submit(self, event: AuditEvent) -> bool:
+        self.submitted += 1
+        return self.dispatcher.submit(event.guild_id, event, event.urgent)
+
+    async def drain(self, timeout: float) -> bool:
+        return await self.dispatcher.drain(timeout)
+
+    def take_pending(self) -> list:
+        """Undelivered events, for saving at shutdown"""
+        return self.dispatcher.take_pending()
+
+    def stats(self) -> dict:
+        pipelines = self.dispatcher.stats().values()
+        sent = sum(p["sent"] for p in pipelines)
+        elapsed = time.monotonic() - self.started
+        return {
+            "queued": sum(p["queued"] for p in pipelines),
+            "submitted": self.submitted,
+            "written": sent,
+            "failed": sum(p["failed"] for p in pipelines),
+            "dropped": sum(p["dropped"] for p in pipelines),
+            "per_second": round(sent / elapsed, 2) if elapsed else 0.0,
+        }
+
+
+class SinkFanout:
+    """Publishes each event to every sink; one sink's trouble never blocks another"""
+
+    def __init__(self, sinks: list):
+        self.sinks = sinks
+
+    def publish(self, event: AuditEvent, exclude: tuple = ()) -> bool:
+        """True if every sink accepted the event; sinks named in `exclude` don't get it"""
+        accepted = True
+        for sink in self.sinks:
+            if sink.name in exclude:
+                continue
+            try:
+                accepted = sink.submit(event) and accepted
+            except Exception as e:
+                accepted = False
+                logger.error("%s sink rejected event: %s", sink.name, e)
+        return accepted
+
+    def stats(self) -> dict:
+        return {sink.name: sink.stats() for sink in self.sinks}
+
+    def sink(self, name: str) -> Sink:
+        for sink in self.sinks:
+            if sink.name == name:
+                return sink
+        return None
+
+    async def drain(self, timeout: float) -> dict:
+        """Drain every sink concurrently within one shared timeout: {name: drained}"""
+        results = await asyncio.gather(*(sink.drain(timeout) for sink in self.sinks))
+        return {sink.name: drained for sink, drained in zip(self.sinks, results)}
+
+    async def close(self):
+        for sink in self.sinks:
+            await sink.close()
+
+
+def build_sinks(names: list, dispatcher, store, syslog_address: str,
+                queue_size: int = DEFAULT_QUEUE_SIZE) -> list:
+    """Sinks from a list of names (discord, jsonl, syslog, stdout)"""
+    sinks = []
+    for name in names:
+        if name == "discord":
+            sinks.append(DiscordSink(dispatcher))
+        elif name == "jsonl":
+            sinks.append(JsonlFileSink(store, queue_size=queue_size))
+        elif name == "syslog":
+            sinks.append(SyslogSink(syslog_address, queue_size=queue_size))
+        elif name == "stdout":
+            sinks.append(StdoutSink(queue_size=queue_size))
+        else:
+            raise ValueError(f"Unknown audit sink: {name!r}")
+    logger.info("Audit sinks: %s", ", ".join(sink.name for sink in sinks))
+    return sinks
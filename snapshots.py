@@ -0,0 +1,210 @@
+"""
+On-disk snapshots of guild structure, for changes made while the bot was down.
+
+A snapshot keeps one compact record per role, channel, emoji and sticker
+(lists of plain values, overwrites as {target_id: [allow, deny, type]}), keyed by
+ID. The create/update/delete handlers keep it current in memory and dirty
+guilds are rewritten periodically. At startup the live guild is captured and
+diffed against the stored snapshot: dict lookups per kind, so the diff is
+linear in the number of objects even for thousands of roles and channels.
+
+Mass position shifts (one role moved renumbers everything below it) are
+reported as a count rather than one line per object.
+"""
+
+import os
+import json
+import time
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_VERSION = 1
+
+# Record layouts; position is always last and reported only as a count
+ROLE_FIELDS = ("name", "color", "permissions", "hoist", "mentionable", "position")
+CHANNEL_FIELDS = ("name", "type", "category", "topic", "nsfw", "slowmode", "overwrites", "position")
+EMOJI_FIELDS = ("name",)
+STICKER_FIELDS = ("name",)
+
+
+def role_record(role) -> list:
+    return [role.name, role.color.value, role.permissions.value, role.hoist, role.mentionable, role.position]
+
+
+def channel_record(channel) -> list:
+    # _overwrites holds raw (id, allow, deny, type) values; .overwrites would build objects for every target
+    raw = getattr(channel, "_overwrites", None)
+    if raw is not None:
+        overwrites = {str(ow.id): [ow.allow, ow.deny, ow.type] for ow in raw}
+    else:
+        overwrites = {
+            str(target.id): [*(value.value for value in overwrite.pair()), 0 if hasattr(target, "permissions") else 1]
+            for target, overwrite in getattr(channel, "overwrites", {}).items()
+        }
+    channel_type = getattr(channel, "type", None)
+    return [
+        channel.name,
+        getattr(channel_type, "value", channel_type),
+        getattr(channel, "category_id", None),
+        getattr(channel, "topic", None),
+        getattr(channel, "nsfw", False),
+        getattr(channel, "slowmode_delay", 0),
+        overwrites,
+        channel.position,
+    ]
+
+
+def emoji_record(emoji) -> list:
+    return [emoji.name]
+
+
+def sticker_record(sticker) -> list:
+    return [sticker.name]
+
+
+# kind: (guild attribute, record builder, field names, label for report lines)
+KINDS = {
+    "roles": ("roles", role_record, ROLE_FIELDS, "Role"),
+    "channels": ("channels", channel_record, CHANNEL_FIELDS, "Channel"),
+    "emojis": ("emojis", emoji_record, EMOJI_FIELDS, "Emoji"),
+    "stickers": ("stickers", sticker_record, STICKER_FIELDS, "Sticker"),
+}
+
+
+def capture(guild) -> dict:
+    """Snapshot of the live guild's structure"""
+    snapshot = {"v": SNAPSHOT_VERSION, "guild_id": guild.id, "taken_at": time.time()}
+    for kind, (attribute, record, _, _) in KINDS.items():
+        snapshot[kind] = {str(obj.id): record(obj) for obj in getattr(guild, attribute, ())}
+    return snapshot
+
+
+def _describe_overwrites(before: dict, after: dict) -> str:
+    changed = sorted(target for target in before.keys() | after.keys() if before.get(target) != after.get(target))
+    mentions = []
+    for target in changed[:10]:
+        overwrite = after.get(target) or before[target]
+        mentions.append(f"<@&{target}>" if overwrite[2] == 0 else f"<@{target}>")
+    more = f" and {len(changed) - 10} more" if len(changed) > 10 else ""
+    return f"overwrites changed for {', '.join(mentions)}{more}"
+
+
+def diff_snapshots(old: dict, new: dict) -> list:
+    """Report lines for everything that differs between two snapshots (O(objects))"""
+    lines = []
+    for kind, (_, _, fields, label) in KINDS.items():
+        before = old.get(kind, {})
+        after = new.get(kind, {})
+        moved = 0
+        for object_id, record in after.items():
+            previous = before.get(object_id)
+            name = record[0]
+            if previous is None:
+                lines.append(f"**{label} created:** {name} (`{object_id}`)")
+                continue
+            changes = []
+            for field, was, now in zip(fields[:-1], previous, record):
+                if was == now:
+                    continue
+                if field == "overwrites":
+                    changes.append(_describe_overwrites(was, now))
+                else:
+                    changes.append(f"{field} `{was}` → `{now}`")
+            if changes:
+                lines.append(f"**{label} updated:** {name} (`{object_id}`): " + "; ".join(changes))
+            if len(fields) > 1 and previous[-1] != record[-1]:
+                moved += 1
+        for object_id in before.keys() - after.keys():
+            lines.append(f"**{label} deleted:** {before[object_id][0]} (`{object_id}`)")
+        if moved:
+            lines.append(f"**{label}s reordered:** {moved} position change(s)")
+    return lines
+
+
+class SnapshotStore:
+    """Per-guild snapshots in memory, persisted as one JSON file per guild"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.snapshots = {}   # {guild_id: snapshot}, only guilds loaded at startup are tracked
+        self._dirty = set()
+        self._lock = threading.Lock()
+
+    def _path(self, guild_id: int) -> str:
+        return os.path.join(self.directory, f"{guild_id}.json")
+
+    def load(self, guild_id: int) -> dict:
+        """Stored snapshot, or None if missing, unreadable or from another format version"""
+        path = self._path(guild_id)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, encoding="utf-8") as fh:
+                snapshot = json.load(fh)
+        except (OSError, ValueError) as e:
+            logger.error("Could not read snapshot %s: %s", path, e)
+            return None
+        if snapshot.get("v") != SNAPSHOT_VERSION:
+            logger.warning("Ignoring snapshot %s with format version %s", path, snapshot.get("v"))
+            return None
+        return snapshot
+
+    def replace(self, guild_id: int, snapshot: dict):
+        with self._lock:
+            self.snapshots[guild_id] = snapshot
+            self._dirty.add(guild_id)
+
+    def track(self, guild_id: int, kind: str, obj):
+        """Record a created or updated object"""
+        snapshot = self.snapshots.get(guild_id)
+        if snapshot is None:
+            return
+        with self._lock:
+            snapshot[kind][str(obj.id)] = KINDS[kind][1](obj)
+            self._dirty.add(guild_id)
+
+    def forget(self, guild_id: int, kind: str, object_id: int):
+        """Record a deleted object"""
+        snapshot = self.snapshots.get(guild_id)
+        if snapshot is None:
+            return
+        with self._lock:
+            snapshot[kind].pop(str(object_id), None)
+            self._dirty.add(guild_id)
+
+    def track_all(self, guild_id: int, kind: str, objects: list):
+        """Replace a whole kind (emoji and sticker events carry the full list)"""
+        snapshot = self.snapshots.get(guild_id)
+        if snapshot is None:
+            return
+        record = KINDS[kind][1]
+        with self._lock:
+            snapshot[kind] = {str(obj.id): record(obj) for obj in objects}
+            self._dirty.add(guild_id)
+
+    def flush(self):
+        """Write dirty guilds atomically (blocking, run it in a thread)"""
+        # Records are replaced, never mutated, so copying each kind's dict is enough to serialize
+        # outside the lock that track() takes on the event loop
+        with self._lock:
+            dirty, self._dirty = self._dirty, set()
+            copies = {}
+            for guild_id in dirty:
+                snapshot = self.snapshots[guild_id]
+                snapshot["taken_at"] = time.time()
+                copies[guild_id] = {key: dict(value) if isinstance(value, dict) else value
+                                    for key, value in snapshot.items()}
+        if not copies:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        for guild_id, snapshot in copies.items():
+            payload = json.dumps(snapshot, separators=(",", ":"))
+            path = self._path(guild_id)
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as fh:
+                fh.write(payload)
+                fh.flush()
+                os.fsync(fh.fileno())
+            os.replace(tmp_path, path)
@@ -0,0 +1,47 @@
+"""
+Small persistent key/value state for the bot (command tree hashes, audit-log
+checkpoints and similar), stored as one JSON file and written atomically.
+"""
+
+import json
+import logging
+import os
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class StateStore:
+    """JSON-file backed dict; call save() to persist"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._data = {}
+        if os.path.exists(path):
+            try:
+                with open(path, encoding="utf-8") as fh:
+                    self._data = json.load(fh)
+            except (OSError, ValueError) as e:
+                logger.error("Could not read state file %s, starting fresh: %s", path, e)
+
+    def get(self, key: str, default=None):
+        return self._data.get(key, default)
+
+    def set(self, key: str, value):
+        with self._lock:
+            self._data[key] = value
+
+    def save(self):
+        """Write to a temp file and rename over the old one"""
+        with self._lock:
+            payload = json.dumps(self._data, sort_keys=True)
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as fh:
+            fh.write(payload)
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp_path, self.path)
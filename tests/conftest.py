@@ -0,0 +1,27 @@
+import os
+import sys
+import asyncio
+
+import pytest
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+
+@pytest.fixture(scope="session")
+def main(tmp_path_factory):
+    """main.py imported once against a throwaway config (see benchmarks/bench_events.py)"""
+    from bench_events import load_bot_module
+    return load_bot_module(str(tmp_path_factory.mktemp("bot")))
+
+
+@pytest.fixture
+def run(main):
+    """Run a coroutine with main.bot bound to a fresh loop"""
+    def run(coro):
+        async def bound():
+            main.bot.loop = asyncio.get_running_loop()
+            return await coro
+        return asyncio.run(bound())
+    return run
@@ -0,0 +1,57 @@
+import csv
+import gzip
+import io
+import random
+import tempfile
+
+import pytest
+
+import audit_export
+from audit_export import CSV_COLUMNS, export_parts
+
+
+def events(count: int, fail_at: int = None):
+    rng = random.Random(0)  # incompressible text, so parts fill up
+    for i in range(count):
+        if i == fail_at:
+            raise OSError("store unreadable")
+        yield {"timestamp": 1767225600 + i, "guild_id": 1, "action": "test", "member_name": "m",
+               "user_id": i + 1, "channel_id": None, "text": f"event {i} {rng.getrandbits(512):x}"}
+
+
+def test_parts_stay_under_limit_and_keep_every_row():
+    parts = list(export_parts(events(20000), "csv", 256 * 1024, "audit"))
+    assert len(parts) > 1
+    rows = []
+    for index, (filename, fh, count) in enumerate(parts, start=1):
+        assert filename == f"audit-part{index}.csv.gz"
+        data = fh.read()
+        assert len(data) <= 256 * 1024
+        reader = csv.reader(io.TextIOWrapper(gzip.GzipFile(fileobj=io.BytesIO(data)), encoding="utf-8", newline=""))
+        assert next(reader) == list(CSV_COLUMNS)
+        part_rows = list(reader)
+        assert len(part_rows) == count
+        rows += part_rows
+        fh.close()
+    assert [int(row[4]) for row in rows] == list(range(1, 20001))
+
+
+def test_empty_export_is_one_header_only_part():
+    (filename, fh, count), = export_parts(iter(()), "jsonl", 1024 * 1024, "audit")
+    assert count == 0 and gzip.decompress(fh.read()) == b""
+
+
+def test_failing_source_closes_the_part(monkeypatch):
+    opened = []
+    temporary_file = tempfile.TemporaryFile
+
+    def tracking_temporary_file():
+        fh = temporary_file()
+        opened.append(fh)
+        return fh
+
+    monkeypatch.setattr(audit_export.tempfile, "TemporaryFile", tracking_temporary_file)
+    parts = export_parts(events(1000, fail_at=500), "jsonl", 1024 * 1024, "audit")
+    with pytest.raises(OSError):
+        next(parts)
+    assert opened and all(fh.closed for fh in opened)
@@ -0,0 +1,39 @@
+import copy
+
+import pytest
+from fake_discord import FakeGuild, FakeMember, FakeMessage
+
+from bench_events import GUILD_ID
+from user_timelines import TARGET
+
+
+@pytest.fixture
+def published(main, monkeypatch):
+    events = []
+    publish = main.audit_sinks.publish
+
+    def recording_publish(event, exclude=()):
+        events.append(event)
+        return publish(event, exclude)
+
+    monkeypatch.setattr(main.audit_sinks, "publish", recording_publish)
+    return events
+
+
+def test_member_update_records_member_as_target(main, run, published):
+    guild = FakeGuild(GUILD_ID)
+    before = FakeMember(guild, "member", roles=guild.roles[:2])
+    after = copy.copy(before)
+    after.nick = "renamed"
+    run(main.on_member_update(before, after))
+    event, = published
+    assert (event.action, event.user_id, event.target_id) == ("member_update", None, before.id)
+    assert [role for _, _, role, _ in main.timelines.peek(guild.id, before.id)][-1] == TARGET
+
+
+def test_deleted_message_author_is_target(main, run, published):
+    guild = FakeGuild(GUILD_ID)
+    author = FakeMember(guild, "author")
+    run(main.on_message_delete(FakeMessage(guild, guild.text_channels[0], author, "hello")))
+    event, = [event for event in published if event.action == "message_delete"]
+    assert (event.user_id, event.target_id) == (None, author.id)
@@ -0,0 +1,92 @@
+import json
+import os
+
+import pytest
+
+from audit_store import PartitionedStore, day_of
+from sinks import AuditEvent
+
+DAY = 86400
+NOW = 1767225600 + 10 * DAY + 3600  # 2026-01-11 01:00 UTC
+
+
+def event(timestamp: float, text: str = "x") -> AuditEvent:
+    return AuditEvent(guild_id=1, action="test", member_name="member", text=text, timestamp=timestamp)
+
+
+def texts(store: PartitionedStore, **window) -> list:
+    return [json.loads(line)["text"] for line in store.iter_lines(**window)]
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = PartitionedStore(str(tmp_path), retention_days=7)
+    yield store
+    store.close()
+
+
+def test_events_land_in_their_day(store):
+    store.append([event(NOW - 2 * DAY, "a"), event(NOW - DAY, "b"), event(NOW, "c")])
+    assert sorted(store.partitions()) == [day_of(NOW - 2 * DAY), day_of(NOW - DAY), day_of(NOW)]
+    assert texts(store) == ["a", "b", "c"]
+    assert texts(store, since=NOW - DAY, until=NOW - 3600) == ["b"]
+
+
+def test_compaction_gzips_finished_days_and_drops_bad_lines(store):
+    store.append([event(NOW - DAY, "yesterday"), event(NOW, "today")])
+    store.close()
+    with open(os.path.join(store.directory, f"{day_of(NOW - DAY)}.jsonl"), "a", encoding="utf-8") as fh:
+        fh.write('{"torn": ')  # a write cut short by a crash
+    store.maintain(NOW)
+    partitions = store.partitions()
+    assert [os.path.basename(path) for path in partitions[day_of(NOW - DAY)]] == [f"{day_of(NOW - DAY)}.jsonl.gz"]
+    assert [os.path.basename(path) for path in partitions[day_of(NOW)]] == [f"{day_of(NOW)}.jsonl"]
+    assert texts(store) == ["yesterday", "today"]
+    assert store.compacted_partitions == 1
+
+
+def test_late_event_merges_into_compacted_day(store):
+    store.append([event(NOW - DAY, "first")])
+    store.maintain(NOW)
+    store.append([event(NOW - DAY, "late")])
+    assert len(store.partitions()[day_of(NOW - DAY)]) == 2
+    assert texts(store) == ["first", "late"]
+    store.maintain(NOW)
+    assert [path.endswith(".gz") for path in store.partitions()[day_of(NOW - DAY)]] == [True]
+    assert texts(store) == ["first", "late"]
+
+
+def test_interrupted_compaction_is_finished(store):
+    store.append([event(NOW - DAY, "pending")])
+    store.close()
+    plain = os.path.join(store.directory, f"{day_of(NOW - DAY)}.jsonl")
+    os.replace(plain, plain.replace(".jsonl", ".jsonl.compacting"))
+    assert texts(store) == ["pending"]
+    store.maintain(NOW)
+    assert [path.endswith(".gz") for path in store.partitions()[day_of(NOW - DAY)]] == [True]
+    assert texts(store) == ["pending"]
+
+
+def test_retention_drops_whole_days(store):
+    store.append([event(NOW - 9 * DAY, "old"), event(NOW - 7 * DAY, "edge"), event(NOW - 6 * DAY, "kept")])
+    store.maintain(NOW)
+    assert sorted(store.partitions()) == [day_of(NOW - 7 * DAY), day_of(NOW - 6 * DAY)]
+    assert texts(store) == ["edge", "kept"]
+    assert store.dropped_partitions == 1
+    assert store.stats()["oldest"] == day_of(NOW - 7 * DAY)
+
+
+def test_zero_retention_keeps_everything(tmp_path):
+    store = PartitionedStore(str(tmp_path), retention_days=0)
+    store.append([event(NOW - 1000 * DAY, "ancient")])
+    store.maintain(NOW)
+    assert texts(store) == ["ancient"]
+    assert store.dropped_partitions == 0
+    store.close()
+
+
+def test_missing_directory_reads_empty(tmp_path):
+    store = PartitionedStore(str(tmp_path / "never-written"))
+    assert store.partitions() == {}
+    assert list(store.iter_lines()) == []
+    store.maintain(NOW)
@@ -0,0 +1,50 @@
+import discord
+from fake_discord import FakeAuditEntry, FakeGuild, FakeMember
+
+from bench_events import GUILD_ID
+
+
+def test_backfilled_entries_reach_other_sinks_one_by_one(main, run, monkeypatch):
+    guild = FakeGuild(GUILD_ID)
+    moderator = FakeMember(guild, "moderator")
+    # Targets of audit entries come back as discord.Object with the user type attached
+    spammer, troll = discord.Object(1301, type=discord.Member), discord.Object(1302, type=discord.Member)
+    entries = [FakeAuditEntry(discord.AuditLogAction.ban, moderator, spammer, reason="spam"),
+               FakeAuditEntry(discord.AuditLogAction.kick, moderator, troll)]
+    guild.audit_log_entries.extend(entries)
+
+    received = {}  # sink name -> [(action, user_id, target_id)]
+    publish = main.audit_sinks.publish
+
+    def recording_publish(event, exclude=()):
+        for sink in main.audit_sinks.sinks:
+            if sink.name not in exclude:
+                received.setdefault(sink.name, []).append((event.action, event.user_id, event.target_id))
+        return publish(event, exclude)
+
+    monkeypatch.setattr(main.audit_sinks, "publish", recording_publish)
+    bans_before = main.rollups.query(guild.id, "24h", "member_ban")[0]
+    run(main.backfill_guild(guild, entries[0].id - 1, entries[-1].id + 1))
+
+    assert [action for action, _, _ in received["discord"]] == ["audit_backfill"]
+    assert received["rollups"] == received["jsonl"] == received["timelines"] == [
+        ("member_ban", moderator.id, spammer.id), ("member_kick", moderator.id, troll.id),
+    ]
+    assert main.rollups.query(guild.id, "24h", "member_ban")[0] == bans_before + 1
+
+
+def test_skipped_actions_still_reach_other_sinks(main, run, monkeypatch):
+    guild = FakeGuild(GUILD_ID)
+    moderator = FakeMember(guild, "moderator")
+    entry = FakeAuditEntry(discord.AuditLogAction.role_update, moderator, guild.roles[0], before="a", after="b")
+    guild.audit_log_entries.append(entry)
+    posts = []
+    post_audit = main.post_audit
+
+    def recording_post_audit(guild, member_name, action_text, action="audit", *args, **kwargs):
+        posts.append((action, kwargs.get("exclude", ())))
+        return post_audit(guild, member_name, action_text, action, *args, **kwargs)
+
+    monkeypatch.setattr(main, "post_audit", recording_post_audit)
+    run(main.backfill_guild(guild, entry.id - 1, entry.id + 1, skip=main.SNAPSHOT_ACTIONS))
+    assert posts == [("role_update", ("discord",))]
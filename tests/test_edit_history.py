@@ -0,0 +1,82 @@
+import random
+
+import pytest
+
+import edit_history
+from edit_history import EditHistory, _pack, _splice, apply_delta, encode_delta
+
+
+@pytest.mark.parametrize("old, new", [
+    ("", ""),
+    ("", "brand new text"),
+    ("all of it goes", ""),
+    ("teh quick brown fox", "the quick brown fox"),
+    ("same same same", "same same same"),
+    ("héllo wörld 👋", "héllo there wörld 👋🎉"),
+    ("line one\nline two\n", "line one\nline 2\nline three\n"),
+])
+def test_delta_round_trip(old, new):
+    assert apply_delta(old, encode_delta(old, new)) == new
+    # The single-region fallback used when the word diff gives up
+    assert apply_delta(old, _pack(_splice(old, new))) == new
+
+
+def test_long_runs_use_multibyte_varints():
+    old = "word " * 20000
+    new = old[:50000] + "inserted " + old[50000:]
+    delta = encode_delta(old, new)
+    assert apply_delta(old, delta) == new
+    assert len(delta) < 20
+
+
+def test_random_edits_round_trip():
+    rng = random.Random(0)
+    words = ["alpha", "beta", "gamma", "δέλτα", "🙂", "", "\n"]
+    for _ in range(300):
+        old = " ".join(rng.choice(words) for _ in range(rng.randrange(30)))
+        new = " ".join(rng.choice(words) for _ in range(rng.randrange(30)))
+        assert apply_delta(old, encode_delta(old, new)) == new
+
+
+def test_history_rebuilds_every_version():
+    history = EditHistory()
+    texts = ["first draft", "first draft, edited", "second draft, edited", "second draft"]
+    for before, after in zip(texts, texts[1:]):
+        history.record(1, 10, 20, 30, before, after)
+    message = history.get(1)
+    assert message.versions == len(texts)
+    assert [message.version(number) for number in range(len(texts))] == texts
+    assert [text for _, _, text in message.timeline()] == texts
+
+
+def test_missed_edit_recorded_as_its_own_version():
+    history = EditHistory()
+    history.record(1, 10, 20, 30, "a", "b")
+    history.record(1, 10, 20, 30, "c", "d")  # the edit from b to c was never seen
+    assert [text for _, _, text in history.get(1).timeline()] == ["a", "b", "c", "d"]
+
+
+def test_fold_keeps_the_newest_versions():
+    history = EditHistory(max_versions=3)
+    texts = [f"version {number}" for number in range(6)]
+    for before, after in zip(texts, texts[1:]):
+        history.record(1, 10, 20, 30, before, after)
+    message = history.get(1)
+    assert message.first_version == 3
+    assert [text for _, _, text in message.timeline()] == texts[3:]
+    with pytest.raises(IndexError):
+        message.version(0)
+
+
+def test_capped_diff_is_not_retried(monkeypatch):
+    calls = []
+    monkeypatch.setattr(edit_history, "diff_words", lambda old, new: calls.append((old, new)))
+    old, new = "a b c d", "a x c y"
+    # None is what the caller got from a diff that hit its cap
+    assert apply_delta(old, encode_delta(old, new, runs=None)) == new
+    history = EditHistory()
+    history.record(1, 10, 20, 30, old, new, runs=None)
+    assert history.get(1).latest() == new
+    assert calls == []
+    encode_delta(old, new)
+    assert calls == [(old, new)]
@@ -0,0 +1,79 @@
+import discord
+
+from embed_layout import (BLANK, CONTINUED, EMBED_FIELDS_LIMIT, FIELD_VALUE_LIMIT, MESSAGE_TOTAL_LIMIT,
+                          layout_fields, send_kwargs, split_text, truncate)
+
+
+def check_limits(groups: list, reserved: int = 0):
+    assert sum(len(name) + len(value) for fields in groups for name, value, _ in fields) + reserved <= MESSAGE_TOTAL_LIMIT
+    for fields in groups:
+        assert len(fields) <= EMBED_FIELDS_LIMIT
+        for name, value, _ in fields:
+            assert len(name) <= 256
+            assert 0 < len(value) <= FIELD_VALUE_LIMIT and value.strip()
+
+
+def test_short_text_is_one_field():
+    assert split_text("hello") == ["hello"]
+    groups = layout_fields([("Action:", "hello", True)])
+    assert groups == [[("Action:", "hello", True)]]
+
+
+def test_split_prefers_lines_then_words():
+    lines = "\n".join(f"line {i:03d} " + "x" * 40 for i in range(60))
+    chunks = split_text(lines)
+    assert all(len(chunk) <= FIELD_VALUE_LIMIT for chunk in chunks)
+    assert all(chunk.startswith("line ") and chunk.endswith("x") for chunk in chunks)
+    assert "\n".join(chunks) == lines
+
+    words = " ".join(["word"] * 600)
+    chunks = split_text(words)
+    assert all(len(chunk) <= FIELD_VALUE_LIMIT and not chunk.startswith(" ") for chunk in chunks)
+    assert " ".join(chunks) == words
+
+    unbroken = "y" * 2500
+    assert split_text(unbroken) == ["y" * 1024, "y" * 1024, "y" * 452]
+
+
+def test_long_value_continues_in_extra_fields():
+    text = " ".join(["word"] * 900)  # 4499 characters
+    groups = layout_fields([("Community Member:", "someone", True), ("Action:", text, True), ("Timestamp:", "now", False)])
+    check_limits(groups)
+    names = [name for fields in groups for name, _, _ in fields]
+    assert names == ["Community Member:", "Action:"] + ["Action" + CONTINUED] * 4 + ["Timestamp:"]
+    assert " ".join(value for fields in groups for name, value, _ in fields if name.startswith("Action")) == text
+
+
+def test_many_fields_split_across_embeds():
+    fields = [(f"Field {i}", "v", False) for i in range(60)]
+    groups = layout_fields(fields)
+    assert [len(group) for group in groups] == [25, 25, 10]
+    assert layout_fields(fields, max_embeds=2) is None
+
+
+def test_oversized_text_needs_the_file_fallback():
+    assert layout_fields([("Action:", "z " * 3100, True)]) is None
+    # 4000 characters become 4 fields with 7 + 3 * 14 characters of names
+    fields = [("Action:", "z" * 4000, True)]
+    check_limits(layout_fields(fields, reserved=1951), reserved=1951)
+    assert layout_fields(fields, reserved=1952) is None
+
+
+def test_blank_values_are_replaced():
+    assert layout_fields([("Before:", "", True), ("After:", "   ", True)]) == [[("Before:", BLANK, True), ("After:", BLANK, True)]]
+
+
+def test_truncate():
+    assert truncate("short", 10) == "short"
+    assert truncate("a long sentence here", 10) == "a long se…"
+    assert len(truncate("x" * 5000, 900)) == 900
+
+
+def test_attachment_becomes_a_fresh_file_per_send():
+    payload = {"embeds": [], "attachment": ("audit-1.txt", b"full details")}
+    first, second = send_kwargs(payload), send_kwargs(payload)
+    assert "attachment" not in first and first["embeds"] == []
+    assert isinstance(first["file"], discord.File) and first["file"].filename == "audit-1.txt"
+    assert first["file"] is not second["file"]
+    assert first["file"].fp.read() == b"full details"
+    assert send_kwargs({"embeds": []}) == {"embeds": []}
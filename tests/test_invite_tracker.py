@@ -0,0 +1,59 @@
+import asyncio
+from types import SimpleNamespace
+
+from invite_tracker import CachedInvite, InviteTracker, InviteUse, diff_uses
+
+
+class Guild:
+    def __init__(self, invites: list, hang: bool = False):
+        self.id = 1
+        self.invite_list = invites
+        self.hang = hang
+
+    async def invites(self):
+        if self.hang:
+            await asyncio.Event().wait()
+        return list(self.invite_list)
+
+
+def invite(code: str, uses: int, max_uses: int = 0):
+    return SimpleNamespace(code=code, uses=uses, max_uses=max_uses, inviter=None, channel=None)
+
+
+def test_diff_uses_counts_only_used_up_retired_invites():
+    old = {"a": CachedInvite("a", 3), "b": CachedInvite("b", 0)}
+    fresh = {"a": CachedInvite("a", 5), "b": CachedInvite("b", 0), "new": CachedInvite("new", 1)}
+    retired = {"last": CachedInvite("last", 4, max_uses=5), "half": CachedInvite("half", 2, max_uses=10)}
+    assert diff_uses(old, fresh, retired) == [InviteUse("a", 2), InviteUse("new", 1), InviteUse("last", 1)]
+
+
+def test_burst_shares_one_fetch():
+    async def scenario():
+        guild = Guild([invite("a", 0)])
+        tracker = InviteTracker(window=0.01)
+        await tracker.seed(guild)
+        guild.invite_list = [invite("a", 3)]
+        results = await asyncio.gather(*(tracker.attribute(guild) for _ in range(3)))
+        return tracker, results
+    tracker, results = asyncio.run(scenario())
+    assert results == [[InviteUse("a", 3)]] * 3
+    assert tracker.fetches == 2
+    assert not tracker._tasks
+
+
+def test_cancelled_refetch_still_answers_the_joins():
+    async def scenario():
+        guild = Guild([invite("a", 0)])
+        tracker = InviteTracker(window=0.01)
+        await tracker.seed(guild)
+        guild.hang = True
+        joins = [asyncio.create_task(tracker.attribute(guild)) for _ in range(2)]
+        await asyncio.sleep(0.05)
+        task, = tracker._tasks
+        task.cancel()
+        results = await asyncio.wait_for(asyncio.gather(*joins), 1)
+        return tracker, results
+    tracker, results = asyncio.run(scenario())
+    assert results == [[], []]
+    # The next join opens a fresh burst rather than waiting on the cancelled one
+    assert not tracker._tasks and not tracker._bursts
@@ -0,0 +1,75 @@
+import random
+import re
+from types import SimpleNamespace
+
+from keyword_alerts import KeywordAlerts, KeywordMatcher, compile_keyword_alerts
+
+
+def naive_find(terms: list, text: str, whole_words: bool) -> set:
+    text = text.casefold()
+    found = set()
+    for term in {term.casefold().strip() for term in terms if term.strip()}:
+        if whole_words:
+            matched = re.search(rf"(?<!\w){re.escape(term)}(?!\w)", text)
+        else:
+            matched = term in text
+        if matched:
+            found.add(term)
+    return found
+
+
+def test_overlapping_terms():
+    matcher = KeywordMatcher(["he", "she", "his", "hers"], whole_words=False)
+    assert set(matcher.find("ushers")) == {"she", "he", "hers"}
+    assert matcher.find("ahishers")[0] == "his"
+
+
+def test_term_inside_another_term():
+    matcher = KeywordMatcher(["free nitro", "nitro", "free"], whole_words=True)
+    assert matcher.find("get FREE NITRO now") == ["free", "free nitro", "nitro"]
+
+
+def test_word_boundaries():
+    matcher = KeywordMatcher(["ass", "discord.gift"])
+    assert matcher.find("a classic mistake") == []
+    assert matcher.find("what an ass.") == ["ass"]
+    assert matcher.find("go to discord.gift/abc") == ["discord.gift"]
+    assert matcher.find("notdiscord.gifts") == []
+    # A glued occurrence doesn't hide a later standalone one
+    assert matcher.find("bass ass") == ["ass"]
+    assert KeywordMatcher(["ass"], whole_words=False).find("a classic mistake") == ["ass"]
+
+
+def test_case_insensitive_and_distinct():
+    matcher = KeywordMatcher(["Scam", "scam ", ""])
+    assert len(matcher) == 1
+    assert matcher.find("SCAM scam ScAm") == ["scam"]
+    assert matcher.find("") == []
+    assert matcher.find(None) == []
+
+
+def test_matches_naive_search():
+    rng = random.Random(0)
+    alphabet = "ab c"
+    for _ in range(300):
+        terms = ["".join(rng.choice(alphabet) for _ in range(rng.randint(1, 4))) for _ in range(rng.randint(1, 6))]
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 40)))
+        for whole_words in (True, False):
+            matcher = KeywordMatcher(terms, whole_words=whole_words)
+            assert set(matcher.find(text)) == naive_find(terms, text, whole_words), (terms, text, whole_words)
+
+
+def test_alerts_across_texts():
+    alerts = KeywordAlerts(1, KeywordMatcher(["raid", "nuke"]))
+    assert alerts.find("planning a raid", "no wait, a nuke", None) == ["raid", "nuke"]
+
+
+def test_compile_skips_empty_watchlists():
+    configs = {
+        1: SimpleNamespace(options={"keyword_alerts": {"terms": ["raid"], "ping_role_id": "5", "respect_filters": True}}),
+        2: SimpleNamespace(options={"keyword_alerts": {"terms": [" "]}}),
+        3: SimpleNamespace(options={}),
+    }
+    alerts = compile_keyword_alerts(configs)
+    assert list(alerts) == [1]
+    assert alerts[1].ping_role_id == 5 and alerts[1].respect_filters
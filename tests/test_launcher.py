@@ -0,0 +1,45 @@
+import time
+
+import launcher
+
+# Exits 0.5s after SIGTERM, like a worker draining its queues
+DRAINING_WORKER = """
+import signal, sys, time
+signal.signal(signal.SIGTERM, lambda *_: (time.sleep(0.5), sys.exit(0)))
+while True:
+    time.sleep(0.05)
+"""
+
+
+def test_clusters_drain_together(tmp_path, monkeypatch):
+    script = tmp_path / "worker.py"
+    script.write_text(DRAINING_WORKER)
+    monkeypatch.setattr(launcher, "MAIN_SCRIPT", str(script))
+    clusters = [launcher.Cluster(cluster_id, [cluster_id], 4, str(tmp_path / "status.db")) for cluster_id in range(4)]
+    for cluster in clusters:
+        cluster.start()
+    time.sleep(0.5)  # let the workers install their handlers
+
+    started = time.monotonic()
+    for cluster in clusters:
+        cluster.terminate()
+    deadline = started + 5
+    for cluster in clusters:
+        cluster.wait(deadline)
+    # One shared drain, not four in a row
+    assert time.monotonic() - started < 1.5
+    assert [cluster.process.returncode for cluster in clusters] == [0] * 4
+
+
+def test_stuck_cluster_killed_at_deadline(tmp_path, monkeypatch):
+    script = tmp_path / "stuck.py"
+    script.write_text("import signal, time\nsignal.signal(signal.SIGTERM, signal.SIG_IGN)\nwhile True: time.sleep(1)\n")
+    monkeypatch.setattr(launcher, "MAIN_SCRIPT", str(script))
+    cluster = launcher.Cluster(0, [0], 1, str(tmp_path / "status.db"))
+    cluster.start()
+    time.sleep(0.3)
+    cluster.terminate()
+    started = time.monotonic()
+    cluster.wait(started + 0.3)
+    assert cluster.process.returncode is not None
+    assert time.monotonic() - started < 2
@@ -0,0 +1,68 @@
+import asyncio
+
+import pytest
+from fake_discord import FakeGuild, StubAuditChannel
+
+from bench_events import AUDIT_CHANNEL_ID, GUILD_ID
+
+
+class LazyGuild(FakeGuild):
+    """A guild not chunked at startup, whose first chunk requests can fail"""
+
+    def __init__(self, failures: int = 0):
+        super().__init__(GUILD_ID)
+        self.chunked = False
+        self.chunk_calls = 0
+        self.failures = failures
+        self.attach_audit_channel(StubAuditChannel(self, channel_id=AUDIT_CHANNEL_ID))
+
+    async def chunk(self, cache: bool = True):
+        self.chunk_calls += 1
+        if self.failures:
+            self.failures -= 1
+            raise asyncio.TimeoutError()
+        self.chunked = True
+
+
+@pytest.fixture
+def guild(main, monkeypatch):
+    guild = LazyGuild()
+    main._chunked_guilds.clear()
+    main._chunk_tasks.clear()
+    monkeypatch.setattr(main.bot, "get_guild", lambda guild_id: guild if guild_id == guild.id else None)
+    monkeypatch.setattr(main, "sync_commands_if_changed", lambda guild: asyncio.sleep(0))
+    monkeypatch.setattr(main, "first_ready_done", False)
+    return guild
+
+
+async def settle(main):
+    while main._chunk_tasks:
+        await asyncio.gather(*main._chunk_tasks.values())
+
+
+def test_guild_chunked_at_ready_before_any_join(main, run, guild):
+    """Member updates for uncached members are dropped by discord.py, so the cache must be loaded
+    without waiting for a join"""
+    async def scenario():
+        assert main.bot.intents.members
+        await main.on_first_ready()
+        await settle(main)
+    run(scenario())
+    assert guild.chunk_calls == 1 and guild.chunked
+    assert guild.id in main._chunked_guilds
+
+
+def test_failed_chunk_is_retried(main, run, guild):
+    guild.failures = 1
+
+    async def scenario():
+        main.ensure_chunked(guild)
+        await settle(main)
+        assert guild.id not in main._chunked_guilds
+        main.ensure_chunked(guild)
+        await settle(main)
+        main.ensure_chunked(guild)
+        await settle(main)
+    run(scenario())
+    assert guild.chunk_calls == 2
+    assert guild.id in main._chunked_guilds
@@ -0,0 +1,34 @@
+import pytest
+
+from message_index import DELETED, EDITED, MessageIndex, match_query, search_words
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = MessageIndex(str(tmp_path / "nested" / "messages.db"))
+    index.add(1, 10, 100, 1000, DELETED, "free nitro -- click here?", created=1.0)
+    index.add(1, 10, 200, 1001, EDITED, "see you tomorrow", "see you at noon", created=2.0)
+    index.add(2, 20, 100, 1002, DELETED, "free nitro in another guild", created=3.0)
+    index.write(index.take_pending())
+    yield index
+    index.close()
+
+
+def test_punctuation_only_words_are_dropped():
+    assert search_words('free -- nitro ? "') == ["free", "nitro"]
+    assert match_query(1, "-- ?") is None
+    assert match_query(1, 'say "hi"') == 'guild:"g1" AND (- {guild author} : ("say" AND """hi"""))'
+
+
+def test_search_ignores_punctuation_words(index):
+    assert [hit["message_id"] for hit in index.search(1, "free -- nitro")] == [1000]
+    assert [hit["message_id"] for hit in index.search(1, "nitro ?")] == [1000]
+    assert index.search(1, "-- ?") == []
+
+
+def test_search_scopes_to_guild_and_author(index):
+    assert [hit["message_id"] for hit in index.search(2, "free nitro")] == [1002]
+    assert [hit["message_id"] for hit in index.search(1, "noon", author_id=200)] == [1001]
+    assert index.search(1, "noon", author_id=100) == []
+    # Searched words never match the guild/author tokens
+    assert index.search(1, "g1") == []
@@ -0,0 +1,65 @@
+import asyncio
+from types import SimpleNamespace
+
+import discord
+import pytest
+from fake_discord import FakeAuditEntry, FakeGuild, FakeMember, StubAuditChannel
+
+from bench_events import AUDIT_CHANNEL_ID, GUILD_ID
+
+
+@pytest.fixture
+def setup(main, monkeypatch):
+    guild = FakeGuild(GUILD_ID)
+    guild.attach_audit_channel(StubAuditChannel(guild, channel_id=AUDIT_CHANNEL_ID))
+    moderator = FakeMember(guild, "moderator")
+    posts = []
+    monkeypatch.setattr(main.bot, "get_guild", lambda guild_id: guild if guild_id == guild.id else None)
+    monkeypatch.setitem(main.bot._connection._guilds, guild.id, guild)
+    monkeypatch.setattr(main.bot._connection, "user", SimpleNamespace(id=1, name="bot"))
+    monkeypatch.setattr(main, "sync_commands_if_changed", lambda guild: asyncio.sleep(0))
+    monkeypatch.setattr(main, "first_ready_done", False)
+    monkeypatch.setattr(main, "post_audit", lambda guild, name, text, action="audit", *args, **kwargs: posts.append((action, text)))
+    return guild, moderator, posts
+
+
+async def ready_and_backfill(main):
+    await main.on_ready()
+    await asyncio.gather(*main._backfill_tasks.values())
+
+
+def test_structure_changes_reported_once_after_restart(main, run, setup):
+    guild, moderator, posts = setup
+    # Snapshot and mark left by the previous process
+    main.snapshots.replace(guild.id, main.capture(guild))
+    main.snapshots.flush()
+    guild.audit_log_entries.append(FakeAuditEntry(discord.AuditLogAction.kick, moderator, moderator))
+    main.audit_hwm[guild.id] = guild.audit_log_entries[-1].id
+
+    # Made while offline
+    role = guild.roles[3]
+    guild.audit_log_entries.append(FakeAuditEntry(discord.AuditLogAction.role_update, moderator, role,
+                                                  before="role-3", after="renamed"))
+    role.name = "renamed"
+    guild.audit_log_entries.append(FakeAuditEntry(discord.AuditLogAction.ban, moderator, moderator, reason="spam"))
+
+    run(ready_and_backfill(main))
+    offline = [text for action, text in posts if action == "offline_changes"]
+    backfill = [text for action, text in posts if action == "audit_backfill"]
+    assert len(offline) == 1 and "renamed" in offline[0]
+    assert len(backfill) == 1 and "Member Banned" in backfill[0]
+    assert "Role Updated" not in backfill[0]
+    assert main.audit_hwm[guild.id] == guild.audit_log_entries[-1].id
+
+
+def test_reconnect_refreshes_snapshot(main, run, setup):
+    guild, moderator, posts = setup
+    main.snapshots.replace(guild.id, main.capture(guild))
+    main.audit_hwm[guild.id] = discord.utils.time_snowflake(discord.utils.utcnow())
+    guild.roles[5].name = "renamed during the gap"
+
+    main.first_ready_done = True
+    run(ready_and_backfill(main))
+    main.snapshots.flush()
+    # Reported by the reconnect backfill already; a restart must not report it again
+    assert main.diff_snapshots(main.snapshots.load(guild.id), main.capture(guild)) == []
@@ -0,0 +1,69 @@
+from textdiff import DELETE, EQUAL, INSERT, diff_words, render_runs, render_word_diff
+
+
+def apply(runs: list) -> tuple:
+    """(before, after) rebuilt from diff_words runs"""
+    before = "".join("".join(tokens) for op, tokens in runs if op != INSERT)
+    after = "".join("".join(tokens) for op, tokens in runs if op != DELETE)
+    return before, after
+
+
+def test_identical():
+    runs = diff_words("the quick brown fox", "the quick brown fox")
+    assert runs == [(EQUAL, ["the ", "quick ", "brown ", "fox"])]
+    assert render_word_diff("the quick brown fox", "the quick brown fox") == "the quick brown fox"
+
+
+def test_empty():
+    assert diff_words("", "") == []
+    assert render_word_diff("", "") is None
+    assert diff_words("", "hello there") == [(INSERT, ["hello ", "there"])]
+    assert diff_words("hello there", "") == [(DELETE, ["hello ", "there"])]
+
+
+def test_insert_only():
+    runs = diff_words("see you tomorrow", "see you at noon tomorrow")
+    assert [op for op, _ in runs] == [EQUAL, INSERT, EQUAL]
+    assert runs[1] == (INSERT, ["at ", "noon "])
+    assert apply(runs) == ("see you tomorrow", "see you at noon tomorrow")
+    assert render_runs(runs) == "see you **at noon** tomorrow"
+
+
+def test_delete_only():
+    runs = diff_words("this is really very bad", "this is bad")
+    assert [op for op, _ in runs] == [EQUAL, DELETE, EQUAL]
+    assert runs[1] == (DELETE, ["really ", "very "])
+    assert apply(runs) == ("this is really very bad", "this is bad")
+    assert render_runs(runs) == "this is ~~really very~~ bad"
+
+
+def test_replacement_round_trips():
+    before = "one two three four five six seven"
+    after = "one 2 three four 5 six seven eight"
+    assert apply(diff_words(before, after)) == (before, after)
+
+
+def test_token_cap_falls_back():
+    before = " ".join(f"w{i}" for i in range(100))
+    after = " ".join(f"x{i}" for i in range(100))
+    assert diff_words(before, after, max_tokens=50) is None
+    assert render_word_diff(before, after, max_tokens=50) is None
+    # The common prefix and suffix don't count towards the cap
+    assert diff_words("same " * 100 + "a", "same " * 100 + "b", max_tokens=2) is not None
+
+
+def test_edit_distance_cap_falls_back():
+    before = " ".join(f"w{i}" for i in range(20))
+    after = " ".join(f"x{i}" for i in range(20))
+    assert diff_words(before, after, max_d=10) is None
+    assert diff_words(before, after, max_d=40) is not None
+
+
+def test_time_budget_falls_back():
+    before = " ".join(f"w{i}" for i in range(200))
+    after = " ".join(f"x{i}" for i in range(200))
+    assert diff_words(before, after, time_budget=-1) is None
+
+
+def test_render_over_max_chars_falls_back():
+    assert render_word_diff("a", "b " * 500, max_chars=100) is None
@@ -0,0 +1,34 @@
+import discord
+import pytest
+from fake_discord import FakeGuild
+
+from audit_filters import AuditFilter
+from bench_events import GUILD_ID
+
+
+@pytest.fixture
+def setup(main, monkeypatch):
+    guild = FakeGuild(GUILD_ID)
+    ignored, category_channel, plain = guild.text_channels[0], guild.text_channels[1], guild.text_channels[2]
+    filters = AuditFilter(guild.id, {"ignore": {"channels": [ignored.id], "categories": [category_channel.category_id]}})
+    assert plain.category_id != category_channel.category_id
+    posts = []
+    monkeypatch.setitem(main.AUDIT_FILTERS, guild.id, filters)
+    monkeypatch.setattr(main.bot, "get_guild", lambda guild_id: guild if guild_id == guild.id else None)
+    monkeypatch.setattr(main, "post_audit", lambda guild, name, text, action="audit", *args, **kwargs: posts.append(action))
+    return guild, (ignored, category_channel, plain), posts
+
+
+def delete_payload(guild, thread_id: int, parent) -> discord.RawThreadDeleteEvent:
+    return discord.RawThreadDeleteEvent({"id": thread_id, "guild_id": guild.id, "parent_id": parent.id, "type": 11})
+
+
+def test_uncached_thread_delete_follows_parent_rules(main, run, setup):
+    guild, (ignored, category_channel, plain), posts = setup
+
+    async def scenario():
+        for thread_id, parent in enumerate((ignored, category_channel, plain), start=900):
+            await main.on_raw_thread_delete(delete_payload(guild, thread_id, parent))
+    run(scenario())
+    # Only the thread under the unfiltered channel is logged
+    assert posts == ["thread_delete"]
@@ -0,0 +1,155 @@
+"""
+Word-level diffs of edited messages for audit embeds.
+
+Myers' O((N+M)D) algorithm on word tokens, after trimming the common prefix
+and suffix (most edits touch a few words of a long message). Every diff has
+hard caps on token count, edit distance and wall time; when any is exceeded
+render_word_diff returns None and the caller falls back to truncation, so a
+huge or pathological edit never ties up the event loop.
+"""
+
+import re
+import time
+
+from discord.utils import escape_markdown
+
+# A token is a word with its trailing whitespace, so joining tokens restores the text
+_TOKEN_RE = re.compile(r"\S+\s*|\s+")
+
+MAX_TOKENS = 4000        # tokens left after trimming the common prefix/suffix
+MAX_EDIT_DISTANCE = 400  # inserted + deleted tokens
+TIME_BUDGET = 0.005      # seconds per diff
+CONTEXT_WORDS = 4        # unchanged words shown around each change
+MAX_CHARS = 900          # rendered length (fits an embed field with room for a label)
+
+EQUAL, INSERT, DELETE = "=", "+", "-"
+
+
+def tokenize(text: str) -> list:
+    return _TOKEN_RE.findall(text)
+
+
+def _myers(a: list, b: list, max_d: int, deadline: float):
+    """Shortest edit script as [(op, token)], or None if over max_d or the deadline"""
+    n, m = len(a), len(b)
+    if abs(n - m) > max_d:
+        return None  # needs at least |n - m| insertions or deletions
+    max_d = min(max_d, n + m)
+    offset = max_d + 1
+    v = [0] * (2 * max_d + 3)
+    trace = []
+    for d in range(max_d + 1):
+        if time.perf_counter() > deadline:
+            return None
+        # Round d only reads diagonals -d-1..d+1, so that's all backtracking needs
+        trace.append(v[offset - d - 1:offset + d + 2])
+        for k in range(-d, d + 1, 2):
+            if k == -d or (k != d and v[offset + k - 1] < v[offset + k + 1]):
+                x = v[offset + k + 1]          # step down: insert b[y]
+            else:
+                x = v[offset + k - 1] + 1      # step right: delete a[x]
+            y = x - k
+            while x < n and y < m and a[x] == b[y]:
+                x += 1
+                y += 1
+            v[offset + k] = x
+            if x >= n and y >= m:
+                return _backtrack(a, b, trace)
+    return None
+
+
+def _backtrack(a: list, b: list, trace: list) -> list:
+    ops = []
+    x, y = len(a), len(b)
+    for d in range(len(trace) - 1, -1, -1):
+        v = trace[d]
+        offset = d + 1
+        k = x - y
+        if k == -d or (k != d and v[offset + k - 1] < v[offset + k + 1]):
+            prev_k = k + 1
+        else:
+            prev_k = k - 1
+        prev_x = v[offset + prev_k]
+        prev_y = prev_x - prev_k
+        while x > prev_x and y > prev_y:
+            ops.append((EQUAL, a[x - 1]))
+            x -= 1
+            y -= 1
+        if d > 0:
+            if x == prev_x:
+                ops.append((INSERT, b[y - 1]))
+            else:
+                ops.append((DELETE, a[x - 1]))
+        x, y = prev_x, prev_y
+    ops.reverse()
+    return ops
+
+
+def diff_words(before: str, after: str, max_tokens: int = MAX_TOKENS, max_d: int = MAX_EDIT_DISTANCE,
+               time_budget: float = TIME_BUDGET):
+    """[(op, text)] runs turning before into after, or None if a cap was hit"""
+    deadline = time.perf_counter() + time_budget
+    a, b = tokenize(before), tokenize(after)
+
+    start = 0
+    while start < len(a) and start < len(b) and a[start] == b[start]:
+        start += 1
+    end = 0
+    while end < len(a) - start and end < len(b) - start and a[-1 - end] == b[-1 - end]:
+        end += 1
+
+    middle_a, middle_b = a[start:len(a) - end], b[start:len(b) - end]
+    if len(middle_a) + len(middle_b) > max_tokens:
+        return None
+    ops = _myers(middle_a, middle_b, max_d, deadline)
+    if ops is None:
+        return None
+
+    ops = [(EQUAL, token) for token in a[:start]] + ops + [(EQUAL, token) for token in a[len(a) - end:]]
+
+    # Merge consecutive tokens with the same op into runs
+    runs = []
+    for op, token in ops:
+        if runs and runs[-1][0] == op:
+            runs[-1][1].append(token)
+        else:
+            runs.append((op, [token]))
+    return [(op, tokens) for op, tokens in runs]
+
+
+def _render_run(op: str, tokens: list, first: bool, last: bool, context: int) -> str:
+    if op == EQUAL:
+        if len(tokens) > 2 * context or ((first or last) and len(tokens) > context):
+            head = "" if first else "".join(tokens[:context])
+            tail = "" if last else "".join(tokens[-context:])
+            words = f"{head}… {tail}" if head or tail else "… "
+        else:
+            words = "".join(tokens)
+        return escape_markdown(words)
+    text = escape_markdown("".join(tokens).strip())
+    if not text:
+        return "␣ " if op == INSERT else ""
+    return f"**{text}** " if op == INSERT else f"~~{text}~~ "
+
+
+def render_word_diff(before: str, after: str, context: int = CONTEXT_WORDS, max_chars: int = MAX_CHARS, **caps):
+    """Markdown diff (~~deleted~~, **inserted**, unchanged runs collapsed to `context`
+    words), or None if the diff hit a cap or the rendering won't fit max_chars"""
+    runs = diff_words(before or "", after or "", **caps)
+    if runs is None:
+        return None
+    return render_runs(runs, context, max_chars)
+
+
+def render_runs(runs: list, context: int = CONTEXT_WORDS, max_chars: int = MAX_CHARS):
+    """Render diff_words output (see render_word_diff); None if it won't fit max_chars"""
+    last = len(runs) - 1
+    parts = []
+    size = 0
+    for index, (op, tokens) in enumerate(runs):
+        part = _render_run(op, tokens, index == 0, index == last, context)
+        size += len(part)
+        if size > max_chars:
+            return None
+        parts.append(part)
+    return "".join(parts).strip() or None
@@ -0,0 +1,111 @@
+"""
+Coalescing of thread archive churn and thread membership changes.
+
+Forum and busy text channels archive and unarchive threads constantly, most
+of it Discord's own auto-archive after inactivity, and members join and
+leave threads with every reply. Logging each of those would bury the
+entries that matter. Creates, deletes, locks and other thread edits are
+still logged one by one from main.py. Archive toggles and member changes
+are counted here per guild and thread, and the flusher posts one summary per
+guild every interval.
+
+A guild keeps counters for at most max_threads threads per interval; events
+for further threads only go to the guild totals.
+"""
+
+import discord
+
+DEFAULT_MAX_THREADS = 500
+AUTO_ARCHIVE_SLACK = 60  # seconds of jitter allowed between idle timeout and archive
+
+
+def is_auto_archive(thread) -> bool:
+    """True if the thread was archived by Discord after its idle timeout rather than by someone"""
+    if thread.archive_timestamp is None:
+        return False
+    # Threads with no messages count from creation (a thread's ID is its creation time)
+    last_activity = discord.utils.snowflake_time(thread.last_message_id or thread.id).timestamp()
+    idle = thread.archive_timestamp.timestamp() - last_activity
+    return idle >= thread.auto_archive_duration * 60 - AUTO_ARCHIVE_SLACK
+
+
+class ThreadChurn:
+    __slots__ = ("name", "archived", "auto_archived", "unarchived", "joined", "left", "is_archived")
+
+    def __init__(self, name: str = None):
+        self.name = name
+        self.archived = 0
+        self.auto_archived = 0
+        self.unarchived = 0
+        self.joined = 0
+        self.left = 0
+        self.is_archived = None  # state after the last toggle seen
+
+    @property
+    def total(self) -> int:
+        return self.archived + self.unarchived + self.joined + self.left
+
+
+class GuildChurn:
+    """One guild's counters for the current interval"""
+
+    def __init__(self):
+        self.threads = {}  # thread_id -> ThreadChurn
+        self.totals = ThreadChurn()
+
+    def busiest(self, count: int) -> list:
+        """(thread_id, churn) with the most events, busiest first"""
+        return sorted(self.threads.items(), key=lambda item: -item[1].total)[:count]
+
+
+class ThreadCoalescer:
+    """Per-guild churn counters, taken and reset by the summary flusher (event loop only)"""
+
+    def __init__(self, max_threads: int = DEFAULT_MAX_THREADS):
+        self.max_threads = max_threads
+        self._guilds = {}  # guild_id -> GuildChurn
+        self.events = 0
+
+    def _churns(self, guild_id: int, thread_id: int, name: str = None) -> tuple:
+        guild = self._guilds.get(guild_id)
+        if guild is None:
+            guild = self._guilds[guild_id] = GuildChurn()
+        churn = guild.threads.get(thread_id)
+        if churn is None and len(guild.threads) < self.max_threads:
+            churn = guild.threads[thread_id] = ThreadChurn(name)
+        elif churn is not None and name:
+            churn.name = name
+        return (guild.totals, churn) if churn is not None else (guild.totals,)
+
+    def archive_toggle(self, guild_id: int, thread_id: int, name: str, archived: bool, auto: bool = False):
+        self.events += 1
+        for churn in self._churns(guild_id, thread_id, name):
+            if archived:
+                churn.archived += 1
+                churn.auto_archived += auto
+            else:
+                churn.unarchived += 1
+            churn.is_archived = archived
+
+    def member_change(self, guild_id: int, thread_id: int, name: str, joined: bool):
+        self.events += 1
+        for churn in self._churns(guild_id, thread_id, name):
+            if joined:
+                churn.joined += 1
+            else:
+                churn.left += 1
+
+    def forget(self, guild_id: int, thread_id: int):
+        """Drop a deleted thread's per-thread counters (its events stay in the guild totals)"""
+        guild = self._guilds.get(guild_id)
+        if guild is not None:
+            guild.threads.pop(thread_id, None)
+
+    def take(self) -> dict:
+        """{guild_id: GuildChurn} since the last call"""
+        guilds, self._guilds = self._guilds, {}
+        return guilds
+
+    def stats(self) -> dict:
+        return {"guilds": len(self._guilds), "threads": sum(len(guild.threads) for guild in self._guilds.values()),
+                "events": self.events}
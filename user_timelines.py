@@ -0,0 +1,151 @@
+"""
+Per-member audit timelines for /audituser.
+
+Every published audit event is appended to a small ring buffer (a deque with
+a maxlen) for its actor and, when there is one, its target member, so a
+member's recent timeline is read straight from memory. Buffers live in an
+LRU keyed by (guild, member): an event or a lookup moves a buffer to the
+end, and past max_users the least recently active member is evicted. Memory
+stays bounded by max_users * per_user small tuples however large the guilds
+are.
+
+Evicted members are not lost: every event is also in the day-partitioned
+JSONL store. A buffer is "complete" once it is full or has been rebuilt from
+the store; a lookup on a missing or partial buffer reads the store's recent
+partitions once (load(), in a worker thread) and merges the result in.
+"""
+
+import json
+from collections import OrderedDict, deque
+
+from sinks import Sink
+
+DEFAULT_MAX_USERS = 20000
+DEFAULT_PER_USER = 25
+SUMMARY_LENGTH = 120
+
+ACTOR = "actor"
+TARGET = "target"
+
+
+def summarize(text: str) -> str:
+    """First line of an audit text without markdown emphasis, shortened"""
+    line = text.split("\n", 1)[0].replace("**", "").strip()
+    return line if len(line) <= SUMMARY_LENGTH else line[:SUMMARY_LENGTH - 1] + "…"
+
+
+def _entries(event, user_id: int) -> tuple:
+    """(timestamp, action, role, summary) for one member's side of an event"""
+    role = ACTOR if event.user_id == user_id else TARGET
+    return event.timestamp, event.action, role, summarize(event.text)
+
+
+class _Timeline:
+    __slots__ = ("entries", "complete")
+
+    def __init__(self, per_user: int):
+        self.entries = deque(maxlen=per_user)
+        self.complete = False
+
+
+class UserTimelines:
+    """LRU of per-member ring buffers (event loop only, except load())"""
+
+    def __init__(self, max_users: int = DEFAULT_MAX_USERS, per_user: int = DEFAULT_PER_USER):
+        self.max_users = max_users
+        self.per_user = per_user
+        self._timelines = OrderedDict()
+        self.recorded = 0
+        self.evicted = 0
+        self.loaded = 0
+
+    def record(self, event):
+        """Append an event to its actor's and target's timelines"""
+        for user_id in {event.user_id, event.target_id} - {None}:
+            timeline = self._touch(event.guild_id, user_id)
+            timeline.entries.append(_entries(event, user_id))
+            if len(timeline.entries) == self.per_user:
+                timeline.complete = True
+        self.recorded += 1
+
+    def _touch(self, guild_id: int, user_id: int) -> _Timeline:
+        key = (guild_id, user_id)
+        timeline = self._timelines.get(key)
+        if timeline is None:
+            timeline = self._timelines[key] = _Timeline(self.per_user)
+            if len(self._timelines) > self.max_users:
+                self._timelines.popitem(last=False)
+                self.evicted += 1
+        else:
+            self._timelines.move_to_end(key)
+        return timeline
+
+    def get(self, guild_id: int, user_id: int):
+        """Newest-first entries if the buffer is complete, else None (load() from the store)"""
+        timeline = self._timelines.get((guild_id, user_id))
+        if timeline is None or not timeline.complete:
+            return None
+        self._timelines.move_to_end((guild_id, user_id))
+        return list(reversed(timeline.entries))
+
+    def peek(self, guild_id: int, user_id: int) -> list:
+        """Newest-first entries held in memory, complete or not"""
+        timeline = self._timelines.get((guild_id, user_id))
+        return list(reversed(timeline.entries)) if timeline is not None else []
+
+    def load(self, store, guild_id: int, user_id: int, since: float) -> list:
+        """Newest per_user entries for a member from a PartitionedStore, oldest first (blocking, run it in a thread)"""
+        # Compact JSON starting with guild_id (AuditEvent.to_json), so other
+        # guilds and members are skipped without parsing
+        guild_key = f'{{"guild_id":{guild_id},'
+        user_key = f":{user_id}"
+        found = deque(maxlen=self.per_user)
+        for line in store.iter_lines(since):
+            if not line.startswith(guild_key) or user_key not in line:
+                continue
+            try:
+                event = json.loads(line)
+            except ValueError:
+                continue  # torn last line while the sink is writing
+            if event["timestamp"] < since:
+                continue
+            if event.get("user_id") == user_id:
+                role = ACTOR
+            elif event.get("target_id") == user_id:
+                role = TARGET
+            else:
+                continue
+            found.append((event["timestamp"], event["action"], role, summarize(event["text"])))
+        return list(found)
+
+    def fill(self, guild_id: int, user_id: int, entries: list) -> list:
+        """Merge load() results with anything recorded meanwhile; newest-first entries"""
+        timeline = self._touch(guild_id, user_id)
+        # The store lags the sinks by a batch, so recent events can be in both
+        merged = sorted(set(entries) | set(timeline.entries))
+        timeline.entries = deque(merged, maxlen=self.per_user)
+        timeline.complete = True
+        self.loaded += 1
+        return list(reversed(timeline.entries))
+
+    def stats(self) -> dict:
+        return {"users": len(self._timelines), "recorded": self.recorded,
+                "evicted": self.evicted, "loaded": self.loaded}
+
+
+class TimelineSink(Sink):
+    """Feeds every published audit event into the timelines (in-memory, never queues)"""
+    name = "timelines"
+
+    def __init__(self, timelines: UserTimelines):
+        self.timelines = timelines
+        self.submitted = 0
+
+    def submit(self, event) -> bool:
+        self.timelines.record(event)
+        self.submitted += 1
+        return True
+
+    def stats(self) -> dict:
+        return {"queued": 0, "submitted": self.submitted, "written": self.submitted,
+                "failed": 0, "dropped": 0, "per_second": 0.0}
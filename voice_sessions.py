@@ -0,0 +1,175 @@
+"""
+Voice activity folded into per-member sessions.
+
+on_voice_state_update fires for every join, leave, move, mute and deafen, so
+logging each one would flood the audit channel. Instead each member in voice
+has one open session in memory: when it started, the channels visited,
+server mute/deafen changes (those are moderator actions; self mute only
+bumps a counter) and the number of moves. Leaving voice closes the session
+and one summary is logged.
+
+Moves and leaves are grouped by (guild, from channel, to channel) over a short
+window. A group of at least mass_threshold members (a moderator dragging a
+whole channel, a channel deleted under its members) becomes a single entry
+instead of one per member; a mass leave still lists each member's moderator
+actions. Smaller groups log their sessions normally, and
+their moves show up in each session's channel list.
+
+Memory is bounded: a session keeps at most MAX_CHANNELS channels and
+MAX_ACTIONS moderator actions and counts the rest, and at most max_sessions
+sessions are open at once. Past that, the oldest is dropped and counted in
+`evicted`.
+"""
+
+import time
+from collections import OrderedDict
+
+DEFAULT_MAX_SESSIONS = 50000
+DEFAULT_WINDOW = 2.0  # seconds a move/leave group stays open
+DEFAULT_MASS_THRESHOLD = 5
+MAX_CHANNELS = 10
+MAX_ACTIONS = 10
+
+# take_logs() item kinds
+SESSION = "session"
+MASS_MOVE = "mass_move"
+MASS_LEAVE = "mass_leave"
+
+
+class VoiceSession:
+    __slots__ = ("guild_id", "member_id", "member_name", "started", "ended", "seen_join",
+                 "channels", "extra_channels", "moves", "actions", "extra_actions", "self_mutes")
+
+    def __init__(self, guild_id: int, member_id: int, member_name: str, channel_id: int, started: float, seen_join: bool):
+        self.guild_id = guild_id
+        self.member_id = member_id
+        self.member_name = member_name
+        self.started = started
+        self.ended = None
+        self.seen_join = seen_join  # False for members already in voice when tracking started
+        self.channels = [channel_id]
+        self.extra_channels = 0
+        self.moves = 0
+        self.actions = []  # (timestamp, description)
+        self.extra_actions = 0
+        self.self_mutes = 0
+
+    @property
+    def duration(self) -> float:
+        return (self.ended or time.time()) - self.started
+
+    def visit(self, channel_id: int):
+        self.moves += 1
+        if len(self.channels) < MAX_CHANNELS:
+            self.channels.append(channel_id)
+        else:
+            self.extra_channels += 1
+
+    def action(self, timestamp: float, description: str):
+        if len(self.actions) < MAX_ACTIONS:
+            self.actions.append((timestamp, description))
+        else:
+            self.extra_actions += 1
+
+
+class _Group:
+    __slots__ = ("opened", "items")
+
+    def __init__(self, opened: float):
+        self.opened = opened
+        self.items = []
+
+
+def _state_changes(before, after) -> list:
+    """Moderator mute/deafen changes between two voice states"""
+    changes = []
+    if before.mute != after.mute:
+        changes.append("Server muted" if after.mute else "Server unmuted")
+    if before.deaf != after.deaf:
+        changes.append("Server deafened" if after.deaf else "Server undeafened")
+    return changes
+
+
+class VoiceSessions:
+    """Open sessions plus move/leave groups waiting out their window (event loop only)"""
+
+    def __init__(self, max_sessions: int = DEFAULT_MAX_SESSIONS, window: float = DEFAULT_WINDOW,
+                 mass_threshold: int = DEFAULT_MASS_THRESHOLD):
+        self.max_sessions = max_sessions
+        self.window = window
+        self.mass_threshold = mass_threshold
+        self._sessions = OrderedDict()  # (guild_id, member_id) -> VoiceSession, oldest first
+        self._groups = {}  # (guild_id, from channel, to channel or None) -> _Group
+        self.updates = 0
+        self.evicted = 0
+
+    def __len__(self):
+        return len(self._sessions)
+
+    def update(self, guild_id: int, member_id: int, member_name: str, before, after, now: float = None):
+        """Fold one voice state change into the member's session"""
+        now = now or time.time()
+        self.updates += 1
+        key = (guild_id, member_id)
+        before_channel = before.channel.id if before.channel is not None else None
+        after_channel = after.channel.id if after.channel is not None else None
+        session = self._sessions.get(key)
+
+        if after_channel is None:
+            if session is None:
+                return  # left before we saw them; nothing to summarize
+            del self._sessions[key]
+            session.ended = now
+            self._group(guild_id, before_channel, None, now).items.append(session)
+            return
+
+        if session is None:
+            # A join, or the first update from a member who was already connected
+            session = VoiceSession(guild_id, member_id, member_name, after_channel, now,
+                                   seen_join=before_channel is None)
+            self._sessions[key] = session
+            if len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+                self.evicted += 1
+        elif before_channel != after_channel and before_channel is not None:
+            session.visit(after_channel)
+            self._group(guild_id, before_channel, after_channel, now).items.append(member_id)
+
+        for change in _state_changes(before, after):
+            session.action(now, change)
+        if after.self_mute and not before.self_mute:
+            session.self_mutes += 1
+
+    def _group(self, guild_id: int, from_channel: int, to_channel, now: float) -> _Group:
+        group = self._groups.get((guild_id, from_channel, to_channel))
+        if group is None:
+            group = self._groups[(guild_id, from_channel, to_channel)] = _Group(now)
+        return group
+
+    def take_logs(self, now: float = None) -> list:
+        """Log items for groups whose window has closed.
+
+        (SESSION, session), (MASS_MOVE, guild_id, from, to, member_ids) or
+        (MASS_LEAVE, guild_id, channel, sessions).
+        """
+        now = now or time.time()
+        logs = []
+        for key in [key for key, group in self._groups.items() if now - group.opened >= self.window]:
+            guild_id, from_channel, to_channel = key
+            items = self._groups.pop(key).items
+            if len(items) >= self.mass_threshold:
+                if to_channel is None:
+                    logs.append((MASS_LEAVE, guild_id, from_channel, items))
+                else:
+                    logs.append((MASS_MOVE, guild_id, from_channel, to_channel, items))
+            elif to_channel is None:
+                logs.extend((SESSION, session) for session in items)
+        return logs
+
+    def flush(self) -> list:
+        """Log items for every group, window closed or not (shutdown; open sessions are not logged)"""
+        return self.take_logs(float("inf"))
+
+    def stats(self) -> dict:
+        return {"open": len(self._sessions), "groups": len(self._groups),
+                "updates": self.updates, "evicted": self.evicted}
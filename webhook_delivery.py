@@ -0,0 +1,111 @@
+"""
+Optional webhook delivery backend for audit posts.
+
+Webhooks have their own rate limits, separate from the bot's global limit,
+so posting audit embeds through them keeps slash-command responses and
+tree.sync snappy and lets several webhooks (ideally in different channels)
+share the load. All webhooks use one persistent, pooled aiohttp session.
+"""
+
+import logging
+
+import aiohttp
+import discord
+
+from audit_dispatch import TokenBucket
+from embed_layout import send_kwargs
+
+logger = logging.getLogger(__name__)
+
+# Discord allows roughly 5 requests per 2 seconds per webhook
+WEBHOOK_RATE = 5
+WEBHOOK_PER = 2.0
+WEBHOOK_USERNAME = "LCSRC Utilities"
+
+
+class WebhookPool:
+    """A guild's audit webhooks, used round-robin with per-webhook budgets"""
+
+    def __init__(self, guild_id: int, webhooks: list):
+        self.guild_id = guild_id
+        self.webhooks = webhooks
+        self.buckets = {webhook.id: TokenBucket(WEBHOOK_RATE, WEBHOOK_PER) for webhook in webhooks}
+        self._next = 0
+
+    def __bool__(self) -> bool:
+        return bool(self.webhooks)
+
+    def _pick(self) -> discord.Webhook:
+        """Next webhook in rotation, preferring one with budget left"""
+        count = len(self.webhooks)
+        for offset in range(count):
+            webhook = self.webhooks[(self._next + offset) % count]
+            if self.buckets[webhook.id].available() >= 1.0:
+                self._next = (self._next + offset + 1) % count
+                return webhook
+        webhook = self.webhooks[self._next % count]
+        self._next = (self._next + 1) % count
+        return webhook
+
+    def remove(self, webhook: discord.Webhook):
+        if webhook in self.webhooks:
+            self.webhooks.remove(webhook)
+            self.buckets.pop(webhook.id, None)
+            logger.warning("Webhook %s for guild %s is gone, %d left", webhook.id, self.guild_id, len(self.webhooks))
+
+    async def send(self, payload: dict) -> bool:
+        """Post via a webhook; False if every webhook is gone (caller falls back)"""
+        while self.webhooks:
+            webhook = self._pick()
+            await self.buckets[webhook.id].acquire()
+            try:
+                await webhook.send(username=WEBHOOK_USERNAME, **send_kwargs(payload))
+                return True
+            except (discord.NotFound, discord.Forbidden):
+                # Deleted webhook (or revoked token): drop it and try the next one
+                self.remove(webhook)
+        return False
+
+
+class WebhookDelivery:
+    """Owns the shared aiohttp session and one WebhookPool per guild"""
+
+    def __init__(self, configs: dict, pool_size: int = 20):
+        self.configs = configs
+        self.pool_size = pool_size
+        self.session = None
+        self.pools = {}
+
+    def _ensure_session(self) -> aiohttp.ClientSession:
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(limit=self.pool_size, ttl_dns_cache=300, keepalive_timeout=60)
+            self.session = aiohttp.ClientSession(connector=connector)
+        return self.session
+
+    def pool(self, guild_id: int) -> WebhookPool:
+        """The guild's webhook pool, or None if it has no webhooks configured"""
+        pool = self.pools.get(guild_id)
+        if pool is None:
+            config = self.configs.get(guild_id)
+            if config is None or not config.webhooks:
+                return None
+            session = self._ensure_session()
+            webhooks = []
+            for url in config.webhooks:
+                try:
+                    webhooks.append(discord.Webhook.from_url(url, session=session))
+                except ValueError:
+                    logger.error("Ignoring invalid webhook URL for guild %s", guild_id)
+            pool = self.pools[guild_id] = WebhookPool(guild_id, webhooks)
+        return pool
+
+    async def send(self, guild_id: int, payload: dict) -> bool:
+        """Deliver through the guild's webhooks; False means use channel.send"""
+        pool = self.pool(guild_id)
+        if not pool:
+            return False
+        return await pool.send(payload)
+
+    async def close(self):
+        if self.session is not None and not self.session.closed:
+            await self.session.close()